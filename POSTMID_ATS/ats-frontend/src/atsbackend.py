@@ -13,6 +13,12 @@ nltk.download('punkt_tab')
 from nltk.tokenize import word_tokenize
 from nltk.corpus import stopwords
 import string
+import sys
+
+# Shared modules (llm_cache, llm_gateway) live at the repository root
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", "..")))
+from llm_cache import LLMCache
+from llm_gateway import LLMGateway
 
 app = Flask(__name__)
 CORS(app)
@@ -33,6 +39,12 @@ genai.configure(api_key=GEMINI_API_KEY)
 nltk.download('punkt')
 nltk.download('stopwords')
 
+# Gemini responses keyed by prompt fingerprint; keyword lists per profession/level are pinned to a low temperature
+llm_cache = LLMCache.from_env()
+# Pooled Gemini REST calls with retries, circuit breaking and GEMINI_FALLBACK_MODELS
+llm_gateway = LLMGateway.from_env()
+llm_gateway.configure("gemini", api_key=GEMINI_API_KEY)
+
 def allowed_file(filename):
     return "." in filename and filename.rsplit(".", 1)[1].lower() in ALLOWED_EXTENSIONS
 
@@ -94,8 +106,7 @@ def get_keywords_for_profession(profession, experience_level="mid"):
     Include only the JSON output and no additional text.
     """
     
-    response = model.generate_content(prompt)
-    response_text = response.text
+    response_text = llm_gateway.complete_cached_sync(llm_cache, "gemini", model.model_name, prompt, temperature=0.1)
     print(f"Response from Gemini: {response_text}")
     
     # Extract JSON from response (handling potential markdown code blocks)
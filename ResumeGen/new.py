@@ -14,6 +14,12 @@ from docx import Document
 import re
 from concurrent.futures import ThreadPoolExecutor
 import logging # Import logging
+import sys
+
+# Shared modules (llm_cache, llm_gateway) live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_cache import LLMCache
+from llm_gateway import LLMGateway
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -222,6 +228,12 @@ default_resume_data = {
 }
 
 # Helper functions
+# Gemini responses keyed by prompt fingerprint; only the temperature-pinned ATS score prompt is cacheable
+llm_cache = LLMCache.from_env()
+# Pooled Gemini REST calls with retries, circuit breaking and GEMINI_FALLBACK_MODELS
+llm_gateway = LLMGateway.from_env()
+llm_gateway.configure("gemini", api_key=GOOGLE_API_KEY)
+
 def get_gemini_model():
     """Safely get the Gemini model instance."""
     try:
@@ -336,8 +348,7 @@ def optimize_content_with_gemini(section_name, content, target_profession):
 
     try:
         logger.info(f"Optimizing section: {section_name} for profession: {target_profession}")
-        response = model.generate_content(prompt)
-        response_text = response.text
+        response_text = llm_gateway.complete_sync("gemini", model.model_name, prompt).text
 
         logger.debug(f"Raw Gemini response for {section_name}:\n{response_text}")
 
@@ -407,8 +418,9 @@ def calculate_ats_score(resume_data, target_profession):
 
     try:
         logger.info(f"Calculating detailed ATS score for {target_profession}")
-        response = model.generate_content(prompt)
-        score_text = response.text.strip()
+        # Pinned to a low temperature so the same resume scores the same (and can be served from the cache)
+        score_text = llm_gateway.complete_cached_sync(llm_cache, "gemini", model.model_name, prompt,
+                                                      temperature=0.1).strip()
         
         # Extract score
         score_match = re.search(r'(\d{1,3})', score_text)
@@ -471,8 +483,7 @@ def generate_improvement_notes(original_data, optimized_data, target_profession)
 
     try:
         logger.info(f"Generating improvement notes for profession: {target_profession}")
-        response = model.generate_content(prompt)
-        notes_text = response.text.strip()
+        notes_text = llm_gateway.complete_sync("gemini", model.model_name, prompt).text.strip()
         logger.debug(f"Raw improvement notes response: {notes_text}")
 
         # Use the improved extraction function
@@ -886,8 +897,7 @@ async def analyze_job_description(job_description: str = Form(...), current_resu
         """
 
         logger.info("Sending job description analysis request to Gemini.")
-        response = model.generate_content(prompt)
-        analysis_text = response.text.strip()
+        analysis_text = (await llm_gateway.complete("gemini", model.model_name, prompt)).text.strip()
         logger.debug(f"Raw job analysis response: {analysis_text}")
 
         # Use the robust JSON extractor
@@ -1,27 +1,34 @@
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 import PyPDF2
 import docx
 import re
 import json
+import uuid
+import hashlib
 import io
 from datetime import datetime
 import requests
 import time
-import random
 import spacy
 import nltk
 from nltk.corpus import stopwords
 from nltk.tokenize import word_tokenize, sent_tokenize
-from collections import Counter
+from collections import Counter, OrderedDict, deque
 import string
 import asyncio
-from typing import Optional, List, Dict, Any
+import bisect
+import functools
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Optional, List, Dict, Any, Callable
 import logging
-from sklearn.feature_extraction.text import TfidfVectorizer
+from sklearn.feature_extraction.text import CountVectorizer, TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
+from sklearn.preprocessing import normalize
+from scipy import sparse
 import numpy as np
 import aiohttp
 from urllib.parse import urlparse, parse_qs
@@ -29,7 +36,10 @@ import bs4
 from bs4 import BeautifulSoup
 import fitz  # PyMuPDF for better PDF URL extraction
 import os
-from groq import Groq
+import sqlite3
+import threading
+from llm_cache import LLMCache
+from llm_gateway import LLMError, LLMGateway
 
 # Download required NLTK data
 def download_nltk_data():
@@ -73,6 +83,11 @@ app.add_middleware(
 class TextAnalysisRequest(BaseModel):
     resume_text: str
     job_description: Optional[str] = ""
+    jd_id: Optional[str] = None
+
+class JobDescriptionRequest(BaseModel):
+    job_description: str
+    title: Optional[str] = None
 
 class AnalysisResponse(BaseModel):
     overall_score: float
@@ -105,20 +120,1197 @@ class CodingProfileAnalysis(BaseModel):
     strengths: List[str]
     areas_for_improvement: List[str]
 
+def parse_rate_limit_duration(value: Optional[str]) -> Optional[float]:
+    """Parse rate-limit reset durations like '7.66s', '2m59.56s', '250ms' or '30' into seconds"""
+    if not value:
+        return None
+    value = str(value).strip()
+    try:
+        return float(value)
+    except ValueError:
+        pass
+
+    parts = re.findall(r'(\d+(?:\.\d+)?)(ms|h|m|s)', value)
+    if not parts:
+        return None
+
+    multipliers = {'h': 3600, 'm': 60, 's': 1, 'ms': 0.001}
+    return sum(float(amount) * multipliers[unit] for amount, unit in parts)
+
+class TokenBucket:
+    """Request and token buckets for a single model"""
+
+    def __init__(self, requests_per_minute: int, tokens_per_minute: int):
+        self.request_capacity = float(requests_per_minute)
+        self.token_capacity = float(tokens_per_minute)
+        self.request_rate = requests_per_minute / 60.0
+        self.token_rate = tokens_per_minute / 60.0
+        self.requests = self.request_capacity
+        self.tokens = self.token_capacity
+        self.blocked_until = 0.0
+        self.last_refill = time.monotonic()
+        self.lock = None
+
+        # Backpressure statistics
+        self.queue_depth = 0
+        self.max_queue_depth = 0
+        self.total_acquired = 0
+        self.total_waited = 0
+        self.total_wait_seconds = 0.0
+        self.max_wait_seconds = 0.0
+        self.last_wait_seconds = 0.0
+
+    def refill(self):
+        """Refill both buckets based on elapsed time"""
+        now = time.monotonic()
+        elapsed = now - self.last_refill
+        self.last_refill = now
+        self.requests = min(self.request_capacity, self.requests + elapsed * self.request_rate)
+        self.tokens = min(self.token_capacity, self.tokens + elapsed * self.token_rate)
+
+    def seconds_until_available(self, tokens: float) -> float:
+        """Seconds to wait before one request of the given token cost fits in both buckets"""
+        wait = max(self.blocked_until - time.monotonic(), 0.0)
+        if self.requests < 1:
+            wait = max(wait, (1 - self.requests) / self.request_rate)
+        if self.tokens < tokens:
+            wait = max(wait, (tokens - self.tokens) / self.token_rate)
+        return wait
+
+class LLMRateLimiter:
+    """Process-wide token-bucket rate limiter for LLM calls, keyed by model.
+
+    Callers only wait when the local request/token budget is actually exhausted.
+    Budgets are tightened further by the provider's x-ratelimit-* and retry-after
+    response headers whenever those are available.
+    """
+
+    def __init__(self, requests_per_minute: int = 30, tokens_per_minute: int = 12000):
+        self.requests_per_minute = requests_per_minute
+        self.tokens_per_minute = tokens_per_minute
+        self.buckets: Dict[str, TokenBucket] = {}
+
+    def _get_bucket(self, model: str) -> TokenBucket:
+        bucket = self.buckets.get(model)
+        if bucket is None:
+            bucket = TokenBucket(self.requests_per_minute, self.tokens_per_minute)
+            self.buckets[model] = bucket
+        if bucket.lock is None:
+            bucket.lock = asyncio.Lock()
+        return bucket
+
+    async def acquire(self, model: str, tokens: int) -> float:
+        """Wait until the model has budget for one request of `tokens` tokens; returns seconds waited"""
+        bucket = self._get_bucket(model)
+        # A single request larger than the whole bucket would otherwise wait forever
+        tokens = min(float(tokens), bucket.token_capacity)
+
+        start = time.monotonic()
+        bucket.queue_depth += 1
+        bucket.max_queue_depth = max(bucket.max_queue_depth, bucket.queue_depth)
+        try:
+            async with bucket.lock:
+                while True:
+                    bucket.refill()
+                    delay = bucket.seconds_until_available(tokens)
+                    if delay <= 0:
+                        bucket.requests -= 1
+                        bucket.tokens -= tokens
+                        break
+                    logger.info(
+                        f"LLM rate limit reached for {model}, waiting {delay:.2f}s "
+                        f"({bucket.queue_depth} request(s) queued)"
+                    )
+                    await asyncio.sleep(delay)
+        finally:
+            bucket.queue_depth -= 1
+
+        waited = time.monotonic() - start
+        bucket.total_acquired += 1
+        bucket.last_wait_seconds = waited
+        bucket.total_wait_seconds += waited
+        bucket.max_wait_seconds = max(bucket.max_wait_seconds, waited)
+        if waited > 0.001:
+            bucket.total_waited += 1
+        return waited
+
+    def reconcile(self, model: str, estimated_tokens: int, actual_tokens: Optional[int]):
+        """Refund (or charge) the difference between estimated and reported token usage"""
+        if actual_tokens is None:
+            return
+        bucket = self._get_bucket(model)
+        bucket.refill()
+        bucket.tokens = min(bucket.token_capacity, bucket.tokens + (estimated_tokens - actual_tokens))
+
+    def update_from_headers(self, model: str, headers) -> None:
+        """Tighten the local budget using the provider's rate-limit response headers"""
+        if not headers:
+            return
+        bucket = self._get_bucket(model)
+        bucket.refill()
+        now = time.monotonic()
+
+        try:
+            remaining_requests = headers.get('x-ratelimit-remaining-requests')
+            if remaining_requests is not None:
+                remaining_requests = float(remaining_requests)
+                bucket.requests = min(bucket.requests, remaining_requests)
+                if remaining_requests < 1:
+                    reset = parse_rate_limit_duration(headers.get('x-ratelimit-reset-requests'))
+                    if reset:
+                        bucket.blocked_until = max(bucket.blocked_until, now + reset)
+
+            remaining_tokens = headers.get('x-ratelimit-remaining-tokens')
+            if remaining_tokens is not None:
+                bucket.tokens = min(bucket.tokens, float(remaining_tokens))
+
+            retry_after = parse_rate_limit_duration(headers.get('retry-after'))
+            if retry_after:
+                bucket.blocked_until = max(bucket.blocked_until, now + retry_after)
+        except (TypeError, ValueError) as e:
+            logger.warning(f"Could not parse rate-limit headers for {model}: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Queue depth, wait times and remaining budget per model"""
+        stats = {}
+        for model, bucket in self.buckets.items():
+            bucket.refill()
+            stats[model] = {
+                'queue_depth': bucket.queue_depth,
+                'max_queue_depth': bucket.max_queue_depth,
+                'requests_acquired': bucket.total_acquired,
+                'requests_delayed': bucket.total_waited,
+                'avg_wait_seconds': round(bucket.total_wait_seconds / max(bucket.total_acquired, 1), 3),
+                'max_wait_seconds': round(bucket.max_wait_seconds, 3),
+                'last_wait_seconds': round(bucket.last_wait_seconds, 3),
+                'available_requests': round(bucket.requests, 2),
+                'available_tokens': round(bucket.tokens, 1),
+                'blocked_for_seconds': round(max(bucket.blocked_until - time.monotonic(), 0.0), 2)
+            }
+        return {
+            'requests_per_minute': self.requests_per_minute,
+            'tokens_per_minute': self.tokens_per_minute,
+            'models': stats
+        }
+
+# Shared across every analyzer instance in this process
+llm_rate_limiter = LLMRateLimiter(
+    requests_per_minute=int(os.getenv("GROQ_REQUESTS_PER_MINUTE", "30")),
+    tokens_per_minute=int(os.getenv("GROQ_TOKENS_PER_MINUTE", "12000"))
+)
+
+class ProfileCache:
+    """TTL cache for coding-platform profiles keyed by (platform, lowercased username).
+
+    Entries live in an in-memory LRU and, when a database path is configured, in a
+    SQLite table that survives restarts. Entries past their platform TTL are still
+    served (stale-while-revalidate) until they exceed `max_stale_seconds`.
+    """
+
+    def __init__(self, ttls: Dict[str, int], default_ttl: int = 3600, max_entries: int = 1000,
+                 max_stale_seconds: int = 7 * 24 * 3600, db_path: Optional[str] = None):
+        self.ttls = ttls
+        self.default_ttl = default_ttl
+        self.max_entries = max_entries
+        self.max_stale_seconds = max_stale_seconds
+        self.db_path = db_path
+        self.memory: "OrderedDict[tuple, tuple]" = OrderedDict()
+        self.db_lock = threading.Lock()
+        self.db = None
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'disk_hits': 0}
+
+        if db_path:
+            try:
+                self.db = sqlite3.connect(db_path, check_same_thread=False)
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS profile_cache ("
+                    "platform TEXT NOT NULL, username TEXT NOT NULL, data TEXT NOT NULL, "
+                    "fetched_at REAL NOT NULL, PRIMARY KEY (platform, username))"
+                )
+                self.db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Profile cache database unavailable ({db_path}): {e}. Using memory only.")
+                self.db = None
+
+    @staticmethod
+    def make_key(platform: str, username: str) -> tuple:
+        return (platform.lower(), username.lower())
+
+    def _remember(self, key: tuple, data: Dict[str, Any], fetched_at: float):
+        self.memory[key] = (data, fetched_at)
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def _load_from_disk(self, key: tuple) -> Optional[tuple]:
+        if self.db is None:
+            return None
+        try:
+            with self.db_lock:
+                row = self.db.execute(
+                    "SELECT data, fetched_at FROM profile_cache WHERE platform = ? AND username = ?",
+                    key
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Profile cache read failed: {e}")
+            return None
+        if not row:
+            return None
+        return json.loads(row[0]), row[1]
+
+    def get(self, platform: str, username: str) -> Optional[tuple]:
+        """Return (profile_data, is_fresh) or None when missing or too stale to serve"""
+        key = self.make_key(platform, username)
+        entry = self.memory.get(key)
+        if entry is not None:
+            self.memory.move_to_end(key)
+        else:
+            entry = self._load_from_disk(key)
+            if entry is not None:
+                self.stats['disk_hits'] += 1
+                self._remember(key, *entry)
+
+        if entry is None:
+            self.stats['misses'] += 1
+            return None
+
+        data, fetched_at = entry
+        age = time.time() - fetched_at
+        if age > self.ttls.get(key[0], self.default_ttl) + self.max_stale_seconds:
+            self.stats['misses'] += 1
+            return None
+
+        is_fresh = age <= self.ttls.get(key[0], self.default_ttl)
+        self.stats['hits' if is_fresh else 'stale_hits'] += 1
+        return data, is_fresh
+
+    def set(self, platform: str, username: str, data: Dict[str, Any]):
+        """Store a freshly fetched profile in both tiers"""
+        key = self.make_key(platform, username)
+        fetched_at = time.time()
+        self._remember(key, data, fetched_at)
+
+        if self.db is not None:
+            try:
+                with self.db_lock:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO profile_cache (platform, username, data, fetched_at) VALUES (?, ?, ?, ?)",
+                        (key[0], key[1], json.dumps(data), fetched_at)
+                    )
+                    self.db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Profile cache write failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            **self.stats,
+            'memory_entries': len(self.memory),
+            'disk_enabled': self.db is not None,
+            'ttl_seconds': self.ttls
+        }
+
+profile_cache = ProfileCache(
+    ttls={
+        'leetcode': int(os.getenv("PROFILE_CACHE_TTL_LEETCODE", str(6 * 3600))),
+        'codeforces': int(os.getenv("PROFILE_CACHE_TTL_CODEFORCES", str(3600))),
+        'codechef': int(os.getenv("PROFILE_CACHE_TTL_CODECHEF", str(6 * 3600)))
+    },
+    max_entries=int(os.getenv("PROFILE_CACHE_MAX_ENTRIES", "1000")),
+    db_path=os.getenv("PROFILE_CACHE_DB") or None
+)
+
+# Bump when scoring rules change so cached analyses are not served across versions
+ANALYZER_VERSION = "6.0.0"
+
+class AnalysisResultCache:
+    """Full analysis results keyed by content hash (resume bytes + job description + analyzer version).
+
+    The in-memory LRU is bounded by the approximate JSON size of its entries; when a
+    database path is configured, results are also written to SQLite and reloaded on
+    a memory miss. Entries older than `ttl_seconds` are not served, since coding
+    profiles and LLM suggestions drift over time.
+    """
+
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024, ttl_seconds: int = 3600, db_path: Optional[str] = None):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self.memory: "OrderedDict[str, tuple]" = OrderedDict()
+        self.memory_bytes = 0
+        self.lock = threading.Lock()
+        self.db = None
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'evictions': 0}
+
+        if db_path:
+            try:
+                self.db = sqlite3.connect(db_path, check_same_thread=False)
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS analysis_results ("
+                    "cache_key TEXT PRIMARY KEY, result TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                self.db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache database unavailable ({db_path}): {e}. Using memory only.")
+                self.db = None
+
+    @staticmethod
+    def make_key(content: bytes, job_description: str, analyzer_version: str) -> str:
+        content_hash = hashlib.sha256(content).hexdigest()
+        job_hash = hashlib.sha256((job_description or "").encode('utf-8')).hexdigest()
+        return f"{content_hash}:{job_hash}:{analyzer_version}"
+
+    @staticmethod
+    def _as_hit(result: Dict[str, Any]) -> Dict[str, Any]:
+        # Shallow copy: callers add top-level fields (filename, batch_index) to what they get back
+        hit = dict(result)
+        hit['metrics'] = {**result.get('metrics', {}), 'cache_hit': True}
+        return hit
+
+    def _remember(self, key: str, result: Dict[str, Any], size: int, created_at: float):
+        if self.max_bytes <= 0:
+            return  # Memory tier disabled
+        with self.lock:
+            previous = self.memory.pop(key, None)
+            if previous is not None:
+                self.memory_bytes -= previous[1]
+            self.memory[key] = (result, size, created_at)
+            self.memory_bytes += size
+            while len(self.memory) > 1 and self.memory_bytes > self.max_bytes:
+                _, (_, evicted_size, _) = self.memory.popitem(last=False)
+                self.memory_bytes -= evicted_size
+                self.stats['evictions'] += 1
+
+    def _load_from_disk(self, key: str) -> Optional[tuple]:
+        if self.db is None:
+            return None
+        try:
+            with self.lock:
+                row = self.db.execute(
+                    "SELECT result, created_at FROM analysis_results WHERE cache_key = ?", (key,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            logger.warning(f"Result cache read failed: {e}")
+            return None
+        if not row:
+            return None
+        return row[0], row[1]
+
+    def get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Cached result with metrics.cache_hit set, or None"""
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                self.memory.move_to_end(key)
+
+        if entry is None:
+            stored = self._load_from_disk(key)
+            if stored is not None and time.time() - stored[1] <= self.ttl_seconds:
+                result = json.loads(stored[0])
+                self._remember(key, result, len(stored[0]), stored[1])
+                self.stats['disk_hits'] += 1
+                return self._as_hit(result)
+            self.stats['misses'] += 1
+            return None
+
+        result, _, created_at = entry
+        if time.time() - created_at > self.ttl_seconds:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return self._as_hit(result)
+
+    def set(self, key: str, result: Dict[str, Any]):
+        """Store a finished analysis in both tiers"""
+        stored = {**result, 'metrics': {**result.get('metrics', {}), 'cache_hit': False}}
+        payload = json.dumps(jsonable_encoder(stored))
+        created_at = time.time()
+        self._remember(key, stored, len(payload), created_at)
+
+        if self.db is not None:
+            try:
+                with self.lock:
+                    self.db.execute(
+                        "INSERT OR REPLACE INTO analysis_results (cache_key, result, created_at) VALUES (?, ?, ?)",
+                        (key, payload, created_at)
+                    )
+                    self.db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"Result cache write failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.stats['hits'] + self.stats['disk_hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'memory_entries': len(self.memory),
+                'memory_bytes': self.memory_bytes,
+                'max_bytes': self.max_bytes,
+                'ttl_seconds': self.ttl_seconds,
+                'disk_enabled': self.db is not None,
+                'hit_rate': round((self.stats['hits'] + self.stats['disk_hits']) / lookups, 3) if lookups else 0.0
+            }
+
+result_cache = AnalysisResultCache(
+    max_bytes=int(float(os.getenv("RESULT_CACHE_MAX_MB", "64")) * 1024 * 1024),
+    ttl_seconds=int(os.getenv("RESULT_CACHE_TTL_SECONDS", "3600")),
+    db_path=os.getenv("RESULT_CACHE_DB") or None
+)
+
+# Completions keyed by prompt fingerprint, shared with the other LLM services' cache format
+llm_cache = LLMCache.from_env()
+
+# Pooled, retrying Groq completions with circuit breaking and model fallback (GROQ_FALLBACK_MODELS)
+llm_gateway = LLMGateway.from_env()
+
+class CodeforcesSubmissionStore:
+    """Persistent per-handle Codeforces submission state for incremental syncing.
+
+    For every handle it keeps the newest fully-judged submission id seen, the set of
+    accepted problems and a verdict histogram. Submission ids are recorded so that
+    overlapping pages are never counted twice. Uses an in-memory SQLite database
+    unless a file path is given.
+    """
+
+    def __init__(self, db_path: str = ":memory:"):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.db = sqlite3.connect(db_path, check_same_thread=False)
+        self.db.executescript(
+            "CREATE TABLE IF NOT EXISTS cf_handles ("
+            "handle TEXT PRIMARY KEY, last_submission_id INTEGER NOT NULL DEFAULT 0, "
+            "total_submissions INTEGER NOT NULL DEFAULT 0, verdicts TEXT NOT NULL DEFAULT '{}', "
+            "synced_at REAL);"
+            "CREATE TABLE IF NOT EXISTS cf_submissions ("
+            "handle TEXT NOT NULL, submission_id INTEGER NOT NULL, PRIMARY KEY (handle, submission_id));"
+            "CREATE TABLE IF NOT EXISTS cf_accepted ("
+            "handle TEXT NOT NULL, problem_id TEXT NOT NULL, PRIMARY KEY (handle, problem_id));"
+        )
+        self.db.commit()
+
+    def get_state(self, handle: str) -> Optional[Dict[str, Any]]:
+        """Current sync state for a handle, or None if it has never been synced"""
+        handle = handle.lower()
+        with self.lock:
+            row = self.db.execute(
+                "SELECT last_submission_id, total_submissions, verdicts, synced_at FROM cf_handles WHERE handle = ?",
+                (handle,)
+            ).fetchone()
+            if not row:
+                return None
+            problems_solved = self.db.execute(
+                "SELECT COUNT(*) FROM cf_accepted WHERE handle = ?", (handle,)
+            ).fetchone()[0]
+        return {
+            'last_submission_id': row[0],
+            'total_submissions': row[1],
+            'verdicts': json.loads(row[2]),
+            'synced_at': row[3],
+            'problems_solved': problems_solved
+        }
+
+    def apply_submissions(self, handle: str, submissions: List[Dict[str, Any]]) -> int:
+        """Fold judged submissions into the handle's totals; returns how many were new"""
+        handle = handle.lower()
+        new_count = 0
+        with self.lock:
+            row = self.db.execute(
+                "SELECT total_submissions, verdicts FROM cf_handles WHERE handle = ?", (handle,)
+            ).fetchone()
+            total_submissions, verdicts = (row[0], json.loads(row[1])) if row else (0, {})
+
+            for submission in submissions:
+                inserted = self.db.execute(
+                    "INSERT OR IGNORE INTO cf_submissions (handle, submission_id) VALUES (?, ?)",
+                    (handle, submission['id'])
+                ).rowcount
+                if not inserted:
+                    continue
+
+                new_count += 1
+                total_submissions += 1
+                verdict = submission.get('verdict')
+                verdicts[verdict] = verdicts.get(verdict, 0) + 1
+                if verdict == 'OK':
+                    problem = submission.get('problem', {})
+                    problem_id = f"{problem.get('contestId')}-{problem.get('index')}"
+                    self.db.execute(
+                        "INSERT OR IGNORE INTO cf_accepted (handle, problem_id) VALUES (?, ?)",
+                        (handle, problem_id)
+                    )
+
+            self.db.execute(
+                "INSERT INTO cf_handles (handle, total_submissions, verdicts) VALUES (?, ?, ?) "
+                "ON CONFLICT(handle) DO UPDATE SET total_submissions = excluded.total_submissions, "
+                "verdicts = excluded.verdicts",
+                (handle, total_submissions, json.dumps(verdicts))
+            )
+            self.db.commit()
+        return new_count
+
+    def mark_synced(self, handle: str, last_submission_id: int):
+        """Advance the watermark once every submission up to it has been applied"""
+        with self.lock:
+            self.db.execute(
+                "INSERT INTO cf_handles (handle, last_submission_id, synced_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(handle) DO UPDATE SET "
+                "last_submission_id = MAX(last_submission_id, excluded.last_submission_id), "
+                "synced_at = excluded.synced_at",
+                (handle.lower(), last_submission_id, time.time())
+            )
+            self.db.commit()
+
+codeforces_submission_store = CodeforcesSubmissionStore(
+    os.getenv("CODEFORCES_SUBMISSION_DB") or ":memory:"
+)
+
+# Coding-platform endpoints; overridable to point at a mirror or a local stub server
+LEETCODE_GRAPHQL_URL = os.getenv("LEETCODE_GRAPHQL_URL", "https://leetcode.com/graphql")
+CODEFORCES_API_URL = os.getenv("CODEFORCES_API_URL", "https://codeforces.com/api").rstrip('/')
+CODECHEF_BASE_URL = os.getenv("CODECHEF_BASE_URL", "https://www.codechef.com").rstrip('/')
+
+class CodeforcesAPIError(Exception):
+    """Codeforces API returned an error other than an unknown handle"""
+
+class CodeforcesUserInfoBatcher:
+    """Coalesces concurrent Codeforces user.info lookups into multi-handle requests.
+
+    Handles requested within `window_seconds` of each other (for example by the
+    resumes of one /batch-analyze call) are resolved with a single
+    `user.info?handles=a;b;c` call and the results are fanned back out.
+    """
+
+    def __init__(self, session_factory, window_seconds: float = 0.05, max_batch_size: int = 100):
+        self.session_factory = session_factory
+        self.window_seconds = window_seconds
+        self.max_batch_size = max_batch_size
+        self.pending: Dict[str, List[asyncio.Future]] = {}
+        self.flush_timer = None
+        self.flush_tasks = set()
+        self.stats = {'lookups': 0, 'api_calls': 0, 'batches': 0}
+
+    async def get(self, handle: str) -> Optional[Dict[str, Any]]:
+        """Return the user.info record for a handle, or None if the handle does not exist"""
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        self.pending.setdefault(handle.lower(), []).append(future)
+        self.stats['lookups'] += 1
+
+        if len(self.pending) >= self.max_batch_size:
+            self._start_flush()
+        elif self.flush_timer is None:
+            self.flush_timer = loop.call_later(self.window_seconds, self._start_flush)
+        return await future
+
+    def _start_flush(self):
+        if self.flush_timer is not None:
+            self.flush_timer.cancel()
+            self.flush_timer = None
+        batch, self.pending = self.pending, {}
+        if batch:
+            task = asyncio.ensure_future(self._flush(batch))
+            self.flush_tasks.add(task)
+            task.add_done_callback(self.flush_tasks.discard)
+
+    async def _flush(self, batch: Dict[str, List[asyncio.Future]]):
+        self.stats['batches'] += 1
+        try:
+            results = await self._lookup(list(batch))
+        except Exception as e:
+            for futures in batch.values():
+                for future in futures:
+                    if not future.done():
+                        future.set_exception(e)
+            return
+
+        for handle, futures in batch.items():
+            for future in futures:
+                if not future.done():
+                    future.set_result(results.get(handle))
+
+    async def _lookup(self, handles: List[str]) -> Dict[str, Dict[str, Any]]:
+        """One user.info call for all handles; unknown handles are dropped and the call retried"""
+        remaining = list(handles)
+        found = {}
+        while remaining:
+            self.stats['api_calls'] += 1
+            session = self.session_factory()
+            url = f"{CODEFORCES_API_URL}/user.info?handles={';'.join(remaining)}"
+            async with session.get(url, timeout=aiohttp.ClientTimeout(total=10)) as response:
+                status_code = response.status
+                data = await response.json(content_type=None)
+
+            if data.get('status') == 'OK':
+                # Results come back in request order
+                found.update(zip(remaining, data.get('result', [])))
+                break
+
+            # A single unknown handle fails the whole request, so drop it and retry the rest
+            comment = data.get('comment', '')
+            missing = re.search(r'User with handle (\S+) not found', comment)
+            if missing and missing.group(1).lower() in remaining:
+                remaining.remove(missing.group(1).lower())
+                continue
+            raise CodeforcesAPIError(comment or f"user.info returned HTTP {status_code}")
+        return found
+
+# Rule-engine regexes, compiled once at import
+EMAIL_PATTERN = re.compile(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b')
+PHONE_PATTERN = re.compile(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b')
+PROFILE_LINK_PATTERN = re.compile(r'linkedin|github', re.IGNORECASE)
+ACRONYM_PATTERN = re.compile(r'\b[A-Z]{2,}\b')
+NUMBER_PATTERN = re.compile(r'\d+')
+LONG_WORD_PATTERN = re.compile(r'\b[A-Za-z]{3,}\b')
+SECTION_HEADER_PATTERN = re.compile(r'^[A-Z][a-z]+(\s+[A-Z][a-z]+)*:?$')
+SKILL_SEPARATOR_PATTERN = re.compile(r'[,;/&]')
+TECH_TOKEN_PATTERNS = [
+    re.compile(r'\b[A-Z]{2,}\b'),  # Acronyms (APIs, SQL, etc.)
+    re.compile(r'\b\w+\.\w+\b'),   # Technologies like React.js, Node.js
+    re.compile(r'\b\d+\+?\s*years?\b'),  # Experience years
+    re.compile(r'\b(?:v\d+|\d+\.\d+)\b'),  # Version numbers
+    re.compile(r'\b\w+(?:js|py|cpp|cs)\b')  # Programming language extensions
+]
+METRIC_PATTERNS = [
+    re.compile(r'\d+%', re.IGNORECASE),  # Percentages
+    re.compile(r'[\$₹]\d+[,\d]*', re.IGNORECASE),  # Dollar or Rupee amounts
+    re.compile(r'\d+[,\d]*\+?\s*(users|customers|employees|projects)', re.IGNORECASE),  # Numbers with units
+    re.compile(r'increased|decreased|improved|reduced.*?\d+', re.IGNORECASE),  # Achievement metrics
+]
+GRAMMAR_PATTERNS = [
+    re.compile(r'\bi\s+am\b'),  # Should be capitalized
+    re.compile(r'\s{2,}'),      # Multiple spaces
+    re.compile(r'[.!?]{2,}'),   # Multiple punctuation
+    re.compile(r'\s+[.!?]'),    # Space before punctuation
+]
+JOB_EXPERIENCE_PATTERN = re.compile(r'(\d+)[\+\-\s]*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)')
+RESUME_EXPERIENCE_PATTERNS = [
+    re.compile(r'(\d+)[\+\s]*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'),
+    re.compile(r'(?:experience|exp).*?(\d+)[\+\s]*(?:years?|yrs?)'),
+    re.compile(r'(\d{4})\s*[-–]\s*(?:present|current|\d{4})')  # Date ranges
+]
+JOB_TECH_PATTERNS = [
+    re.compile(r'\b(?:python|java|javascript|react|node\.js|sql|aws|docker|kubernetes|git)\b'),
+    re.compile(r'\b(?:machine learning|data science|artificial intelligence|deep learning)\b'),
+    re.compile(r'\b(?:frontend|backend|full[- ]?stack|devops|mobile|web)\b'),
+    re.compile(r'\b(?:agile|scrum|kanban|ci/cd|microservices|api)\b')
+]
+JOB_SKILL_PATTERNS = [
+    re.compile(r'(?:experience with|proficient in|knowledge of|familiar with)\s+([^.]+)', re.IGNORECASE),
+    re.compile(r'(?:required|must have|should have):\s*([^.]+)', re.IGNORECASE),
+    re.compile(r'(?:skills|technologies|tools):\s*([^.]+)', re.IGNORECASE)
+]
+
+class KeywordMatcher:
+    """Aho-Corasick automaton over several named keyword dictionaries.
+
+    Every dictionary is compiled into one automaton at construction, so a single pass
+    over the text reports the hits of all dictionaries. Terms only match on word
+    boundaries, e.g. 'led' does not match inside 'called'.
+    """
+
+    def __init__(self, dictionaries: Dict[str, List[str]]):
+        self.dictionary_names = list(dictionaries)
+        self.goto: List[Dict[str, int]] = [{}]
+        self.fail: List[int] = [0]
+        self.outputs: List[List[str]] = [[]]
+        # term -> (dictionary names, needs boundary before, needs boundary after)
+        self.terms: Dict[str, tuple] = {}
+
+        for name, terms in dictionaries.items():
+            for term in terms:
+                term = term.lower()
+                if term not in self.terms:
+                    self.terms[term] = ([], self.is_word_char(term[0]), self.is_word_char(term[-1]))
+                    self._add_term(term)
+                if name not in self.terms[term][0]:
+                    self.terms[term][0].append(name)
+        self._build_failure_links()
+
+    @staticmethod
+    def is_word_char(char: str) -> bool:
+        return char.isalnum() or char == '_'
+
+    def _add_term(self, term: str):
+        node = 0
+        for char in term:
+            next_node = self.goto[node].get(char)
+            if next_node is None:
+                next_node = len(self.goto)
+                self.goto.append({})
+                self.fail.append(0)
+                self.outputs.append([])
+                self.goto[node][char] = next_node
+            node = next_node
+        self.outputs[node].append(term)
+
+    def _build_failure_links(self):
+        queue = deque(self.goto[0].values())
+        while queue:
+            node = queue.popleft()
+            for char, child in self.goto[node].items():
+                queue.append(child)
+                fallback = self.fail[node]
+                while fallback and char not in self.goto[fallback]:
+                    fallback = self.fail[fallback]
+                self.fail[child] = self.goto[fallback].get(char, 0)
+                # Inherit the terms that end at the failure state (suffix matches)
+                self.outputs[child] = self.outputs[child] + self.outputs[self.fail[child]]
+
+    def scan(self, text: str) -> Dict[str, set]:
+        """Single pass over lowercased text; returns the matched terms per dictionary"""
+        hits = {name: set() for name in self.dictionary_names}
+        goto, fail, outputs = self.goto, self.fail, self.outputs
+        is_word_char = self.is_word_char
+        text_length = len(text)
+        node = 0
+
+        for index, char in enumerate(text):
+            while node and char not in goto[node]:
+                node = fail[node]
+            node = goto[node].get(char, 0)
+            if not outputs[node]:
+                continue
+
+            for term in outputs[node]:
+                names, bounded_start, bounded_end = self.terms[term]
+                start = index - len(term) + 1
+                if bounded_start and start > 0 and is_word_char(text[start - 1]):
+                    continue
+                if bounded_end and index + 1 < text_length and is_word_char(text[index + 1]):
+                    continue
+                for name in names:
+                    hits[name].add(term)
+        return hits
+
+URL_TEXT_PATTERNS = [
+    re.compile(r'https?://[^\s\)]+'),
+    re.compile(r'www\.[^\s\)]+\.[^\s\)]+'),
+    re.compile(r'[a-zA-Z0-9.-]+\.com[^\s\)]*'),
+    re.compile(r'[a-zA-Z0-9.-]+\.org[^\s\)]*')
+]
+
+def clean_pdf_urls(link_uris: List[str], text: str) -> List[str]:
+    """Hyperlink targets plus URL-looking text, normalised to https:// and deduplicated"""
+    urls = list(link_uris)
+    for pattern in URL_TEXT_PATTERNS:
+        urls.extend(pattern.findall(text))
+
+    clean_urls = []
+    for url in urls:
+        url = url.strip('.,;!?)')
+        if url and len(url) > 8:  # Basic URL length check
+            if not url.startswith('http'):
+                url = 'https://' + url
+            clean_urls.append(url)
+    return list(dict.fromkeys(clean_urls))
+
+def extract_pdf_pages(document, start: int, stop: int) -> List[Dict[str, Any]]:
+    """Text, layout blocks and link URIs for pages [start, stop) of an open PyMuPDF document.
+
+    Text and blocks come from one TextPage, so each page's content is parsed once.
+    """
+    pages = []
+    for page_number in range(start, min(stop, document.page_count)):
+        page = document.load_page(page_number)
+        textpage = page.get_textpage()
+        pages.append({
+            'page': page_number,
+            'text': textpage.extractText(),
+            'blocks': [
+                {'bbox': [round(value, 1) for value in block[:4]], 'text': block[4]}
+                for block in textpage.extractBLOCKS() if block[6] == 0  # text blocks only
+            ],
+            'links': [link['uri'] for link in page.get_links() if link.get('uri')]
+        })
+    return pages
+
+def extract_pdf_page_range(file_content: bytes, start: int, stop: int) -> List[Dict[str, Any]]:
+    """Executor entry point: open the PDF in this process and extract one page range"""
+    with fitz.open(stream=file_content, filetype="pdf") as document:
+        return extract_pdf_pages(document, start, stop)
+
+class PdfExtractionEngine:
+    """Single-pass PDF extraction shared by text and URL consumers.
+
+    PyMuPDF opens the document once and yields text, link URIs and layout blocks
+    together. Documents with at least `parallel_min_pages` pages are split into page
+    ranges extracted on a small process pool (PyMuPDF is not thread-safe). PyPDF2 is
+    only used when PyMuPDF fails or finds no text layer.
+    """
+
+    def __init__(self, page_workers: int = 4, parallel_min_pages: int = 40):
+        self.page_workers = page_workers
+        self.parallel_min_pages = parallel_min_pages
+        self.executor: Optional[ProcessPoolExecutor] = None
+        self.lock = threading.Lock()
+
+    def get_executor(self) -> ProcessPoolExecutor:
+        with self.lock:
+            if self.executor is None:
+                self.executor = ProcessPoolExecutor(max_workers=self.page_workers)
+            return self.executor
+
+    def shutdown(self):
+        with self.lock:
+            if self.executor is not None:
+                self.executor.shutdown(wait=False, cancel_futures=True)
+                self.executor = None
+
+    def _extract_pages(self, file_content: bytes) -> List[Dict[str, Any]]:
+        with fitz.open(stream=file_content, filetype="pdf") as document:
+            page_count = document.page_count
+            if self.page_workers < 2 or page_count < self.parallel_min_pages:
+                return extract_pdf_pages(document, 0, page_count)
+
+        chunk = -(-page_count // self.page_workers)
+        ranges = [(start, min(start + chunk, page_count)) for start in range(0, page_count, chunk)]
+        try:
+            executor = self.get_executor()
+            futures = [executor.submit(extract_pdf_page_range, file_content, start, stop) for start, stop in ranges]
+            return [page for future in futures for page in future.result()]
+        except BrokenExecutor:
+            logger.warning("PDF page pool is broken; extracting pages inline")
+            self.shutdown()
+            return extract_pdf_page_range(file_content, 0, page_count)
+
+    @staticmethod
+    def _result(engine: str, pages: List[Dict[str, Any]]) -> Dict[str, Any]:
+        text = "\n".join(page['text'].strip() for page in pages).strip()
+        return {
+            'text': text,
+            'urls': clean_pdf_urls([uri for page in pages for uri in page['links']], text),
+            'links': [{'page': page['page'], 'uri': uri} for page in pages for uri in page['links']],
+            'blocks': [{'page': page['page'], **block} for page in pages for block in page['blocks']],
+            'page_count': len(pages),
+            'engine': engine
+        }
+
+    def _extract_with_pypdf2(self, file_content: bytes) -> Dict[str, Any]:
+        pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
+        pages = [
+            {'page': page_number, 'text': page.extract_text() or "", 'blocks': [], 'links': []}
+            for page_number, page in enumerate(pdf_reader.pages)
+        ]
+        return self._result('pypdf2', pages)
+
+    def extract(self, file_content: bytes) -> Dict[str, Any]:
+        """Structured extraction: text, urls, links, blocks, page_count and engine.
+
+        On failure `text` carries an "Error reading PDF: ..." message, as before.
+        """
+        try:
+            result = self._result('pymupdf', self._extract_pages(file_content))
+            if result['text']:
+                return result
+            logger.info("PyMuPDF found no text layer; trying PyPDF2")
+        except Exception as e:
+            logger.warning(f"PyMuPDF extraction failed: {e}. Falling back to PyPDF2.")
+            result = None
+
+        try:
+            fallback = self._extract_with_pypdf2(file_content)
+            if fallback['text'] or result is None:
+                return fallback
+            return result
+        except Exception as e:
+            if result is not None:
+                return result
+            return {'text': f"Error reading PDF: {str(e)}", 'urls': [], 'links': [], 'blocks': [],
+                    'page_count': 0, 'engine': None}
+
+pdf_engine = PdfExtractionEngine(
+    page_workers=int(os.getenv("PDF_PAGE_WORKERS", "4")),
+    parallel_min_pages=int(os.getenv("PDF_PARALLEL_MIN_PAGES", "40"))
+)
+
+def incidence_matrix(term_sets: List[set], vocabulary: Dict[str, int]):
+    """Binary CSR matrix with one row per term set over a shared vocabulary"""
+    rows, cols = [], []
+    for row, terms in enumerate(term_sets):
+        for term in terms:
+            col = vocabulary.get(term)
+            if col is not None:
+                rows.append(row)
+                cols.append(col)
+    return sparse.csr_matrix(
+        (np.ones(len(rows)), (rows, cols)), shape=(len(term_sets), len(vocabulary))
+    )
+
+def align_spans(text: str, pieces: List[str]) -> List[tuple]:
+    """Character (start, end) offsets of each piece in text, scanning left to right"""
+    spans = []
+    cursor = 0
+    for piece in pieces:
+        start = text.find(piece, cursor)
+        if start < 0 and piece in ('``', "''"):
+            # NLTK rewrites straight double quotes into `` / ''
+            piece = '"'
+            start = text.find(piece, cursor)
+        if start < 0:
+            spans.append((cursor, cursor))
+            continue
+        spans.append((start, start + len(piece)))
+        cursor = start + len(piece)
+    return spans
+
+class ParsedResume:
+    """Resume text tokenized once per request and shared by every analyzer stage.
+
+    Tokens and sentences are computed on first access and reused afterwards, so a
+    request runs NLTK word and sentence tokenization at most once each.
+    """
+
+    def __init__(self, text: str, word_tokenizer: Callable[[str], List[str]], sent_tokenizer: Callable[[str], List[str]]):
+        self.text = text
+        self.text_lower = text.lower()
+        self.lines = text.split('\n')
+        self.non_empty_lines = [line.strip() for line in self.lines if line.strip()]
+        self._word_tokenizer = word_tokenizer
+        self._sent_tokenizer = sent_tokenizer
+        # Per-request memo for values derived from the document (keyword sets etc.)
+        self.cache: Dict[str, Any] = {}
+
+    @functools.cached_property
+    def tokens(self) -> List[str]:
+        return self._word_tokenizer(self.text)
+
+    @functools.cached_property
+    def tokens_lower(self) -> List[str]:
+        return [token.lower() for token in self.tokens]
+
+    @functools.cached_property
+    def token_offsets(self) -> List[tuple]:
+        # Aligned against the lowercased text since the fallback tokenizer lowercases
+        return align_spans(self.text_lower, self.tokens_lower)
+
+    @functools.cached_property
+    def sentences(self) -> List[str]:
+        return self._sent_tokenizer(self.text)
+
+    @functools.cached_property
+    def sentence_offsets(self) -> List[tuple]:
+        return align_spans(self.text, self.sentences)
+
+    @functools.cached_property
+    def sentence_token_counts(self) -> List[int]:
+        """Number of tokens per sentence, derived from offsets instead of re-tokenizing"""
+        token_starts = [start for start, _ in self.token_offsets]
+        return [
+            bisect.bisect_left(token_starts, end) - bisect.bisect_left(token_starts, start)
+            for start, end in self.sentence_offsets
+        ]
+
+class PrefittedTfidfModel:
+    """TF-IDF weights fitted offline on a resume/JD corpus (see build_tfidf_model.py).
+
+    The model directory holds vocabulary.json (terms in column order), idf.npy
+    (float64 IDF weights, memory-mapped on load) and model.json (vectorizer
+    settings). Requests only run `transform`; job description vectors are cached
+    by content hash.
+    """
+
+    def __init__(self, vocabulary: List[str], idf: np.ndarray, config: Dict[str, Any], job_cache_size: int = 256):
+        if len(vocabulary) != len(idf):
+            raise ValueError(f"Vocabulary has {len(vocabulary)} terms but IDF array has {len(idf)}")
+        self.idf = idf
+        self.config = config
+        self.vectorizer = CountVectorizer(
+            vocabulary={term: index for index, term in enumerate(vocabulary)},
+            ngram_range=tuple(config.get('ngram_range', (1, 2))),
+            stop_words=config.get('stop_words', 'english'),
+            lowercase=True
+        )
+        self.idf_diagonal = sparse.diags(np.asarray(idf), format='csr')
+        self.job_cache_size = job_cache_size
+        self.job_vectors: OrderedDict = OrderedDict()
+        self.lock = threading.Lock()
+        self.stats = {'job_vector_hits': 0, 'job_vector_misses': 0}
+
+    @classmethod
+    def load(cls, model_dir: str, job_cache_size: int = 256) -> Optional['PrefittedTfidfModel']:
+        """Load a model directory; returns None when no model has been built"""
+        vocabulary_path = os.path.join(model_dir, 'vocabulary.json')
+        idf_path = os.path.join(model_dir, 'idf.npy')
+        if not (os.path.exists(vocabulary_path) and os.path.exists(idf_path)):
+            logger.info(f"No pre-fitted TF-IDF model in {model_dir}; fitting per comparison instead")
+            return None
+        try:
+            with open(vocabulary_path, 'r', encoding='utf-8') as f:
+                vocabulary = json.load(f)
+            config_path = os.path.join(model_dir, 'model.json')
+            config = {}
+            if os.path.exists(config_path):
+                with open(config_path, 'r', encoding='utf-8') as f:
+                    config = json.load(f)
+            idf = np.load(idf_path, mmap_mode='r')
+            model = cls(vocabulary, idf, config, job_cache_size)
+            logger.info(f"Loaded pre-fitted TF-IDF model ({len(vocabulary)} terms) from {model_dir}")
+            return model
+        except Exception as e:
+            logger.warning(f"Failed to load TF-IDF model from {model_dir}: {e}")
+            return None
+
+    def transform(self, texts: List[str]):
+        """L2-normalised TF-IDF rows for texts (sparse CSR matrix)"""
+        counts = self.vectorizer.transform(texts)
+        if self.config.get('sublinear_tf'):
+            counts = counts.astype(np.float64)
+            counts.data = np.log(counts.data) + 1
+        return normalize(counts @ self.idf_diagonal)
+
+    def job_vector(self, job_description: str):
+        """TF-IDF row for a job description, cached by SHA-256 of the text"""
+        key = hashlib.sha256(job_description.encode('utf-8')).hexdigest()
+        with self.lock:
+            if key in self.job_vectors:
+                self.job_vectors.move_to_end(key)
+                self.stats['job_vector_hits'] += 1
+                return self.job_vectors[key]
+            self.stats['job_vector_misses'] += 1
+
+        vector = self.transform([job_description])
+        with self.lock:
+            self.job_vectors[key] = vector
+            while len(self.job_vectors) > self.job_cache_size:
+                self.job_vectors.popitem(last=False)
+        return vector
+
+    @staticmethod
+    def similarity(resume_vector, job_vector) -> float:
+        """Cosine similarity between two transformed (L2-normalised) rows"""
+        return float((resume_vector @ job_vector.T).toarray()[0][0])
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            return {
+                **self.stats,
+                'vocabulary_size': len(self.idf),
+                'cached_job_vectors': len(self.job_vectors),
+                'documents': self.config.get('n_documents')
+            }
+
+# Loaded once per process; worker processes share the memory-mapped IDF pages
+tfidf_model = PrefittedTfidfModel.load(
+    os.getenv("TFIDF_MODEL_DIR") or os.path.join(os.path.dirname(os.path.abspath(__file__)), "tfidf_model"),
+    job_cache_size=int(os.getenv("TFIDF_JOB_VECTOR_CACHE_SIZE", "256"))
+)
+
+def job_description_id(job_description: str) -> str:
+    """Content-addressed id for a job description (same text, same id)"""
+    return hashlib.sha256(job_description.encode('utf-8')).hexdigest()[:16]
+
+class JobDescriptionProfile:
+    """A job description compiled once so each resume comparison only does lookups"""
+
+    def __init__(self, jd_id: str, text: str, keywords: set, required_experience: Optional[int],
+                 education_level: int, skill_hits: set, long_words: set, tfidf_vector=None,
+                 title: Optional[str] = None):
+        self.jd_id = jd_id
+        self.text = text
+        self.title = title
+        self.keywords = keywords
+        self.required_experience = required_experience
+        self.education_level = education_level
+        self.skill_hits = skill_hits
+        self.long_words = long_words
+        self.tfidf_vector = tfidf_vector
+        self.created_at = datetime.now().isoformat()
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            'jd_id': self.jd_id,
+            'title': self.title,
+            'characters': len(self.text),
+            'keywords': sorted(self.keywords),
+            'skills': sorted(self.skill_hits),
+            'required_experience_years': self.required_experience,
+            'education_level': self.education_level,
+            'created_at': self.created_at
+        }
+
+class JobDescriptionStore:
+    """LRU of compiled job descriptions, bounded by entry count and total characters"""
+
+    def __init__(self, max_entries: int = 500, max_chars: int = 5_000_000):
+        self.max_entries = max_entries
+        self.max_chars = max_chars
+        self.entries: OrderedDict = OrderedDict()
+        self.total_chars = 0
+        self.lock = threading.Lock()
+        self.stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def get(self, jd_id: str) -> Optional[JobDescriptionProfile]:
+        with self.lock:
+            profile = self.entries.get(jd_id)
+            if profile is None:
+                self.stats['misses'] += 1
+                return None
+            self.entries.move_to_end(jd_id)
+            self.stats['hits'] += 1
+            return profile
+
+    def put(self, profile: JobDescriptionProfile):
+        with self.lock:
+            previous = self.entries.pop(profile.jd_id, None)
+            if previous is not None:
+                self.total_chars -= len(previous.text)
+            self.entries[profile.jd_id] = profile
+            self.total_chars += len(profile.text)
+            while len(self.entries) > 1 and (len(self.entries) > self.max_entries or self.total_chars > self.max_chars):
+                _, evicted = self.entries.popitem(last=False)
+                self.total_chars -= len(evicted.text)
+                self.stats['evictions'] += 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            return {
+                **self.stats,
+                'entries': len(self.entries),
+                'max_entries': self.max_entries,
+                'total_chars': self.total_chars,
+                'max_chars': self.max_chars,
+                'hit_rate': round(self.stats['hits'] / lookups, 3) if lookups else 0.0
+            }
+
 class AdvancedATSAnalyzer:
     def __init__(self, groq_api_key=None):
-        # Initialize Groq client
+        # Groq credentials for the shared LLM gateway
         self.groq_api_key = groq_api_key or os.getenv("GROQ_API_KEY","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")
         if self.groq_api_key:
-            self.groq_client = Groq(api_key=self.groq_api_key)
+            llm_gateway.configure("groq", api_key=self.groq_api_key)
             self.model_name = "llama-3.3-70b-versatile"  # Default Groq model
         else:
-            self.groq_client = None
             self.model_name = None
             logger.warning("No Groq API key provided. Using rule-based analysis only.")
         
         self.preferred_models = ["llama-3.1-70b-versatile", "llama-3.1-8b-instant", "mixtral-8x7b-32768"]
-        
+
+        # Upper bound on coding-profile fetching per request; slower platforms are skipped
+        self.profile_fetch_deadline = float(os.getenv("PROFILE_FETCH_DEADLINE_SECONDS", "12"))
+
+        # Shared outbound HTTP session (opened at app startup, closed at shutdown)
+        self.http_session: Optional[aiohttp.ClientSession] = None
+        self.http_pool_limit = int(os.getenv("HTTP_POOL_LIMIT", "100"))
+        self.http_pool_limit_per_host = int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10"))
+
+        # In-flight stale-while-revalidate refreshes, keyed like the profile cache
+        self.profile_refresh_tasks: Dict[tuple, asyncio.Future] = {}
+
+        # Compiled job descriptions (POST /job-descriptions and implicit compiles)
+        self.job_profiles = JobDescriptionStore(
+            max_entries=int(os.getenv("JOB_DESCRIPTION_CACHE_SIZE", "500")),
+            max_chars=int(os.getenv("JOB_DESCRIPTION_CACHE_MAX_CHARS", "5000000"))
+        )
+
+        # Incremental Codeforces submission sync
+        self.codeforces_sync_tasks: Dict[str, asyncio.Future] = {}
+        self.codeforces_initial_page_size = 1000
+        self.codeforces_incremental_page_size = 100
+        self.codeforces_max_pages = int(os.getenv("CODEFORCES_MAX_SYNC_PAGES", "50"))
+        self.codeforces_user_info = CodeforcesUserInfoBatcher(
+            self.get_http_session,
+            window_seconds=float(os.getenv("CODEFORCES_BATCH_WINDOW_MS", "50")) / 1000
+        )
+
         # Load spaCy model
         try:
             self.nlp = spacy.load("en_core_web_sm")
@@ -174,6 +1366,74 @@ class AdvancedATSAnalyzer:
             'projects': r'projects|portfolio|work samples',
             'achievements': r'achievement|award|recognition|honor'
         }
+        self.section_patterns = {
+            name: re.compile(pattern, re.IGNORECASE) for name, pattern in self.standard_sections.items()
+        }
+        
+        # Skill categories for resume / job description skills matching
+        self.skill_categories = {
+            'programming': [
+                'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
+                'scala', 'kotlin', 'swift', 'dart', 'r', 'matlab', 'perl', 'shell', 'bash'
+            ],
+            'web_frontend': [
+                'react', 'vue', 'angular', 'html', 'css', 'sass', 'less', 'bootstrap', 'tailwind',
+                'jquery', 'webpack', 'babel', 'npm', 'yarn', 'typescript'
+            ],
+            'web_backend': [
+                'node.js', 'express', 'django', 'flask', 'spring', 'rails', 'laravel', 'asp.net',
+                'fastapi', 'nestjs', 'koa', 'gin', 'fiber'
+            ],
+            'databases': [
+                'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'sqlite', 'oracle',
+                'sql server', 'cassandra', 'dynamodb', 'firebase'
+            ],
+            'cloud_devops': [
+                'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github actions',
+                'terraform', 'ansible', 'chef', 'puppet', 'vagrant'
+            ],
+            'data_science': [
+                'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'matplotlib',
+                'seaborn', 'plotly', 'jupyter', 'r', 'stata', 'spss'
+            ],
+            'mobile': [
+                'android', 'ios', 'react native', 'flutter', 'swift', 'kotlin', 'xamarin',
+                'ionic', 'cordova', 'native script'
+            ]
+        }
+        
+        # Education levels hierarchy
+        self.education_levels = {
+            'phd': 5, 'doctorate': 5, 'ph.d': 5,
+            'masters': 4, 'master': 4, 'msc': 4, 'mba': 4, 'ms': 4,
+            'bachelors': 3, 'bachelor': 3, 'bsc': 3, 'ba': 3, 'btech': 3, 'be': 3,
+            'associate': 2, 'diploma': 2,
+            'certificate': 1, 'certification': 1
+        }
+        
+        # Weights of the resume vs job description similarity components
+        self.similarity_weights = {
+            'tfidf': 0.25,
+            'keywords': 0.30,
+            'skills': 0.25,
+            'experience': 0.10,
+            'education': 0.10
+        }
+        
+        # Smaller vocabularies used by individual rule checks
+        self.tech_terms = [
+            'api', 'framework', 'library', 'database', 'cloud', 'devops', 'agile', 'scrum',
+            'microservices', 'container', 'deployment', 'ci/cd', 'testing', 'automation'
+        ]
+        self.informal_words = ['awesome', 'cool', 'stuff', 'things', 'got', 'gonna', 'wanna']
+        self.common_mistakes = {
+            'recieve': 'receive', 'seperate': 'separate', 'definately': 'definitely',
+            'occured': 'occurred', 'begining': 'beginning', 'managment': 'management',
+            'enviroment': 'environment', 'sucessful': 'successful'
+        }
+        self.strong_verbs = ['achieved', 'developed', 'implemented', 'optimized', 'increased', 'reduced', 'managed', 'led']
+        self.leadership_terms = ['led', 'managed', 'supervised', 'coordinated', 'mentored']
+        self.required_section_terms = ['experience', 'education', 'skills']
         
         # Coding platform patterns for URL detection
         self.coding_platforms = {
@@ -183,7 +1443,7 @@ class AdvancedATSAnalyzer:
                     r'leetcode\.com/(?:u/)?([^/\s]+)',
                     r'lc\.com/([^/\s]+)'
                 ],
-                'api_base': 'https://leetcode.com/graphql',
+                'api_base': LEETCODE_GRAPHQL_URL,
                 'rating_thresholds': {
                     'beginner': 0,
                     'intermediate': 1400,
@@ -197,7 +1457,7 @@ class AdvancedATSAnalyzer:
                     r'codeforces\.com/profile/([^/\s]+)',
                     r'cf\.com/profile/([^/\s]+)'
                 ],
-                'api_base': 'https://codeforces.com/api',
+                'api_base': CODEFORCES_API_URL,
                 'rating_thresholds': {
                     'newbie': 0,
                     'pupil': 1200,
@@ -215,7 +1475,7 @@ class AdvancedATSAnalyzer:
                     r'codechef\.com/users/([^/\s]+)',
                     r'cc\.com/users/([^/\s]+)'
                 ],
-                'api_base': 'https://www.codechef.com/api',
+                'api_base': f"{CODECHEF_BASE_URL}/api",
                 'rating_thresholds': {
                     'unrated': 0,
                     '1_star': 1400,
@@ -258,61 +1518,105 @@ class AdvancedATSAnalyzer:
             }
         }
         
+        # All rule vocabularies in one automaton: one scan of the text serves every check
+        self.keyword_matcher = KeywordMatcher({
+            'action_verbs': [verb for verbs in self.action_verbs.values() for verb in verbs],
+            'industry': [keyword for keywords in self.industry_keywords.values() for keyword in keywords],
+            'industry_parts': [part for keywords in self.industry_keywords.values() for keyword in keywords for part in keyword.split()],
+            'skills': [skill for skills in self.skill_categories.values() for skill in skills],
+            'education': list(self.education_levels),
+            'tech_terms': self.tech_terms,
+            'informal_words': self.informal_words,
+            'common_mistakes': list(self.common_mistakes),
+            'strong_verbs': self.strong_verbs,
+            'leadership_terms': self.leadership_terms,
+            'sections': self.required_section_terms
+        })
+        
         # Test connection if API key is available
-        if self.groq_client:
+        if self.model_name:
             pass  # Client initialized silently
         else:
             logger.info("Using advanced rule-based analysis only.")
     
-    def test_groq_connection(self) -> bool:
+    async def test_groq_connection(self) -> bool:
         """Test if Groq API is accessible"""
-        if not self.groq_client:
+        if not self.model_name:
             return False
         try:
             # Try a simple completion to test the connection
-            response = self.groq_client.chat.completions.create(
-                messages=[{"role": "user", "content": "test"}],
-                model=self.model_name,
-                max_tokens=1
-            )
+            await llm_gateway.complete("groq", [self.model_name], "test", max_tokens=1)
             return True
-        except Exception as e:
+        except LLMError as e:
             logger.warning(f"Groq connection test failed: {e}")
             return False
     
+    def get_http_session(self) -> aiohttp.ClientSession:
+        """Return the pooled HTTP session, creating it if startup has not run yet"""
+        if self.http_session is None or self.http_session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.http_pool_limit,
+                limit_per_host=self.http_pool_limit_per_host,
+                ttl_dns_cache=300,  # Cache DNS lookups for 5 minutes
+                keepalive_timeout=60
+            )
+            self.http_session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=15)
+            )
+        return self.http_session
+
+    async def close_http_session(self):
+        """Close the pooled HTTP session and its keep-alive connections"""
+        if self.http_session is not None and not self.http_session.closed:
+            await self.http_session.close()
+        self.http_session = None
+
     def get_available_models(self) -> List[str]:
         """Get list of available Groq models"""
         return self.preferred_models
     
     async def call_groq_async(self, prompt: str, max_tokens: int = 1500) -> str:
-        """Async call to Groq API with delay"""
-        if not self.groq_client or not self.model_name:
+        """Async call to Groq API, throttled by the shared rate limiter"""
+        if not self.model_name:
             return "Error: No Groq model available"
-        
+
+        model = self.model_name
+        # Repeated prompts are answered from the cache without spending rate-limit budget
+        cache_key = llm_cache.make_key("groq", model, prompt,
+                                       params={'max_tokens': max_tokens, 'temperature': 0.1, 'top_p': 0.9})
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Rough estimate (~4 chars per token) plus the completion budget
+        estimated_tokens = len(prompt) // 4 + max_tokens
+
+        async def charge(attempt_model: str):
+            # Every request the gateway sends (retries, fallback models, hedges) is charged to the
+            # model it targets; only waits when that model's budget is actually exhausted
+            await llm_rate_limiter.acquire(attempt_model, estimated_tokens)
+
         try:
-            # Add random delay between 45-60 seconds
-            delay_time = random.uniform(45, 60)
-            logger.info(f"Adding delay of {delay_time:.2f} seconds before API call...")
-            await asyncio.sleep(delay_time)
-            
-            # Make the actual API call
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.groq_client.chat.completions.create(
-                    messages=[
-                        {"role": "user", "content": prompt}
-                    ],
-                    model=self.model_name,
-                    max_tokens=max_tokens,
-                    temperature=0.1,
-                    top_p=0.9
-                )
-            )
-            
-            return response.choices[0].message.content
-                
-        except Exception as e:
+            # Retries, timeouts and fallback to GROQ_FALLBACK_MODELS are handled by the gateway
+            response = await llm_gateway.complete("groq", model, prompt, max_tokens=max_tokens,
+                                                  temperature=0.1, top_p=0.9, before_send=charge)
+            llm_rate_limiter.update_from_headers(response.model, response.headers)
+
+            total_tokens = None
+            if response.prompt_tokens is not None and response.completion_tokens is not None:
+                total_tokens = response.prompt_tokens + response.completion_tokens
+            llm_rate_limiter.reconcile(response.model, estimated_tokens, total_tokens)
+
+            # Truncated completions and fallback-model answers are not worth replaying
+            if response.finish_reason == 'stop' and response.model == model:
+                llm_cache.set(cache_key, response.text, "groq", model,
+                              response.prompt_tokens, response.completion_tokens)
+            return response.text
+
+        except LLMError as e:
+            # Rate-limit errors carry retry-after / x-ratelimit-* headers as well
+            llm_rate_limiter.update_from_headers(e.model or model, e.headers)
             logger.error(f"Groq API call failed: {str(e)}")
             return f"Error: {str(e)}"
     
@@ -335,84 +1639,60 @@ class AdvancedATSAnalyzer:
             sentences = re.split(r'[.!?]+', text)
             # Filter out empty sentences and strip whitespace
             return [s.strip() for s in sentences if s.strip()]
-    
+
+    def analyzer_version(self) -> str:
+        """Result cache version: rule version plus the LLM that contributes suggestions"""
+        return f"{ANALYZER_VERSION}:{self.model_name or 'rules'}"
+
+    def parse_resume(self, resume) -> ParsedResume:
+        """Wrap resume text in a ParsedResume; an existing ParsedResume is passed through"""
+        if isinstance(resume, ParsedResume):
+            return resume
+        return ParsedResume(resume, self.safe_word_tokenize, self.safe_sent_tokenize)
+
+    def compile_job_description(self, job_description: str, title: Optional[str] = None) -> JobDescriptionProfile:
+        """Derive everything resume matching needs from a job description, once"""
+        job_lower = job_description.lower()
+        experience_matches = JOB_EXPERIENCE_PATTERN.findall(job_lower)
+        hits = self.keyword_matcher.scan(job_lower)
+        return JobDescriptionProfile(
+            jd_id=job_description_id(job_description),
+            text=job_description,
+            title=title,
+            keywords=self.extract_job_keywords(job_description),
+            required_experience=max(int(exp) for exp in experience_matches) if experience_matches else None,
+            education_level=max((self.education_levels[edu] for edu in hits['education']), default=0),
+            skill_hits=hits['skills'],
+            long_words=set(LONG_WORD_PATTERN.findall(job_lower)),
+            tfidf_vector=tfidf_model.job_vector(job_description) if tfidf_model is not None else None
+        )
+
+    def get_job_profile(self, job_description: str) -> JobDescriptionProfile:
+        """Compiled profile for a job description, compiling and caching it on first use"""
+        profile = self.job_profiles.get(job_description_id(job_description))
+        if profile is None:
+            profile = self.compile_job_description(job_description)
+            self.job_profiles.put(profile)
+        return profile
+
+    def keyword_hits(self, resume) -> Dict[str, set]:
+        """Dictionary hits for a resume, scanned once per document"""
+        doc = self.parse_resume(resume)
+        if 'keyword_hits' not in doc.cache:
+            doc.cache['keyword_hits'] = self.keyword_matcher.scan(doc.text_lower)
+        return doc.cache['keyword_hits']
+
+    def extract_pdf(self, file_content: bytes) -> Dict[str, Any]:
+        """Structured PDF extraction (text, urls, links, blocks) from a single pass"""
+        return pdf_engine.extract(file_content)
+
     def extract_text_from_pdf(self, file_content: bytes) -> str:
         """Extract text from PDF file"""
-        try:
-            pdf_reader = PyPDF2.PdfReader(io.BytesIO(file_content))
-            text = ""
-            for page in pdf_reader.pages:
-                text += page.extract_text() + "\n"
-            return text.strip()
-        except Exception as e:
-            return f"Error reading PDF: {str(e)}"
+        return self.extract_pdf(file_content)['text']
 
     def extract_urls_from_pdf(self, file_content: bytes) -> List[str]:
-        """Extract URLs/hyperlinks from PDF file using PyMuPDF"""
-        urls = []
-        try:
-            # Use PyMuPDF for better URL extraction
-            pdf_document = fitz.open(stream=file_content, filetype="pdf")
-            
-            for page_num in range(pdf_document.page_count):
-                page = pdf_document.load_page(page_num)
-                
-                # Extract links from page
-                links = page.get_links()
-                for link in links:
-                    if 'uri' in link:
-                        urls.append(link['uri'])
-                
-                # Also extract text and search for URL patterns
-                text = page.get_text()
-                url_patterns = [
-                    r'https?://[^\s\)]+',
-                    r'www\.[^\s\)]+\.[^\s\)]+',
-                    r'[a-zA-Z0-9.-]+\.com[^\s\)]*',
-                    r'[a-zA-Z0-9.-]+\.org[^\s\)]*'
-                ]
-                
-                for pattern in url_patterns:
-                    found_urls = re.findall(pattern, text)
-                    urls.extend(found_urls)
-            
-            pdf_document.close()
-            
-            # Clean and deduplicate URLs
-            clean_urls = []
-            for url in urls:
-                url = url.strip('.,;!?)')
-                if url and len(url) > 8:  # Basic URL length check
-                    if not url.startswith('http'):
-                        url = 'https://' + url
-                    clean_urls.append(url)
-            
-            return list(set(clean_urls))  # Remove duplicates
-            
-        except Exception as e:
-            logger.warning(f"URL extraction from PDF failed: {e}")
-            
-            # Fallback: extract from text using regex
-            try:
-                text = self.extract_text_from_pdf(file_content)
-                url_patterns = [
-                    r'https?://[^\s\)]+',
-                    r'www\.[^\s\)]+\.[^\s\)]+',
-                    r'leetcode\.com[^\s\)]*',
-                    r'codeforces\.com[^\s\)]*',
-                    r'codechef\.com[^\s\)]*'
-                ]
-                
-                urls = []
-                for pattern in url_patterns:
-                    found_urls = re.findall(pattern, text)
-                    urls.extend(found_urls)
-                
-                return list(set(urls))
-                
-            except Exception as fallback_error:
-                logger.error(f"Fallback URL extraction failed: {fallback_error}")
-                return []
+        """Extract URLs/hyperlinks from PDF file"""
+        return self.extract_pdf(file_content)['urls']
 
     def extract_coding_profiles_from_text(self, text: str) -> List[Dict[str, str]]:
         """Extract coding platform profiles from text"""
@@ -491,55 +1771,57 @@ class AdvancedATSAnalyzer:
             }
             """
             
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                async with session.post(
-                    'https://leetcode.com/graphql',
-                    json={'query': query, 'variables': {'username': username}},
-                    headers={'Content-Type': 'application/json'}
-                ) as response:
-                    if response.status == 200:
-                        data = await response.json()
+            session = self.get_http_session()
+            request_timeout = aiohttp.ClientTimeout(total=10)
+            async with session.post(
+                LEETCODE_GRAPHQL_URL,
+                json={'query': query, 'variables': {'username': username}},
+                headers={'Content-Type': 'application/json'},
+                timeout=request_timeout
+            ) as response:
+                if response.status == 200:
+                    data = await response.json()
+                    
+                    if data.get('data', {}).get('matchedUser'):
+                        user_data = data['data']['matchedUser']
+                        submit_stats = user_data.get('submitStats', {}).get('acSubmissionNum', [])
                         
-                        if data.get('data', {}).get('matchedUser'):
-                            user_data = data['data']['matchedUser']
-                            submit_stats = user_data.get('submitStats', {}).get('acSubmissionNum', [])
-                            
-                            total_solved = 0
-                            easy_solved = 0
-                            medium_solved = 0
-                            hard_solved = 0
-                            
-                            for stat in submit_stats:
-                                if stat['difficulty'] == 'All':
-                                    total_solved = stat['count']
-                                elif stat['difficulty'] == 'Easy':
-                                    easy_solved = stat['count']
-                                elif stat['difficulty'] == 'Medium':
-                                    medium_solved = stat['count']
-                                elif stat['difficulty'] == 'Hard':
-                                    hard_solved = stat['count']
-                            
-                            profile_data = user_data.get('profile', {})
-                            
-                            return {
-                                'platform': 'leetcode',
-                                'username': username,
-                                'url': f"https://leetcode.com/u/{username}",
-                                'problems_solved': total_solved,
-                                'easy_solved': easy_solved,
-                                'medium_solved': medium_solved,
-                                'hard_solved': hard_solved,
-                                'ranking': profile_data.get('ranking'),
-                                'reputation': profile_data.get('reputation', 0),
-                                'badges': len(user_data.get('badges', [])),
-                                'real_name': profile_data.get('realName', ''),
-                                'status': 'success'
-                            }
-                        else:
-                            return {'platform': 'leetcode', 'username': username, 'status': 'user_not_found'}
+                        total_solved = 0
+                        easy_solved = 0
+                        medium_solved = 0
+                        hard_solved = 0
+                        
+                        for stat in submit_stats:
+                            if stat['difficulty'] == 'All':
+                                total_solved = stat['count']
+                            elif stat['difficulty'] == 'Easy':
+                                easy_solved = stat['count']
+                            elif stat['difficulty'] == 'Medium':
+                                medium_solved = stat['count']
+                            elif stat['difficulty'] == 'Hard':
+                                hard_solved = stat['count']
+                        
+                        profile_data = user_data.get('profile', {})
+                        
+                        return {
+                            'platform': 'leetcode',
+                            'username': username,
+                            'url': f"https://leetcode.com/u/{username}",
+                            'problems_solved': total_solved,
+                            'easy_solved': easy_solved,
+                            'medium_solved': medium_solved,
+                            'hard_solved': hard_solved,
+                            'ranking': profile_data.get('ranking'),
+                            'reputation': profile_data.get('reputation', 0),
+                            'badges': len(user_data.get('badges', [])),
+                            'real_name': profile_data.get('realName', ''),
+                            'status': 'success'
+                        }
                     else:
-                        return {'platform': 'leetcode', 'username': username, 'status': 'api_error'}
-        
+                        return {'platform': 'leetcode', 'username': username, 'status': 'user_not_found'}
+                else:
+                    return {'platform': 'leetcode', 'username': username, 'status': 'api_error'}
+
         except Exception as e:
             logger.warning(f"LeetCode API error for {username}: {e}")
             return {'platform': 'leetcode', 'username': username, 'status': 'error', 'error': str(e)}
@@ -547,134 +1829,245 @@ class AdvancedATSAnalyzer:
     async def fetch_codeforces_profile(self, username: str) -> Dict[str, Any]:
         """Fetch Codeforces profile data"""
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=10)) as session:
-                # Fetch user info
-                async with session.get(f'https://codeforces.com/api/user.info?handles={username}') as response:
-                    if response.status == 200:
-                        data = await response.json()
-                        
-                        if data.get('status') == 'OK' and data.get('result'):
-                            user_info = data['result'][0]
-                            
-                            # Fetch user submissions
-                            async with session.get(f'https://codeforces.com/api/user.status?handle={username}&from=1&count=1000') as sub_response:
-                                submissions_data = {}
-                                if sub_response.status == 200:
-                                    sub_data = await sub_response.json()
-                                    if sub_data.get('status') == 'OK':
-                                        submissions = sub_data.get('result', [])
-                                        
-                                        # Count accepted problems
-                                        accepted_problems = set()
-                                        for submission in submissions:
-                                            if submission.get('verdict') == 'OK':
-                                                problem_id = f"{submission.get('problem', {}).get('contestId')}-{submission.get('problem', {}).get('index')}"
-                                                accepted_problems.add(problem_id)
-                                        
-                                        submissions_data = {
-                                            'problems_solved': len(accepted_problems),
-                                            'total_submissions': len(submissions)
-                                        }
-                            
-                            return {
-                                'platform': 'codeforces',
-                                'username': username,
-                                'url': f"https://codeforces.com/profile/{username}",
-                                'rating': user_info.get('rating'),
-                                'max_rating': user_info.get('maxRating'),
-                                'rank': user_info.get('rank', ''),
-                                'max_rank': user_info.get('maxRank', ''),
-                                'problems_solved': submissions_data.get('problems_solved', 0),
-                                'total_submissions': submissions_data.get('total_submissions', 0),
-                                'contribution': user_info.get('contribution', 0),
-                                'last_online': user_info.get('lastOnlineTimeSeconds'),
-                                'registration_time': user_info.get('registrationTimeSeconds'),
-                                'status': 'success'
-                            }
-                        else:
-                            return {'platform': 'codeforces', 'username': username, 'status': 'user_not_found'}
-                    else:
-                        return {'platform': 'codeforces', 'username': username, 'status': 'api_error'}
-        
+            # user.info lookups are coalesced with other analyses running concurrently
+            user_info = await self.codeforces_user_info.get(username)
+            if not user_info:
+                return {'platform': 'codeforces', 'username': username, 'status': 'user_not_found'}
+
+            # Sync only submissions newer than the last one we have stored
+            submissions_data = {}
+            try:
+                submissions_data = await self.sync_codeforces_submissions(user_info.get('handle', username))
+            except Exception as e:
+                logger.warning(f"Codeforces submission sync failed for {username}: {e}")
+
+            return {
+                'platform': 'codeforces',
+                'username': username,
+                'url': f"https://codeforces.com/profile/{username}",
+                'rating': user_info.get('rating'),
+                'max_rating': user_info.get('maxRating'),
+                'rank': user_info.get('rank', ''),
+                'max_rank': user_info.get('maxRank', ''),
+                'problems_solved': submissions_data.get('problems_solved', 0),
+                'total_submissions': submissions_data.get('total_submissions', 0),
+                'verdict_histogram': submissions_data.get('verdicts', {}),
+                'contribution': user_info.get('contribution', 0),
+                'last_online': user_info.get('lastOnlineTimeSeconds'),
+                'registration_time': user_info.get('registrationTimeSeconds'),
+                'status': 'success'
+            }
+
+        except CodeforcesAPIError as e:
+            logger.warning(f"Codeforces API error for {username}: {e}")
+            return {'platform': 'codeforces', 'username': username, 'status': 'api_error'}
         except Exception as e:
             logger.warning(f"Codeforces API error for {username}: {e}")
             return {'platform': 'codeforces', 'username': username, 'status': 'error', 'error': str(e)}
 
+    async def _sync_codeforces_submissions(self, handle: str) -> Dict[str, Any]:
+        """Page through user.status (newest first) until reaching the stored watermark"""
+        session = self.get_http_session()
+        request_timeout = aiohttp.ClientTimeout(total=10)
+        state = codeforces_submission_store.get_state(handle)
+        # A handle whose first sync failed or hit the page cap has a cf_handles row but no
+        # watermark yet; it stays in initial mode until one full pass completes
+        initial_sync = state is None or state['synced_at'] is None or state['last_submission_id'] == 0
+        last_seen_id = 0 if initial_sync else state['last_submission_id']
+        # Full history is paged in large chunks the first time, small chunks afterwards
+        page_size = self.codeforces_initial_page_size if initial_sync else self.codeforces_incremental_page_size
+
+        start = 1
+        newest_judged_id = last_seen_id
+        oldest_pending_id = None
+        for _ in range(self.codeforces_max_pages):
+            url = f'{CODEFORCES_API_URL}/user.status?handle={handle}&from={start}&count={page_size}'
+            async with session.get(url, timeout=request_timeout) as response:
+                if response.status != 200:
+                    raise RuntimeError(f"user.status returned HTTP {response.status}")
+                data = await response.json()
+            if data.get('status') != 'OK':
+                raise RuntimeError(data.get('comment', 'user.status failed'))
+
+            page = data.get('result', [])
+            judged = []
+            reached_watermark = False
+            for submission in page:
+                if submission['id'] <= last_seen_id:
+                    reached_watermark = True
+                    break
+                # Submissions still being judged are picked up again on the next sync
+                if submission.get('verdict') in (None, 'TESTING'):
+                    oldest_pending_id = submission['id'] if oldest_pending_id is None else min(oldest_pending_id, submission['id'])
+                    continue
+                judged.append(submission)
+                newest_judged_id = max(newest_judged_id, submission['id'])
+
+            codeforces_submission_store.apply_submissions(handle, judged)
+            if reached_watermark or len(page) < page_size:
+                break
+            start += page_size
+        else:
+            # Page cap hit: keep what was applied but leave the watermark so the rest is fetched later
+            logger.warning(f"Codeforces sync for {handle} stopped after {self.codeforces_max_pages} pages")
+            return codeforces_submission_store.get_state(handle) or {}
+
+        if oldest_pending_id is not None:
+            newest_judged_id = min(newest_judged_id, oldest_pending_id - 1)
+        codeforces_submission_store.mark_synced(handle, newest_judged_id)
+        return codeforces_submission_store.get_state(handle) or {}
+
+    async def sync_codeforces_submissions(self, handle: str) -> Dict[str, Any]:
+        """Incrementally sync a handle's submissions; concurrent callers share one sync.
+
+        The sync is shielded from cancellation so a first full-history pull still
+        completes (and is stored) when the caller hits its profile-fetch deadline.
+        """
+        key = handle.lower()
+        task = self.codeforces_sync_tasks.get(key)
+        if task is None or task.done():
+            task = asyncio.ensure_future(self._sync_codeforces_submissions(handle))
+            self.codeforces_sync_tasks[key] = task
+            task.add_done_callback(lambda _: self.codeforces_sync_tasks.pop(key, None))
+        return await asyncio.shield(task)
+
     async def fetch_codechef_profile(self, username: str) -> Dict[str, Any]:
         """Fetch CodeChef profile data (web scraping as API is limited)"""
         try:
-            async with aiohttp.ClientSession(timeout=aiohttp.ClientTimeout(total=15)) as session:
-                headers = {
-                    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-                }
-                
-                async with session.get(f'https://www.codechef.com/users/{username}', headers=headers) as response:
-                    if response.status == 200:
-                        html = await response.text()
-                        soup = BeautifulSoup(html, 'html.parser')
-                        
-                        # Extract rating
-                        rating = None
-                        rating_elements = soup.find_all(['div', 'span'], class_=re.compile(r'rating'))
-                        for element in rating_elements:
-                            text = element.get_text().strip()
-                            rating_match = re.search(r'(\d{3,4})', text)
-                            if rating_match:
-                                rating = int(rating_match.group(1))
+            session = self.get_http_session()
+            request_timeout = aiohttp.ClientTimeout(total=15)
+            headers = {
+                'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+            }
+            
+            async with session.get(f'{CODECHEF_BASE_URL}/users/{username}', headers=headers, timeout=request_timeout) as response:
+                if response.status == 200:
+                    html = await response.text()
+                    soup = BeautifulSoup(html, 'html.parser')
+                    
+                    # Extract rating
+                    rating = None
+                    rating_elements = soup.find_all(['div', 'span'], class_=re.compile(r'rating'))
+                    for element in rating_elements:
+                        text = element.get_text().strip()
+                        rating_match = re.search(r'(\d{3,4})', text)
+                        if rating_match:
+                            rating = int(rating_match.group(1))
+                            break
+                    
+                    # Extract problems solved
+                    problems_solved = 0
+                    problem_elements = soup.find_all(text=re.compile(r'problems?\s+solved', re.IGNORECASE))
+                    for element in problem_elements:
+                        parent = element.parent
+                        if parent:
+                            numbers = re.findall(r'\d+', parent.get_text())
+                            if numbers:
+                                problems_solved = int(numbers[0])
                                 break
-                        
-                        # Extract problems solved
-                        problems_solved = 0
-                        problem_elements = soup.find_all(text=re.compile(r'problems?\s+solved', re.IGNORECASE))
-                        for element in problem_elements:
-                            parent = element.parent
-                            if parent:
-                                numbers = re.findall(r'\d+', parent.get_text())
+                    
+                    # Extract star rating
+                    stars = 0
+                    star_elements = soup.find_all(['span', 'div'], class_=re.compile(r'star'))
+                    for element in star_elements:
+                        star_text = element.get_text()
+                        star_match = re.search(r'(\d+)\s*star', star_text, re.IGNORECASE)
+                        if star_match:
+                            stars = int(star_match.group(1))
+                            break
+                    
+                    # Extract rank
+                    rank = ""
+                    rank_elements = soup.find_all(text=re.compile(r'rank|position', re.IGNORECASE))
+                    for element in rank_elements:
+                        parent = element.parent
+                        if parent:
+                            rank_text = parent.get_text().strip()
+                            if 'global' in rank_text.lower():
+                                numbers = re.findall(r'\d+', rank_text)
                                 if numbers:
-                                    problems_solved = int(numbers[0])
+                                    rank = f"Global Rank: {numbers[0]}"
                                     break
-                        
-                        # Extract star rating
-                        stars = 0
-                        star_elements = soup.find_all(['span', 'div'], class_=re.compile(r'star'))
-                        for element in star_elements:
-                            star_text = element.get_text()
-                            star_match = re.search(r'(\d+)\s*star', star_text, re.IGNORECASE)
-                            if star_match:
-                                stars = int(star_match.group(1))
-                                break
-                        
-                        # Extract rank
-                        rank = ""
-                        rank_elements = soup.find_all(text=re.compile(r'rank|position', re.IGNORECASE))
-                        for element in rank_elements:
-                            parent = element.parent
-                            if parent:
-                                rank_text = parent.get_text().strip()
-                                if 'global' in rank_text.lower():
-                                    numbers = re.findall(r'\d+', rank_text)
-                                    if numbers:
-                                        rank = f"Global Rank: {numbers[0]}"
-                                        break
-                        
-                        return {
-                            'platform': 'codechef',
-                            'username': username,
-                            'url': f"https://www.codechef.com/users/{username}",
-                            'rating': rating,
-                            'stars': stars,
-                            'problems_solved': problems_solved,
-                            'rank': rank,
-                            'status': 'success'
-                        }
-                    else:
-                        return {'platform': 'codechef', 'username': username, 'status': 'user_not_found'}
-        
+                    
+                    return {
+                        'platform': 'codechef',
+                        'username': username,
+                        'url': f"https://www.codechef.com/users/{username}",
+                        'rating': rating,
+                        'stars': stars,
+                        'problems_solved': problems_solved,
+                        'rank': rank,
+                        'status': 'success'
+                    }
+                else:
+                    return {'platform': 'codechef', 'username': username, 'status': 'user_not_found'}
+
         except Exception as e:
             logger.warning(f"CodeChef scraping error for {username}: {e}")
             return {'platform': 'codechef', 'username': username, 'status': 'error', 'error': str(e)}
 
-    async def analyze_coding_profiles(self, profiles: List[Dict[str, str]]) -> Dict[str, Any]:
+    def get_profile_fetchers(self) -> Dict[str, Any]:
+        """Map of supported platform -> profile fetch coroutine"""
+        return {
+            'leetcode': self.fetch_leetcode_profile,
+            'codeforces': self.fetch_codeforces_profile,
+            'codechef': self.fetch_codechef_profile
+        }
+
+    async def refresh_cached_profile(self, platform: str, username: str):
+        """Background refresh for a stale cache entry"""
+        key = ProfileCache.make_key(platform, username)
+        try:
+            profile_data = await self.get_profile_fetchers()[platform](username)
+            if profile_data.get('status') == 'success':
+                profile_cache.set(platform, username, profile_data)
+        except Exception as e:
+            logger.warning(f"Background refresh of {platform} profile {username} failed: {e}")
+        finally:
+            self.profile_refresh_tasks.pop(key, None)
+
+    async def fetch_profile_cached(self, platform: str, username: str) -> Dict[str, Any]:
+        """Fetch a profile through the TTL cache, revalidating stale entries in the background"""
+        cached = profile_cache.get(platform, username)
+        if cached is not None:
+            profile_data, is_fresh = cached
+            if not is_fresh:
+                key = ProfileCache.make_key(platform, username)
+                if key not in self.profile_refresh_tasks:
+                    self.profile_refresh_tasks[key] = asyncio.ensure_future(
+                        self.refresh_cached_profile(platform, username)
+                    )
+            return {**profile_data, 'cache_status': 'hit' if is_fresh else 'stale'}
+
+        profile_data = await self.get_profile_fetchers()[platform](username)
+        # Only successful lookups are cached so transient API errors are retried next time
+        if profile_data.get('status') == 'success':
+            profile_cache.set(platform, username, profile_data)
+        return {**profile_data, 'cache_status': 'miss'}
+
+    async def fetch_profiles_concurrently(self, profiles: List[Dict[str, str]], deadline: Optional[float] = None) -> List[Dict[str, Any]]:
+        """Fetch all platform profiles at once; fetches still running at the deadline are reported as timeouts"""
+        deadline = deadline if deadline is not None else self.profile_fetch_deadline
+        fetchers = self.get_profile_fetchers()
+
+        async def fetch_with_deadline(platform: str, username: str) -> Dict[str, Any]:
+            try:
+                return await asyncio.wait_for(self.fetch_profile_cached(platform, username), timeout=deadline)
+            except asyncio.TimeoutError:
+                logger.warning(f"{platform} profile fetch for {username} exceeded {deadline}s deadline")
+                return {'platform': platform, 'username': username, 'status': 'timeout'}
+            except Exception as e:
+                logger.warning(f"{platform} profile fetch for {username} failed: {e}")
+                return {'platform': platform, 'username': username, 'status': 'error', 'error': str(e)}
+
+        # All fetches share the same start time, so the slowest one bounds the total latency
+        return await asyncio.gather(*(
+            fetch_with_deadline(profile['platform'], profile['username'])
+            for profile in profiles
+            if profile['platform'] in fetchers
+        ))
+
+    async def analyze_coding_profiles(self, profiles: List[Dict[str, str]], deadline: Optional[float] = None) -> Dict[str, Any]:
         """Analyze coding profiles and determine job readiness"""
         if not profiles:
             return {
@@ -689,21 +2082,18 @@ class AdvancedATSAnalyzer:
         analyzed_profiles = []
         total_score = 0
         active_profiles = 0
-        
-        # Fetch profile data for each platform
-        for profile in profiles:
-            platform = profile['platform']
-            username = profile['username']
-            
-            if platform == 'leetcode':
-                profile_data = await self.fetch_leetcode_profile(username)
-            elif platform == 'codeforces':
-                profile_data = await self.fetch_codeforces_profile(username)
-            elif platform == 'codechef':
-                profile_data = await self.fetch_codechef_profile(username)
-            else:
-                continue
-            
+        timed_out_profiles = []
+
+        # Fetch profile data for every platform concurrently
+        fetched_profiles = await self.fetch_profiles_concurrently(profiles, deadline)
+
+        for profile_data in fetched_profiles:
+            if profile_data.get('status') == 'timeout':
+                timed_out_profiles.append({
+                    'platform': profile_data['platform'],
+                    'username': profile_data['username']
+                })
+
             if profile_data.get('status') == 'success':
                 analyzed_profiles.append(profile_data)
                 
@@ -732,6 +2122,7 @@ class AdvancedATSAnalyzer:
             'recommendations': recommendations,
             'strengths': strengths,
             'areas_for_improvement': areas_for_improvement,
+            'profiles_timed_out': timed_out_profiles,
             'analysis_timestamp': datetime.now().isoformat()
         }
 
@@ -969,8 +2360,10 @@ class AdvancedATSAnalyzer:
         except Exception as e:
             return f"Error reading DOCX: {str(e)}"
     
-    def analyze_ats_compatibility(self, text: str, filename: str = "") -> tuple:
+    def analyze_ats_compatibility(self, resume, filename: str = "") -> tuple:
         """Advanced ATS compatibility analysis"""
+        doc = self.parse_resume(resume)
+        text = doc.text
         score = 0
         feedback = []
         
@@ -991,8 +2384,8 @@ class AdvancedATSAnalyzer:
         
         # Standard sections check
         sections_found = 0
-        for section_name, pattern in self.standard_sections.items():
-            if re.search(pattern, text, re.IGNORECASE):
+        for section_name, pattern in self.section_patterns.items():
+            if pattern.search(text):
                 sections_found += 1
         
         section_score = min(sections_found * 8, 40)
@@ -1005,11 +2398,11 @@ class AdvancedATSAnalyzer:
         
         # Contact information check
         contact_score = 0
-        if re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text):
+        if EMAIL_PATTERN.search(text):
             contact_score += 5
-        if re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text):
+        if PHONE_PATTERN.search(text):
             contact_score += 5
-        if re.search(r'linkedin|github', text, re.IGNORECASE):
+        if PROFILE_LINK_PATTERN.search(text):
             contact_score += 5
         
         score += contact_score
@@ -1019,24 +2412,25 @@ class AdvancedATSAnalyzer:
             feedback.append("⚠ Ensure all contact details are included")
         
         # Formatting consistency
-        lines = text.split('\n')
-        consistent_formatting = sum(1 for line in lines if line.strip()) / max(len(lines), 1)
+        consistent_formatting = len(doc.non_empty_lines) / max(len(doc.lines), 1)
         if consistent_formatting > 0.7:
             score += 10
             feedback.append("✓ Clean formatting detected")
     
         return min(score, 100), feedback
     
-    def analyze_keywords(self, text: str, job_description: str = "") -> tuple:
+    def analyze_keywords(self, resume, job_description: str = "") -> tuple:
         """Advanced keyword analysis with improved job matching"""
+        doc = self.parse_resume(resume)
+        text = doc.text
         score = 0
         feedback = []
-        text_lower = text.lower()
+        text_lower = doc.text_lower
         
         # Enhanced job description matching
         if job_description:
             # Get detailed job match analysis
-            job_match_insights = self.generate_job_match_insights(text, job_description)
+            job_match_insights = self.generate_job_match_insights(doc, job_description)
             
             if "error" not in job_match_insights:
                 overall_match = job_match_insights["overall_match"]
@@ -1062,7 +2456,7 @@ class AdvancedATSAnalyzer:
                     feedback.append("✓ Excellent alignment with job requirements")
             else:
                 # Fallback to simple similarity
-                similarity_score = self.calculate_text_similarity(text, job_description)
+                similarity_score = self.calculate_text_similarity(doc, job_description)
                 keyword_match_score = int(similarity_score * 100 * 0.4)
                 score += keyword_match_score
                 
@@ -1072,15 +2466,16 @@ class AdvancedATSAnalyzer:
                     feedback.append("⚠ Low job description match - add relevant keywords")
         
         # Industry keywords detection with enhanced scoring
+        hits = self.keyword_hits(doc)
         industry_scores = {}
         for industry, keywords in self.industry_keywords.items():
             # Use more sophisticated matching including partial matches
             matches = 0
             for keyword in keywords:
-                if keyword.lower() in text_lower:
+                if keyword.lower() in hits['industry']:
                     matches += 1
                 # Check for partial matches (for compound terms)
-                elif any(part in text_lower for part in keyword.lower().split()):
+                elif any(part in hits['industry_parts'] for part in keyword.lower().split()):
                     matches += 0.5
             industry_scores[industry] = matches
         
@@ -1100,25 +2495,13 @@ class AdvancedATSAnalyzer:
             feedback.append("⚠ Add more industry-specific keywords")
         
         # Enhanced technical skills detection
-        tech_patterns = [
-            r'\b[A-Z]{2,}\b',  # Acronyms (APIs, SQL, etc.)
-            r'\b\w+\.\w+\b',   # Technologies like React.js, Node.js
-            r'\b\d+\+?\s*years?\b',  # Experience years
-            r'\b(?:v\d+|\d+\.\d+)\b',  # Version numbers
-            r'\b\w+(?:js|py|cpp|cs)\b'  # Programming language extensions
-        ]
-        
         tech_matches = 0
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text)
+        for pattern in TECH_TOKEN_PATTERNS:
+            matches = pattern.findall(text)
             tech_matches += len(matches)
         
         # Additional check for specific tech terms
-        tech_terms = [
-            'api', 'framework', 'library', 'database', 'cloud', 'devops', 'agile', 'scrum',
-            'microservices', 'container', 'deployment', 'ci/cd', 'testing', 'automation'
-        ]
-        tech_term_matches = sum(1 for term in tech_terms if term in text_lower)
+        tech_term_matches = len(hits['tech_terms'])
         tech_matches += tech_term_matches
         
         if tech_matches > 15:
@@ -1134,7 +2517,7 @@ class AdvancedATSAnalyzer:
             feedback.append("⚠ Add more technical terminology")
         
         # Improved keyword density analysis
-        words = self.safe_word_tokenize(text_lower)
+        words = doc.tokens_lower
         word_freq = Counter(words)
         
         # Remove common words and check for keyword stuffing
@@ -1155,14 +2538,15 @@ class AdvancedATSAnalyzer:
         
         return min(score, 100), feedback
     
-    def analyze_content_quality(self, text: str) -> tuple:
+    def analyze_content_quality(self, resume) -> tuple:
         """Advanced content quality analysis"""
+        doc = self.parse_resume(resume)
+        text = doc.text
         score = 0
         feedback = []
         
         # Word count analysis
-        words = self.safe_word_tokenize(text)
-        word_count = len(words)
+        word_count = len(doc.tokens)
         
         if 300 <= word_count <= 800:
             score += 20
@@ -1175,11 +2559,12 @@ class AdvancedATSAnalyzer:
             feedback.append("⚠ Consider condensing content")
         
         # Action verbs analysis
+        hits = self.keyword_hits(doc)
         action_verb_count = 0
         action_categories = []
         
         for category, verbs in self.action_verbs.items():
-            category_matches = sum(1 for verb in verbs if verb in text.lower())
+            category_matches = sum(1 for verb in verbs if verb in hits['action_verbs'])
             if category_matches > 0:
                 action_verb_count += category_matches
                 action_categories.append(category)
@@ -1194,16 +2579,9 @@ class AdvancedATSAnalyzer:
             feedback.append("✗ Add more action verbs")
         
         # Quantifiable achievements
-        number_patterns = [
-    r'\d+%',  # Percentages
-    r'[\$₹]\d+[,\d]*',  # Dollar or Rupee amounts
-    r'\d+[,\d]*\+?\s*(users|customers|employees|projects)',  # Numbers with units
-    r'increased|decreased|improved|reduced.*?\d+',  # Achievement metrics
-]
-        
         quantifiable_count = 0
-        for pattern in number_patterns:
-            quantifiable_count += len(re.findall(pattern, text, re.IGNORECASE))
+        for pattern in METRIC_PATTERNS:
+            quantifiable_count += len(pattern.findall(text))
         
         if quantifiable_count >= 5:
             score += 25
@@ -1215,8 +2593,7 @@ class AdvancedATSAnalyzer:
             feedback.append("⚠ Add more quantifiable results")
         
         # Sentence structure analysis
-        sentences = self.safe_sent_tokenize(text)
-        avg_sentence_length = sum(len(self.safe_word_tokenize(s)) for s in sentences) / max(len(sentences), 1)
+        avg_sentence_length = sum(doc.sentence_token_counts) / max(len(doc.sentences), 1)
         
         if 15 <= avg_sentence_length <= 25:
             score += 15
@@ -1225,8 +2602,7 @@ class AdvancedATSAnalyzer:
             feedback.append("⚠ Vary sentence length for readability")
         
         # Professional language check
-        informal_words = ['awesome', 'cool', 'stuff', 'things', 'got', 'gonna', 'wanna']
-        informal_count = sum(1 for word in informal_words if word in text.lower())
+        informal_count = len(hits['informal_words'])
         
         if informal_count == 0:
             score += 15
@@ -1236,8 +2612,10 @@ class AdvancedATSAnalyzer:
         
         return min(score, 100), feedback
     
-    def analyze_grammar_spelling(self, text: str) -> tuple:
+    def analyze_grammar_spelling(self, resume) -> tuple:
         """Advanced grammar and spelling analysis"""
+        doc = self.parse_resume(resume)
+        text = doc.text
         score = 80  # Start with good score
         feedback = []
         
@@ -1245,27 +2623,11 @@ class AdvancedATSAnalyzer:
         spelling_errors = 0
         
         # Check for common spelling mistakes
-        common_mistakes = {
-            'recieve': 'receive', 'seperate': 'separate', 'definately': 'definitely',
-            'occured': 'occurred', 'begining': 'beginning', 'managment': 'management',
-            'enviroment': 'environment', 'sucessful': 'successful'
-        }
-        
-        for mistake, correct in common_mistakes.items():
-            if mistake in text.lower():
-                spelling_errors += 1
+        spelling_errors += len(self.keyword_hits(doc)['common_mistakes'])
 
         grammar_issues = 0
-
-        grammar_patterns = [
-            r'\bi\s+am\b',  # Should be capitalized
-            r'\s{2,}',      # Multiple spaces
-            r'[.!?]{2,}',   # Multiple punctuation
-            r'\s+[.!?]',    # Space before punctuation
-        ]
-        
-        for pattern in grammar_patterns:
-            grammar_issues += len(re.findall(pattern, text))
+        for pattern in GRAMMAR_PATTERNS:
+            grammar_issues += len(pattern.findall(text))
         
         # Scoring
         total_errors = spelling_errors + grammar_issues
@@ -1279,11 +2641,11 @@ class AdvancedATSAnalyzer:
             feedback.append("✗ Multiple grammar/spelling issues found")
         
         # Consistency checks
-        if re.search(r'\b[A-Z]{2,}\b', text):  # Has acronyms
+        if ACRONYM_PATTERN.search(text):  # Has acronyms
             feedback.append("✓ Proper use of acronyms")
         
         # Capitalization check
-        sentences = self.safe_sent_tokenize(text)
+        sentences = doc.sentences
         cap_errors = sum(1 for s in sentences if s and not s[0].isupper())
         
         if cap_errors / max(len(sentences), 1) < 0.1:
@@ -1294,8 +2656,10 @@ class AdvancedATSAnalyzer:
         
         return max(min(score, 100), 0), feedback
     
-    def analyze_structure_completeness(self, text: str) -> tuple:
+    def analyze_structure_completeness(self, resume) -> tuple:
         """Advanced structure and completeness analysis"""
+        doc = self.parse_resume(resume)
+        text = doc.text
         score = 0
         feedback = []
         
@@ -1307,15 +2671,13 @@ class AdvancedATSAnalyzer:
         found_optional = 0
 
         for section in required_sections:
-            if section in self.standard_sections:
-                pattern = self.standard_sections[section]
-                if re.search(pattern, text, re.IGNORECASE):
+            if section in self.section_patterns:
+                if self.section_patterns[section].search(text):
                     found_required += 1
         
         for section in optional_sections:
-            if section in self.standard_sections:
-                pattern = self.standard_sections[section]
-                if re.search(pattern, text, re.IGNORECASE):
+            if section in self.section_patterns:
+                if self.section_patterns[section].search(text):
                     found_optional += 1
         
         # Required sections scoring
@@ -1333,12 +2695,12 @@ class AdvancedATSAnalyzer:
             feedback.append("✓ Good section variety")
         
         # Organization analysis
-        lines = [line.strip() for line in text.split('\n') if line.strip()]
+        lines = doc.non_empty_lines
         
         # Check for clear section headers
         headers = sum(1 for line in lines if len(line) > 0 and (
             line.isupper() or 
-            re.match(r'^[A-Z][a-z]+(\s+[A-Z][a-z]+)*:?$', line) or
+            SECTION_HEADER_PATTERN.match(line) or
             line.startswith('##') or line.startswith('**')
         ))
         
@@ -1348,68 +2710,76 @@ class AdvancedATSAnalyzer:
         else:
             feedback.append("⚠ Add clear section headers")
         
-        return min(score, 100), feedback
-    
-    def calculate_text_similarity(self, text1: str, text2: str) -> float:
-        """Advanced similarity calculation between resume and job description"""
-        if not text2:
-            return 0.5  # Neutral score if no job description
-        
+        return min(score, 100), feedback
+    
+    def compare_resume_to_job(self, resume, job_description: str) -> Dict[str, Any]:
+        """Resume vs job description component scores, computed once per document and job description"""
+        doc = self.parse_resume(resume)
+        cache_key = ('job_match_components', job_description)
+        if cache_key in doc.cache:
+            return doc.cache[cache_key]
+
+        # 1. TF-IDF Cosine Similarity (baseline)
         try:
-            # Multi-layered similarity calculation
-            
-            # 1. TF-IDF Cosine Similarity (baseline)
-            vectorizer = TfidfVectorizer(
-                stop_words='english', 
-                max_features=1000,
-                ngram_range=(1, 2),  # Include bigrams for better context
-                min_df=1,
-                max_df=0.95
-            )
-            tfidf_matrix = vectorizer.fit_transform([text1.lower(), text2.lower()])
-            tfidf_similarity = cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
-            
+            job_profile = self.get_job_profile(job_description)
+            if tfidf_model is not None and job_profile.tfidf_vector is not None:
+                # Pre-fitted corpus IDF: only transform the resume, the JD vector is precompiled
+                if 'tfidf_vector' not in doc.cache:
+                    doc.cache['tfidf_vector'] = tfidf_model.transform([doc.text_lower])
+                tfidf_similarity = tfidf_model.similarity(doc.cache['tfidf_vector'], job_profile.tfidf_vector)
+            else:
+                tfidf_similarity = self.fit_pair_tfidf_similarity(doc.text_lower, job_description.lower())
+        except Exception as e:
+            logger.warning(f"Similarity calculation failed: {e}")
+            tfidf_similarity = None
+
+        components = {
+            'tfidf': tfidf_similarity,
             # 2. Keyword overlap analysis
-            keyword_similarity = self.calculate_keyword_overlap(text1, text2)
-            
+            'keywords': self.calculate_keyword_overlap(doc, job_description),
             # 3. Skills matching
-            skills_similarity = self.calculate_skills_match(text1, text2)
-            
+            'skills': self.calculate_skills_match(doc, job_description),
             # 4. Experience level matching
-            experience_similarity = self.calculate_experience_match(text1, text2)
-            
+            'experience': self.calculate_experience_match(doc, job_description),
             # 5. Education/qualification matching
-            education_similarity = self.calculate_education_match(text1, text2)
-            
-            # Weighted combination of different similarity measures
-            weights = {
-                'tfidf': 0.25,
-                'keywords': 0.30,
-                'skills': 0.25,
-                'experience': 0.10,
-                'education': 0.10
-            }
-            
-            final_similarity = (
-                tfidf_similarity * weights['tfidf'] +
-                keyword_similarity * weights['keywords'] +
-                skills_similarity * weights['skills'] +
-                experience_similarity * weights['experience'] +
-                education_similarity * weights['education']
-            )
-            
-            return min(final_similarity, 1.0)
-            
-        except Exception as e:
-            logger.warning(f"Similarity calculation failed: {e}")
+            'education': self.calculate_education_match(doc, job_description)
+        }
+        doc.cache[cache_key] = components
+        return components
+
+    def fit_pair_tfidf_similarity(self, resume_text: str, job_text: str) -> float:
+        """TF-IDF cosine fitted on just the two documents (used when no pre-fitted model is available)"""
+        vectorizer = TfidfVectorizer(
+            stop_words='english', 
+            max_features=1000,
+            ngram_range=(1, 2),  # Include bigrams for better context
+            min_df=1,
+            max_df=0.95
+        )
+        tfidf_matrix = vectorizer.fit_transform([resume_text, job_text])
+        return cosine_similarity(tfidf_matrix[0:1], tfidf_matrix[1:2])[0][0]
+
+    def calculate_text_similarity(self, resume, text2: str) -> float:
+        """Advanced similarity calculation between resume and job description"""
+        if not text2:
+            return 0.5  # Neutral score if no job description
+        
+        # Multi-layered similarity calculation
+        components = self.compare_resume_to_job(resume, text2)
+        if components['tfidf'] is None:
             return 0.3  # Fallback similarity score
+        
+        # Weighted combination of different similarity measures
+        final_similarity = sum(components[name] * weight for name, weight in self.similarity_weights.items())
+        
+        return min(final_similarity, 1.0)
 
-    def calculate_keyword_overlap(self, resume_text: str, job_text: str) -> float:
+    def calculate_keyword_overlap(self, resume, job_text: str) -> float:
         """Calculate keyword overlap between resume and job description"""
         try:
-            # Extract important keywords from job description
-            job_keywords = self.extract_job_keywords(job_text)
-            resume_keywords = self.extract_resume_keywords(resume_text)
+            # Important keywords from the compiled job description
+            job_keywords = self.get_job_profile(job_text).keywords
+            resume_keywords = self.extract_resume_keywords(resume)
             
             # Calculate overlap
             if not job_keywords:
@@ -1429,29 +2799,16 @@ class AdvancedATSAnalyzer:
         text_lower = job_text.lower()
         
         # Technical skills patterns
-        tech_patterns = [
-            r'\b(?:python|java|javascript|react|node\.js|sql|aws|docker|kubernetes|git)\b',
-            r'\b(?:machine learning|data science|artificial intelligence|deep learning)\b',
-            r'\b(?:frontend|backend|full[- ]?stack|devops|mobile|web)\b',
-            r'\b(?:agile|scrum|kanban|ci/cd|microservices|api)\b'
-        ]
-        
-        for pattern in tech_patterns:
-            matches = re.findall(pattern, text_lower)
+        for pattern in JOB_TECH_PATTERNS:
+            matches = pattern.findall(text_lower)
             keywords.update(matches)
         
         # Extract required skills from common patterns
-        skill_patterns = [
-            r'(?:experience with|proficient in|knowledge of|familiar with)\s+([^.]+)',
-            r'(?:required|must have|should have):\s*([^.]+)',
-            r'(?:skills|technologies|tools):\s*([^.]+)'
-        ]
-        
-        for pattern in skill_patterns:
-            matches = re.findall(pattern, text_lower, re.IGNORECASE)
+        for pattern in JOB_SKILL_PATTERNS:
+            matches = pattern.findall(text_lower)
             for match in matches:
                 # Split on common separators and clean
-                skills = re.split(r'[,;/&]', match)
+                skills = SKILL_SEPARATOR_PATTERN.split(match)
                 for skill in skills:
                     clean_skill = skill.strip().lower()
                     if len(clean_skill) > 2 and clean_skill not in self.stop_words:
@@ -1459,13 +2816,15 @@ class AdvancedATSAnalyzer:
         
         return keywords
 
-    def extract_resume_keywords(self, resume_text: str) -> set:
+    def extract_resume_keywords(self, resume) -> set:
         """Extract keywords from resume"""
+        doc = self.parse_resume(resume)
+        if 'resume_keywords' in doc.cache:
+            return doc.cache['resume_keywords']
         keywords = set()
-        text_lower = resume_text.lower()
         
         # Extract technical terms, tools, and skills
-        words = self.safe_word_tokenize(text_lower)
+        words = doc.tokens_lower
         
         # Filter for technical terms (no common words)
         technical_words = [
@@ -1476,52 +2835,21 @@ class AdvancedATSAnalyzer:
         ]
         
         keywords.update(technical_words)
+        doc.cache['resume_keywords'] = keywords
         return keywords
 
-    def calculate_skills_match(self, resume_text: str, job_text: str) -> float:
+    def calculate_skills_match(self, resume, job_text: str) -> float:
         """Calculate how well resume skills match job requirements"""
         try:
-            # Define comprehensive skill categories
-            skill_categories = {
-                'programming': [
-                    'python', 'java', 'javascript', 'typescript', 'c++', 'c#', 'php', 'ruby', 'go', 'rust',
-                    'scala', 'kotlin', 'swift', 'dart', 'r', 'matlab', 'perl', 'shell', 'bash'
-                ],
-                'web_frontend': [
-                    'react', 'vue', 'angular', 'html', 'css', 'sass', 'less', 'bootstrap', 'tailwind',
-                    'jquery', 'webpack', 'babel', 'npm', 'yarn', 'typescript'
-                ],
-                'web_backend': [
-                    'node.js', 'express', 'django', 'flask', 'spring', 'rails', 'laravel', 'asp.net',
-                    'fastapi', 'nestjs', 'koa', 'gin', 'fiber'
-                ],
-                'databases': [
-                    'mysql', 'postgresql', 'mongodb', 'redis', 'elasticsearch', 'sqlite', 'oracle',
-                    'sql server', 'cassandra', 'dynamodb', 'firebase'
-                ],
-                'cloud_devops': [
-                    'aws', 'azure', 'gcp', 'docker', 'kubernetes', 'jenkins', 'gitlab', 'github actions',
-                    'terraform', 'ansible', 'chef', 'puppet', 'vagrant'
-                ],
-                'data_science': [
-                    'pandas', 'numpy', 'scikit-learn', 'tensorflow', 'pytorch', 'keras', 'matplotlib',
-                    'seaborn', 'plotly', 'jupyter', 'r', 'stata', 'spss'
-                ],
-                'mobile': [
-                    'android', 'ios', 'react native', 'flutter', 'swift', 'kotlin', 'xamarin',
-                    'ionic', 'cordova', 'native script'
-                ]
-            }
-            
-            resume_lower = resume_text.lower()
-            job_lower = job_text.lower()
+            resume_hits = self.keyword_hits(resume)['skills']
+            job_hits = self.get_job_profile(job_text).skill_hits
             
             total_score = 0
             matched_categories = 0
             
-            for category, skills in skill_categories.items():
-                job_skills = [skill for skill in skills if skill in job_lower]
-                resume_skills = [skill for skill in skills if skill in resume_lower]
+            for category, skills in self.skill_categories.items():
+                job_skills = [skill for skill in skills if skill in job_hits]
+                resume_skills = [skill for skill in skills if skill in resume_hits]
                 
                 if job_skills:  # Only score if job requires skills from this category
                     matched_skills = set(job_skills).intersection(set(resume_skills))
@@ -1534,35 +2862,34 @@ class AdvancedATSAnalyzer:
         except:
             return 0.3
 
-    def calculate_experience_match(self, resume_text: str, job_text: str) -> float:
+    def resume_experience_years(self, resume) -> Optional[int]:
+        """Largest experience figure stated in the resume (years or a start year), if any"""
+        doc = self.parse_resume(resume)
+        if 'experience_years' not in doc.cache:
+            resume_experiences = []
+            for pattern in RESUME_EXPERIENCE_PATTERNS:
+                matches = pattern.findall(doc.text_lower)
+                resume_experiences.extend([int(exp) for exp in matches if exp.isdigit()])
+            doc.cache['experience_years'] = max(resume_experiences) if resume_experiences else None
+        return doc.cache['experience_years']
+
+    def resume_education_level(self, resume) -> int:
+        """Highest education level mentioned in the resume (0 when none)"""
+        return max((self.education_levels[edu] for edu in self.keyword_hits(resume)['education']), default=0)
+
+    def calculate_experience_match(self, resume, job_text: str) -> float:
         """Calculate experience level matching"""
         try:
-            # Extract experience requirements from job
-            job_exp_pattern = r'(\d+)[\+\-\s]*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)'
-            job_matches = re.findall(job_exp_pattern, job_text.lower())
+            # Experience requirement from the compiled job description
+            required_exp = self.get_job_profile(job_text).required_experience
             
-            if not job_matches:
+            if required_exp is None:
                 return 0.5  # No experience requirement specified
             
-            required_exp = max([int(exp) for exp in job_matches])
-            
-            # Extract experience from resume
-            resume_exp_patterns = [
-                r'(\d+)[\+\s]*(?:years?|yrs?)\s*(?:of\s*)?(?:experience|exp)',
-                r'(?:experience|exp).*?(\d+)[\+\s]*(?:years?|yrs?)',
-                r'(\d{4})\s*[-–]\s*(?:present|current|\d{4})'  # Date ranges
-            ]
-            
-            resume_experiences = []
-            for pattern in resume_exp_patterns:
-                matches = re.findall(pattern, resume_text.lower())
-                resume_experiences.extend([int(exp) for exp in matches if exp.isdigit()])
-            
-            if not resume_experiences:
+            max_resume_exp = self.resume_experience_years(resume)
+            if max_resume_exp is None:
                 return 0.3  # No experience found
             
-            max_resume_exp = max(resume_experiences)
-            
             # Calculate match score
             if max_resume_exp >= required_exp:
                 return 1.0  # Meets or exceeds requirement
@@ -1576,27 +2903,11 @@ class AdvancedATSAnalyzer:
         except:
             return 0.5
 
-    def calculate_education_match(self, resume_text: str, job_text: str) -> float:
+    def calculate_education_match(self, resume, job_text: str) -> float:
         """Calculate education/qualification matching"""
         try:
-            # Education levels hierarchy
-            education_levels = {
-                'phd': 5, 'doctorate': 5, 'ph.d': 5,
-                'masters': 4, 'master': 4, 'msc': 4, 'mba': 4, 'ms': 4,
-                'bachelors': 3, 'bachelor': 3, 'bsc': 3, 'ba': 3, 'btech': 3, 'be': 3,
-                'associate': 2, 'diploma': 2,
-                'certificate': 1, 'certification': 1
-            }
-            
-            def get_education_level(text):
-                max_level = 0
-                for edu, level in education_levels.items():
-                    if edu in text.lower():
-                        max_level = max(max_level, level)
-                return max_level
-            
-            job_edu_level = get_education_level(job_text)
-            resume_edu_level = get_education_level(resume_text)
+            job_edu_level = self.get_job_profile(job_text).education_level
+            resume_edu_level = self.resume_education_level(resume)
             
             if job_edu_level == 0:  # No education requirement
                 return 0.7
@@ -1611,22 +2922,31 @@ class AdvancedATSAnalyzer:
         except:
             return 0.6
 
-    def generate_job_match_insights(self, resume_text: str, job_description: str) -> Dict[str, Any]:
+    def generate_job_match_insights(self, resume, job_description: str) -> Dict[str, Any]:
         """Generate detailed job matching insights"""
         if not job_description:
             return {"error": "No job description provided for matching analysis"}
         
+        doc = self.parse_resume(resume)
+        cache_key = ('job_match_insights', job_description)
+        if cache_key not in doc.cache:
+            doc.cache[cache_key] = self.build_job_match_insights(doc, job_description)
+        return doc.cache[cache_key]
+
+    def build_job_match_insights(self, doc: ParsedResume, job_description: str) -> Dict[str, Any]:
+        """Assemble job match insights from the memoized comparison components"""
         try:
             # Calculate individual match components
-            overall_similarity = self.calculate_text_similarity(resume_text, job_description)
-            keyword_match = self.calculate_keyword_overlap(resume_text, job_description)
-            skills_match = self.calculate_skills_match(resume_text, job_description)
-            experience_match = self.calculate_experience_match(resume_text, job_description)
-            education_match = self.calculate_education_match(resume_text, job_description)
+            overall_similarity = self.calculate_text_similarity(doc, job_description)
+            components = self.compare_resume_to_job(doc, job_description)
+            keyword_match = components['keywords']
+            skills_match = components['skills']
+            experience_match = components['experience']
+            education_match = components['education']
             
             # Extract missing keywords
-            job_keywords = self.extract_job_keywords(job_description)
-            resume_keywords = self.extract_resume_keywords(resume_text)
+            job_keywords = self.get_job_profile(job_description).keywords
+            resume_keywords = self.extract_resume_keywords(doc)
             missing_keywords = job_keywords - resume_keywords
             
             # Generate recommendations
@@ -1670,6 +2990,116 @@ class AdvancedATSAnalyzer:
             logger.error(f"Job match analysis failed: {e}")
             return {"error": "Failed to analyze job match"}
 
+    def score_match_matrix(self, resume_texts: List[str], job_descriptions: List[str]) -> Dict[str, Any]:
+        """N resumes x M job descriptions match components, vectorized (CPU-bound).
+
+        Same components and weights as compare_resume_to_job: with a pre-fitted model
+        TF-IDF cosine is one sparse product (otherwise each cell is fitted on its own
+        pair, so scores do not depend on the rest of the request); keyword and skill
+        overlaps are products of binary incidence matrices over shared vocabularies.
+        Cells whose TF-IDF could not be computed are NaN and get the fallback overall score.
+        """
+        docs = [self.parse_resume(text) for text in resume_texts]
+        profiles = [self.get_job_profile(job_description) for job_description in job_descriptions]
+        n_resumes, n_jobs = len(docs), len(profiles)
+
+        # 1. TF-IDF cosine: (N x V) @ (V x M)
+        tfidf = None
+        if tfidf_model is not None:
+            try:
+                resume_matrix = tfidf_model.transform([doc.text_lower for doc in docs])
+                job_matrix = sparse.vstack([profile.tfidf_vector for profile in profiles])
+                tfidf = (resume_matrix @ job_matrix.T).toarray()
+            except ValueError as e:
+                logger.warning(f"Matrix TF-IDF similarity failed: {e}")
+        if tfidf is None:
+            # No pre-fitted model: the same per-pair fit compare_resume_to_job uses
+            tfidf = np.full((n_resumes, n_jobs), np.nan)
+            for row, doc in enumerate(docs):
+                for column, profile in enumerate(profiles):
+                    try:
+                        tfidf[row, column] = self.fit_pair_tfidf_similarity(doc.text_lower, profile.text.lower())
+                    except ValueError as e:
+                        logger.warning(f"Similarity calculation failed: {e}")
+
+        # 2. Keyword overlap: |job keywords found in resume| / |job keywords|
+        keyword_vocabulary = {
+            term: index for index, term in enumerate(sorted(set().union(*(profile.keywords for profile in profiles))))
+        }
+        job_keywords = incidence_matrix([profile.keywords for profile in profiles], keyword_vocabulary)
+        resume_keywords = incidence_matrix([self.extract_resume_keywords(doc) for doc in docs], keyword_vocabulary)
+        keyword_counts = np.array([len(profile.keywords) for profile in profiles], dtype=float)
+        overlap = (resume_keywords @ job_keywords.T).toarray()
+        keywords = np.where(keyword_counts > 0, overlap / np.maximum(keyword_counts, 1), 0.5)
+
+        # 3. Skills: per-category share of required skills present, averaged over required categories
+        skill_vocabulary = {
+            skill: index for index, skill in enumerate(sorted({
+                skill for skills in self.skill_categories.values() for skill in skills
+            }))
+        }
+        job_skills = incidence_matrix([profile.skill_hits for profile in profiles], skill_vocabulary)
+        resume_skills = incidence_matrix([self.keyword_hits(doc)['skills'] for doc in docs], skill_vocabulary)
+        skill_totals = np.zeros((n_resumes, n_jobs))
+        required_categories = np.zeros(n_jobs)
+        for skills in self.skill_categories.values():
+            category_mask = np.zeros(len(skill_vocabulary))
+            category_mask[[skill_vocabulary[skill] for skill in skills]] = 1
+            required = job_skills.multiply(category_mask).tocsr()
+            required_counts = np.asarray(required.sum(axis=1)).ravel()
+            active = required_counts > 0
+            matched = (resume_skills @ required.T).toarray()
+            skill_totals[:, active] += matched[:, active] / required_counts[active]
+            required_categories += active
+        skills = np.where(required_categories > 0, skill_totals / np.maximum(required_categories, 1), 0.5)
+
+        # 4. Experience and 5. education: piecewise rules broadcast over (resume, job)
+        resume_years = np.array([
+            np.nan if years is None else years for years in map(self.resume_experience_years, docs)
+        ], dtype=float)[:, None]
+        required_years = np.array([
+            np.nan if profile.required_experience is None else profile.required_experience for profile in profiles
+        ], dtype=float)[None, :]
+        with np.errstate(invalid='ignore'):
+            experience = np.select(
+                [np.isnan(required_years) & np.ones((n_resumes, 1), dtype=bool),
+                 np.isnan(resume_years) & np.ones((1, n_jobs), dtype=bool),
+                 resume_years >= required_years,
+                 resume_years >= required_years * 0.8,
+                 resume_years >= required_years * 0.5],
+                [0.5, 0.3, 1.0, 0.8, 0.6],
+                default=0.3
+            )
+
+        resume_levels = np.array([self.resume_education_level(doc) for doc in docs])[:, None]
+        job_levels = np.array([profile.education_level for profile in profiles])[None, :]
+        education = np.select(
+            [(job_levels == 0) & np.ones((n_resumes, 1), dtype=bool),
+             resume_levels >= job_levels,
+             resume_levels >= job_levels - 1],
+            [0.7, 1.0, 0.8],
+            default=0.4
+        )
+
+        components = {'tfidf': tfidf, 'keywords': keywords, 'skills': skills, 'experience': experience,
+                      'education': education}
+        overall = np.where(
+            np.isnan(tfidf),
+            0.3,  # Fallback similarity score
+            np.minimum(sum(components[name] * weight for name, weight in self.similarity_weights.items()), 1.0)
+        )
+
+        return {
+            'overall_match': overall,
+            'component_scores': {
+                'tfidf': tfidf,
+                'keyword_match': keywords,
+                'skills_match': skills,
+                'experience_match': experience,
+                'education_match': education
+            }
+        }
+
     def get_match_level(self, similarity_score: float) -> Dict[str, str]:
         """Get match level description"""
         if similarity_score >= 0.8:
@@ -1697,20 +3127,21 @@ class AdvancedATSAnalyzer:
                 "color": "red"
             }
     
-    def generate_detailed_insights(self, text: str, job_description: str, ats_score: int, keywords_score: int, content_score: int) -> Dict[str, Any]:
+    def generate_detailed_insights(self, resume, job_description: str, ats_score: int, keywords_score: int, content_score: int) -> Dict[str, Any]:
         """Generate comprehensive insights and recommendations"""
+        doc = self.parse_resume(resume)
         insights = {
             "executive_summary": self.generate_executive_summary(ats_score, keywords_score, content_score),
             "priority_improvements": self.identify_priority_improvements(ats_score, keywords_score, content_score),
             "detailed_recommendations": {
-                "Professional Impact": self.get_professional_impact_recommendations(text, content_score),
-                "Keyword Optimization": self.get_keyword_recommendations(text, job_description, keywords_score),
-                "Content Enhancement": self.get_content_enhancement_recommendations(text),
-                "ATS Optimization": self.get_ats_optimization_recommendations(text, ats_score),
-                "Industry Alignment": self.get_industry_alignment_recommendations(text)
+                "Professional Impact": self.get_professional_impact_recommendations(doc, content_score),
+                "Keyword Optimization": self.get_keyword_recommendations(doc, job_description, keywords_score),
+                "Content Enhancement": self.get_content_enhancement_recommendations(doc.text),
+                "ATS Optimization": self.get_ats_optimization_recommendations(doc, ats_score),
+                "Industry Alignment": self.get_industry_alignment_recommendations(doc)
             },
             "action_plan": self.generate_action_plan(ats_score, keywords_score, content_score),
-            "examples": self.provide_improvement_examples(text, job_description)
+            "examples": self.provide_improvement_examples(doc.text, job_description)
         }
         
         return insights
@@ -1773,12 +3204,14 @@ class AdvancedATSAnalyzer:
         
         return improvements[:3]
 
-    def get_professional_impact_recommendations(self, text: str, content_score: int) -> List[Dict[str, Any]]:
+    def get_professional_impact_recommendations(self, resume, content_score: int) -> List[Dict[str, Any]]:
         """Generate professional impact recommendations"""
+        doc = self.parse_resume(resume)
+        hits = self.keyword_hits(doc)
         recommendations = []
         
         # Check for quantifiable achievements
-        numbers_count = len(re.findall(r'\d+', text))
+        numbers_count = len(NUMBER_PATTERN.findall(doc.text))
         if numbers_count < 5:
             recommendations.append({
                 "type": "Quantifiable Impact",
@@ -1788,8 +3221,7 @@ class AdvancedATSAnalyzer:
             })
         
         # Check for action verbs
-        strong_verbs = ['achieved', 'developed', 'implemented', 'optimized', 'increased', 'reduced', 'managed', 'led']
-        verb_count = sum(1 for verb in strong_verbs if verb in text.lower())
+        verb_count = len(hits['strong_verbs'])
         
         if verb_count < 5:
             recommendations.append({
@@ -1800,8 +3232,7 @@ class AdvancedATSAnalyzer:
             })
         
         # Check for leadership indicators
-        leadership_terms = ['led', 'managed', 'supervised', 'coordinated', 'mentored']
-        has_leadership = any(term in text.lower() for term in leadership_terms)
+        has_leadership = bool(hits['leadership_terms'])
         
         if not has_leadership:
             recommendations.append({
@@ -1813,14 +3244,15 @@ class AdvancedATSAnalyzer:
         
         return recommendations
 
-    def get_keyword_recommendations(self, text: str, job_description: str, keywords_score: int) -> List[Dict[str, Any]]:
+    def get_keyword_recommendations(self, resume, job_description: str, keywords_score: int) -> List[Dict[str, Any]]:
         """Generate keyword optimization recommendations"""
+        doc = self.parse_resume(resume)
         recommendations = []
         
         if job_description:
             # Extract keywords from job description
-            job_words = set(re.findall(r'\b[A-Za-z]{3,}\b', job_description.lower()))
-            resume_words = set(re.findall(r'\b[A-Za-z]{3,}\b', text.lower()))
+            job_words = self.get_job_profile(job_description).long_words
+            resume_words = set(LONG_WORD_PATTERN.findall(doc.text_lower))
             missing_keywords = (job_words - resume_words - self.stop_words)
             
             # Filter for technical and relevant terms
@@ -1837,10 +3269,10 @@ class AdvancedATSAnalyzer:
                 })
         
         # Industry-specific recommendations
-        detected_industry = self.detect_industry(text)
+        detected_industry = self.detect_industry(doc)
         if detected_industry and detected_industry in self.industry_keywords:
             industry_kw = self.industry_keywords[detected_industry]
-            missing_industry_kw = [kw for kw in industry_kw if kw.lower() not in text.lower()]
+            missing_industry_kw = [kw for kw in industry_kw if kw.lower() not in self.keyword_hits(doc)['industry']]
             
             if missing_industry_kw:
                 recommendations.append({
@@ -1877,13 +3309,15 @@ class AdvancedATSAnalyzer:
         
         return recommendations
 
-    def get_ats_optimization_recommendations(self, text: str, ats_score: int) -> List[Dict[str, Any]]:
+    def get_ats_optimization_recommendations(self, resume, ats_score: int) -> List[Dict[str, Any]]:
         """Generate ATS optimization recommendations"""
+        doc = self.parse_resume(resume)
+        text = doc.text
         recommendations = []
         
         # Check for standard sections
-        sections = ['experience', 'education', 'skills']
-        missing_sections = [section for section in sections if section not in text.lower()]
+        found_sections = self.keyword_hits(doc)['sections']
+        missing_sections = [section for section in self.required_section_terms if section not in found_sections]
         
         if missing_sections:
             recommendations.append({
@@ -1894,8 +3328,8 @@ class AdvancedATSAnalyzer:
             })
         
         # Check for contact information
-        has_email = bool(re.search(r'\b[A-Za-z0-9._%+-]+@[A-Za-z0-9.-]+\.[A-Z|a-z]{2,}\b', text))
-        has_phone = bool(re.search(r'\b\d{3}[-.]?\d{3}[-.]?\d{4}\b', text))
+        has_email = bool(EMAIL_PATTERN.search(text))
+        has_phone = bool(PHONE_PATTERN.search(text))
         
         if not (has_email and has_phone):
             recommendations.append({
@@ -1907,9 +3341,9 @@ class AdvancedATSAnalyzer:
         
         return recommendations
 
-    def get_industry_alignment_recommendations(self, text: str) -> List[Dict[str, Any]]:
+    def get_industry_alignment_recommendations(self, resume) -> List[Dict[str, Any]]:
         """Generate industry alignment recommendations"""
-        detected_industry = self.detect_industry(text)
+        detected_industry = self.detect_industry(resume)
         recommendations = []
         
         if detected_industry:
@@ -2013,53 +3447,126 @@ class AdvancedATSAnalyzer:
         
         return weaknesses
 
-    def detect_industry(self, text: str) -> str:
+    def detect_industry(self, resume) -> str:
         """Detect the most likely industry based on resume content"""
-        text_lower = text.lower()
+        industry_hits = self.keyword_hits(resume)['industry']
         industry_scores = {}
         
         for industry, keywords in self.industry_keywords.items():
-            score = sum(1 for keyword in keywords if keyword.lower() in text_lower)
+            score = sum(1 for keyword in keywords if keyword.lower() in industry_hits)
             industry_scores[industry] = score
         
         if industry_scores:
             return max(industry_scores, key=industry_scores.get)
         return "general"
     
-    def detect_industry(self, text: str) -> str:
+    def detect_industry(self, resume) -> str:
         """Detect the most likely industry based on resume content"""
-        text_lower = text.lower()
+        industry_hits = self.keyword_hits(resume)['industry']
         industry_scores = {}
         
         for industry, keywords in self.industry_keywords.items():
-            score = sum(1 for keyword in keywords if keyword.lower() in text_lower)
+            score = sum(1 for keyword in keywords if keyword.lower() in industry_hits)
             industry_scores[industry] = score
         
         if industry_scores:
             return max(industry_scores, key=industry_scores.get)
         return ""
     
-    async def analyze_resume_comprehensive(self, text: str, job_description: str = "", filename: str = "", file_content: bytes = None) -> Dict[str, Any]:
-        """Main comprehensive analysis function with coding profile analysis"""
+    def extract_resume_content(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+        """Extraction stage: resume text and embedded URLs (CPU-bound)"""
+        if filename.lower().endswith('.pdf'):
+            # One pass serves both the text and the URL consumers; layout blocks stay in the worker
+            pdf = self.extract_pdf(file_content)
+            return {'text': pdf['text'], 'urls': pdf['urls'], 'page_count': pdf['page_count'], 'engine': pdf['engine']}
+        return {'text': self.extract_text_from_docx(file_content), 'urls': []}
+
+    def score_resume_rules(self, text: str, job_description: str = "", filename: str = "",
+                           job_profile: Optional[JobDescriptionProfile] = None) -> Dict[str, Any]:
+        """Rule-scoring stage: section scores, detailed insights and text metrics (CPU-bound)"""
+        if job_profile is not None:
+            # Seed this process's store so worker processes reuse the caller's compiled JD
+            self.job_profiles.put(job_profile)
+        # Tokenize once; every analyzer below reads from the same ParsedResume
+        doc = self.parse_resume(text)
+        ats = self.analyze_ats_compatibility(doc, filename)
+        keywords = self.analyze_keywords(doc, job_description)
+        content = self.analyze_content_quality(doc)
+        grammar = self.analyze_grammar_spelling(doc)
+        structure = self.analyze_structure_completeness(doc)
+
+        return {
+            'ats': ats,
+            'keywords': keywords,
+            'content': content,
+            'grammar': grammar,
+            'structure': structure,
+            'ai_insights': self.generate_detailed_insights(doc, job_description, ats[0], keywords[0], content[0]),
+            'word_count': len(doc.tokens),
+            'sentence_count': len(doc.sentences),
+            'job_match_insights': self.generate_job_match_insights(doc, job_description) if job_description else None,
+            'text_similarity': self.calculate_text_similarity(doc, job_description) if job_description else 0
+        }
+
+    async def run_cpu_stage(self, executor: Optional[Executor], stage: str, *args):
+        """Run a synchronous analyzer stage inline, or on a thread/process pool executor"""
+        if executor is None:
+            return getattr(self, stage)(*args)
+
+        loop = asyncio.get_event_loop()
+        try:
+            return await loop.run_in_executor(executor, functools.partial(run_analyzer_stage, stage, *args))
+        except BrokenExecutor as e:
+            logger.error(f"CPU executor unavailable for {stage}, running inline: {e}")
+            return getattr(self, stage)(*args)
+
+    async def analyze_resume_comprehensive(self, text: str, job_description: str = "", filename: str = "", file_content: bytes = None,
+                                           urls: Optional[List[str]] = None, cpu_executor: Optional[Executor] = None,
+                                           stage_timings: Optional[Dict[str, float]] = None,
+                                           progress_callback: Optional[Callable[[str], None]] = None,
+                                           result_cache_key: Optional[str] = None) -> Dict[str, Any]:
+        """Main comprehensive analysis function with coding profile analysis.
+
+        `progress_callback`, if given, is called with each stage name as it starts.
+        Results are cached under `result_cache_key` (set by analyze_resume_file); text
+        input without a file is keyed by the text itself.
+        """
         
         if len(text.strip()) < 50:
             raise HTTPException(status_code=400, detail="Resume content appears to be too short or unreadable.")
+
+        if result_cache_key is None and file_content is None:
+            result_cache_key = result_cache.make_key(text.encode('utf-8'), job_description, self.analyzer_version())
+            cached = result_cache.get(result_cache_key)
+            if cached is not None:
+                return cached
         
         start_time = time.time()
-        
-        # Perform all analyses
-        ats_score, ats_feedback = self.analyze_ats_compatibility(text, filename)
-        keywords_score, keywords_feedback = self.analyze_keywords(text, job_description)
-        content_score, content_feedback = self.analyze_content_quality(text)
-        grammar_score, grammar_feedback = self.analyze_grammar_spelling(text)
-        structure_score, structure_feedback = self.analyze_structure_completeness(text)
-        
+        stage_timings = stage_timings if stage_timings is not None else {}
+        report_progress = progress_callback or (lambda stage: None)
+
+        # Perform all rule-based analyses (CPU-bound)
+        report_progress('rule_scoring')
+        stage_start = time.time()
+        job_profile = self.get_job_profile(job_description) if job_description else None
+        rules = await self.run_cpu_stage(cpu_executor, 'score_resume_rules', text, job_description, filename, job_profile)
+        stage_timings['rule_scoring'] = round(time.time() - stage_start, 3)
+
+        ats_score, ats_feedback = rules['ats']
+        keywords_score, keywords_feedback = rules['keywords']
+        content_score, content_feedback = rules['content']
+        grammar_score, grammar_feedback = rules['grammar']
+        structure_score, structure_feedback = rules['structure']
+
         # CODING PROFILES ANALYSIS - NEW FEATURE
+        report_progress('coding_profiles')
+        stage_start = time.time()
         coding_analysis = None
         if file_content and filename.lower().endswith('.pdf'):
             try:
-                # Extract URLs from PDF
-                urls = self.extract_urls_from_pdf(file_content)
+                # Extract URLs from PDF (already done by the extraction stage for file uploads)
+                if urls is None:
+                    urls = await self.run_cpu_stage(cpu_executor, 'extract_urls_from_pdf', file_content)
                 
                 # Extract coding profiles from text and URLs
                 profiles_from_text = self.extract_coding_profiles_from_text(text)
@@ -2110,11 +3617,14 @@ class AdvancedATSAnalyzer:
                     'strengths': [],
                     'areas_for_improvement': ['Create and maintain coding profiles']
                 }
-        
-        # Generate detailed AI insights
-        ai_insights = self.generate_detailed_insights(text, job_description, ats_score, keywords_score, content_score)
-        
+        stage_timings['coding_profiles'] = round(time.time() - stage_start, 3)
+
+        # Detailed AI insights are generated by the rule-scoring stage
+        ai_insights = rules['ai_insights']
+
         # Try LLM analysis if available for additional insights
+        report_progress('llm')
+        stage_start = time.time()
         llm_enhancement = ""
         if self.model_name:
             try:
@@ -2140,7 +3650,8 @@ Be specific and actionable with examples."""
                     llm_enhancement = llm_response
             except Exception as e:
                 logger.warning(f"LLM analysis failed: {e}")
-        
+        stage_timings['llm'] = round(time.time() - stage_start, 3)
+
         analysis_time = time.time() - start_time
         
         # Calculate overall score with weighted percentages (including coding score if available)
@@ -2223,23 +3734,21 @@ Be specific and actionable with examples."""
         if llm_enhancement:
             feedback_with_insights["AI Analysis"] = [f"🤖 {llm_enhancement}"]
         
-        # Calculate additional metrics
-        words = self.safe_word_tokenize(text)
-        sentences = self.safe_sent_tokenize(text)
-        
-        # Generate job match insights if job description provided
-        job_match_insights = None
-        if job_description:
-            job_match_insights = self.generate_job_match_insights(text, job_description)
-        
+        # Additional metrics and job match insights come from the rule-scoring stage
+        word_count = rules['word_count']
+        sentence_count = rules['sentence_count']
+        job_match_insights = rules['job_match_insights']
+
         metrics = {
-            "word_count": len(words),
-            "sentence_count": len(sentences),
-            "avg_sentence_length": len(words) / max(len(sentences), 1),
-            "readability_score": min(max((len(words) / max(len(sentences), 1) - 10) * 5 + 50, 0), 100),
+            "word_count": word_count,
+            "sentence_count": sentence_count,
+            "avg_sentence_length": word_count / max(sentence_count, 1),
+            "readability_score": min(max((word_count / max(sentence_count, 1) - 10) * 5 + 50, 0), 100),
             "analysis_time_seconds": round(analysis_time, 2),
-            "text_similarity_to_job": self.calculate_text_similarity(text, job_description) if job_description else 0,
-            "coding_profiles_count": len(coding_analysis.get('profiles_found', [])) if coding_analysis else 0
+            "text_similarity_to_job": rules['text_similarity'],
+            "coding_profiles_count": len(coding_analysis.get('profiles_found', [])) if coding_analysis else 0,
+            "stage_timings": stage_timings,
+            "cache_hit": False
         }
         
         # Prepare detailed scores
@@ -2263,7 +3772,7 @@ Be specific and actionable with examples."""
             "feedback": feedback_with_insights,
             "detailed_insights": ai_insights,
             "analysis_method": f"Advanced Analysis {'+ LLM' if self.model_name else ''} + Coding Profiles",
-            "word_count": len(words),
+            "word_count": word_count,
             "analysis_timestamp": datetime.now().isoformat(),
             "metrics": metrics
         }
@@ -2276,33 +3785,484 @@ Be specific and actionable with examples."""
         if job_match_insights and "error" not in job_match_insights:
             result["job_match_analysis"] = job_match_insights
         
+        # Don't pin degraded results (failed LLM call, timed-out profile fetches) in the cache
+        degraded = (self.model_name and not llm_enhancement) or (coding_analysis or {}).get('profiles_timed_out')
+        if result_cache_key and not degraded:
+            result_cache.set(result_cache_key, result)
+        
         return result
     
-    async def analyze_resume_file(self, file_content: bytes, filename: str, job_description: str = "") -> Dict[str, Any]:
+    async def analyze_resume_file(self, file_content: bytes, filename: str, job_description: str = "",
+                                  cpu_executor: Optional[Executor] = None,
+                                  progress_callback: Optional[Callable[[str], None]] = None) -> Dict[str, Any]:
         """Analyze resume from file upload with coding profile extraction"""
         
-        # Extract text based on file type
-        if filename.lower().endswith('.pdf'):
-            text = self.extract_text_from_pdf(file_content)
-        elif filename.lower().endswith('.docx'):
-            text = self.extract_text_from_docx(file_content)
-        else:
+        if not filename.lower().endswith(('.pdf', '.docx')):
             raise HTTPException(status_code=400, detail="Unsupported file format. Please use PDF or DOCX.")
+
+        # Identical bytes + JD + analyzer version: serve the previous analysis
+        cache_key = result_cache.make_key(file_content, job_description, self.analyzer_version())
+        cached = result_cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        # Extract text (and PDF links) based on file type
+        if progress_callback:
+            progress_callback('extract')
+        stage_start = time.time()
+        extracted = await self.run_cpu_stage(cpu_executor, 'extract_resume_content', file_content, filename)
+        stage_timings = {'extract': round(time.time() - stage_start, 3)}
+        text = extracted['text']
         
         if text.startswith("Error"):
             raise HTTPException(status_code=400, detail=text)
         
-        return await self.analyze_resume_comprehensive(text, job_description, filename, file_content)
+        return await self.analyze_resume_comprehensive(
+            text, job_description, filename, file_content,
+            urls=extracted['urls'], cpu_executor=cpu_executor, stage_timings=stage_timings,
+            progress_callback=progress_callback, result_cache_key=cache_key
+        )
+
+def init_cpu_worker():
+    """Process pool initializer: the pool already runs one document per worker, so pages are
+    extracted serially instead of each worker starting (and leaking) its own page pool"""
+    pdf_engine.page_workers = 1
+
+def run_analyzer_stage(stage: str, *args):
+    """Executor entry point: run a synchronous stage on this process's analyzer"""
+    return getattr(analyzer, stage)(*args)
+
+# Executor for CPU-heavy extraction and scoring (created on first use).
+# ANALYSIS_EXECUTOR selects "process" (default), "thread" or "inline" (run on the event loop).
+cpu_executor: Optional[Executor] = None
+ANALYSIS_EXECUTOR = os.getenv("ANALYSIS_EXECUTOR", "process").lower()
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_FILE_TIMEOUT_SECONDS = float(os.getenv("BATCH_FILE_TIMEOUT_SECONDS", "180"))
+
+def get_cpu_executor() -> Optional[Executor]:
+    """Return the shared CPU executor, creating it if needed (None when running inline)"""
+    global cpu_executor
+    if cpu_executor is None and ANALYSIS_EXECUTOR != "inline":
+        workers = int(os.getenv("ANALYSIS_CPU_WORKERS", str(os.cpu_count() or 2)))
+        if ANALYSIS_EXECUTOR == "thread":
+            cpu_executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ats-cpu")
+        else:
+            cpu_executor = ProcessPoolExecutor(max_workers=workers, initializer=init_cpu_worker)
+        logger.info(f"CPU {ANALYSIS_EXECUTOR} pool started with {workers} workers")
+    return cpu_executor
+
+def shutdown_cpu_executor():
+    """Stop the CPU executor without waiting for queued work"""
+    global cpu_executor
+    if cpu_executor is not None:
+        cpu_executor.shutdown(wait=False, cancel_futures=True)
+        cpu_executor = None
+
+class EventLoopLagMonitor:
+    """Measures how late the event loop wakes up from a fixed-interval sleep.
+
+    Sustained lag means synchronous work is blocking the loop and delaying every
+    other request handled by this worker.
+    """
+
+    def __init__(self, interval: float = 0.5, window: int = 240):
+        self.interval = interval
+        self.samples = deque(maxlen=window)
+        self.max_lag = 0.0
+        self.task: Optional[asyncio.Task] = None
+
+    def start(self):
+        if self.task is None:
+            self.task = asyncio.ensure_future(self._run())
+
+    async def stop(self):
+        if self.task is not None:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+
+    async def _run(self):
+        loop = asyncio.get_event_loop()
+        while True:
+            expected = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag = max(loop.time() - expected, 0.0)
+            self.samples.append(lag)
+            self.max_lag = max(self.max_lag, lag)
+            if lag > 0.5:
+                logger.warning(f"Event loop lag of {lag * 1000:.0f} ms detected")
+
+    def get_stats(self) -> Dict[str, Any]:
+        samples = sorted(self.samples)
+        if not samples:
+            return {'samples': 0}
+        return {
+            'samples': len(samples),
+            'last_ms': round(self.samples[-1] * 1000, 2),
+            'avg_ms': round(sum(samples) / len(samples) * 1000, 2),
+            'p95_ms': round(samples[min(int(len(samples) * 0.95), len(samples) - 1)] * 1000, 2),
+            'max_ms': round(self.max_lag * 1000, 2),
+            'window_seconds': round(len(samples) * self.interval, 1)
+        }
+
+event_loop_monitor = EventLoopLagMonitor()
+
+async def analyze_batch_file(index: int, filename: str, file_content: bytes, job_description: str,
+                             semaphore: asyncio.Semaphore, executor: Optional[Executor]) -> Dict[str, Any]:
+    """Analyze one file of a batch; failures and timeouts become error results"""
+    async with semaphore:
+        try:
+            result = await asyncio.wait_for(
+                analyzer.analyze_resume_file(file_content, filename, job_description, cpu_executor=executor),
+                timeout=BATCH_FILE_TIMEOUT_SECONDS
+            )
+        except HTTPException as e:
+            result = {"error": e.detail, "overall_score": 0}
+        except asyncio.TimeoutError:
+            result = {"error": f"Analysis timed out after {BATCH_FILE_TIMEOUT_SECONDS:.0f}s", "overall_score": 0}
+        except Exception as e:
+            result = {"error": str(e), "overall_score": 0}
+
+    result["filename"] = filename
+    result["batch_index"] = index
+    return result
+
+async def iter_batch_analysis(files: List[tuple], job_description: str = ""):
+    """Yield (filename, file_content) analysis results in completion order.
+
+    At most BATCH_MAX_CONCURRENCY files are in flight. Extraction and rule scoring
+    run on the process pool while profile fetching and LLM calls overlap on the
+    event loop. Each file has its own timeout so one slow resume cannot stall the batch.
+    """
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    executor = get_cpu_executor()
+    tasks = [
+        asyncio.ensure_future(analyze_batch_file(index, filename, file_content, job_description, semaphore, executor))
+        for index, (filename, file_content) in enumerate(files)
+    ]
+    try:
+        for next_result in asyncio.as_completed(tasks):
+            yield await next_result
+    finally:
+        # Stop outstanding work if the consumer goes away (e.g. a streaming client disconnects)
+        for task in tasks:
+            task.cancel()
+
+async def run_batch_analysis(files: List[tuple], job_description: str = "") -> List[Dict[str, Any]]:
+    """Analyze (filename, file_content) pairs concurrently; results keep upload order"""
+    results = [result async for result in iter_batch_analysis(files, job_description)]
+    results.sort(key=lambda result: result["batch_index"])
+    return results
+
+MATRIX_MAX_RESUMES = int(os.getenv("MATRIX_MAX_RESUMES", "100"))
+MATRIX_MAX_JOBS = int(os.getenv("MATRIX_MAX_JOBS", "50"))
+
+async def extract_matrix_resumes(files: List[tuple]) -> List[Dict[str, Any]]:
+    """Extract text from (filename, file_content) pairs concurrently; unreadable files become error entries"""
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    executor = get_cpu_executor()
+
+    async def extract_one(filename: str, file_content: bytes) -> Dict[str, Any]:
+        if not filename.lower().endswith(('.pdf', '.docx')):
+            return {"filename": filename, "error": "Unsupported file format. Please use PDF or DOCX."}
+        async with semaphore:
+            try:
+                extracted = await analyzer.run_cpu_stage(executor, 'extract_resume_content', file_content, filename)
+            except Exception as e:
+                return {"filename": filename, "error": str(e)}
+        text = extracted['text']
+        if text.startswith("Error") or len(text.strip()) < 50:
+            return {"filename": filename, "error": "Resume content appears to be too short or unreadable."}
+        return {"filename": filename, "text": text}
+
+    return await asyncio.gather(*(extract_one(filename, content) for filename, content in files))
+
+def format_stream_frame(event: str, data: Dict[str, Any], stream_format: str = "ndjson") -> str:
+    """Encode one streaming frame as an NDJSON line or a Server-Sent Event"""
+    payload = json.dumps(jsonable_encoder(data))
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f'{{"type": "{event}", "data": {payload}}}\n'
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+JOB_STAGES = ['extract', 'rule_scoring', 'coding_profiles', 'llm']
+JOB_TERMINAL_STATUSES = ('completed', 'failed', 'cancelled')
+
+class AnalysisJobStore:
+    """Job records for queued analyses, kept in memory and optionally in SQLite.
+
+    With a database path, job status and results survive restarts; jobs that were
+    still queued or running when the process stopped are marked as failed on load.
+    """
+
+    def __init__(self, max_jobs: int = 1000, db_path: Optional[str] = None):
+        self.max_jobs = max_jobs
+        self.jobs: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.update_events: Dict[str, asyncio.Event] = {}
+        self.db_lock = threading.Lock()
+        self.db = None
+
+        if db_path:
+            try:
+                self.db = sqlite3.connect(db_path, check_same_thread=False)
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS analysis_jobs ("
+                    "job_id TEXT PRIMARY KEY, data TEXT NOT NULL, created_at REAL NOT NULL)"
+                )
+                self.db.commit()
+                self._load()
+            except sqlite3.Error as e:
+                logger.warning(f"Job store database unavailable ({db_path}): {e}. Using memory only.")
+                self.db = None
+
+    def _load(self):
+        rows = self.db.execute(
+            "SELECT data FROM analysis_jobs ORDER BY created_at DESC LIMIT ?", (self.max_jobs,)
+        ).fetchall()
+        for (data,) in reversed(rows):
+            job = json.loads(data)
+            if job['status'] not in JOB_TERMINAL_STATUSES:
+                job.update(status='failed', error='Interrupted by server restart', finished_at=datetime.now().isoformat())
+                self._persist(job)
+            self.jobs[job['job_id']] = job
+
+    def _persist(self, job: Dict[str, Any]):
+        if self.db is None:
+            return
+        try:
+            with self.db_lock:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO analysis_jobs (job_id, data, created_at) VALUES (?, ?, ?)",
+                    (job['job_id'], json.dumps(jsonable_encoder(job)), job['created_ts'])
+                )
+                self.db.commit()
+        except sqlite3.Error as e:
+            logger.warning(f"Job store write failed for {job['job_id']}: {e}")
+
+    def create(self, filename: str) -> Dict[str, Any]:
+        job = {
+            'job_id': uuid.uuid4().hex,
+            'filename': filename,
+            'status': 'queued',
+            'stage': None,
+            'progress': {stage: 'pending' for stage in JOB_STAGES},
+            'percent_complete': 0,
+            'created_at': datetime.now().isoformat(),
+            'created_ts': time.time(),
+            'started_at': None,
+            'finished_at': None,
+            'result': None,
+            'error': None,
+            'version': 0
+        }
+        self.jobs[job['job_id']] = job
+        self._evict()
+        self._persist(job)
+        return job
+
+    def _evict(self):
+        # Drop the oldest finished jobs first; unfinished jobs are never evicted
+        for job_id in list(self.jobs):
+            if len(self.jobs) <= self.max_jobs:
+                break
+            if self.jobs[job_id]['status'] in JOB_TERMINAL_STATUSES:
+                del self.jobs[job_id]
+                self.update_events.pop(job_id, None)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        return self.jobs.get(job_id)
+
+    def update(self, job_id: str, **changes):
+        """Apply changes to a job and wake any status streams waiting on it"""
+        job = self.jobs.get(job_id)
+        if job is None:
+            return
+        job.update(changes)
+        job['version'] += 1
+        self._persist(job)
+
+        event = self.update_events.pop(job_id, None)
+        if event is not None:
+            event.set()
+
+    def start_stage(self, job_id: str, stage: str):
+        """Mark `stage` as running and every earlier stage as done"""
+        job = self.jobs.get(job_id)
+        if job is None or stage not in JOB_STAGES:
+            return
+        stage_index = JOB_STAGES.index(stage)
+        progress = {
+            name: 'done' if index < stage_index else 'running' if index == stage_index else 'pending'
+            for index, name in enumerate(JOB_STAGES)
+        }
+        self.update(job_id, stage=stage, progress=progress,
+                    percent_complete=int(stage_index / len(JOB_STAGES) * 100))
+
+    async def wait_for_update(self, job_id: str, since_version: int, timeout: float) -> bool:
+        """Wait until the job moves past `since_version`; returns False on timeout"""
+        job = self.jobs.get(job_id)
+        if job is None or job['version'] != since_version:
+            return True
+        event = self.update_events.setdefault(job_id, asyncio.Event())
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+class AnalysisJobQueue:
+    """In-process queue of resume analyses worked through by a fixed pool of workers"""
+
+    def __init__(self, store: AnalysisJobStore, worker_count: int = 2, max_queue_size: int = 100):
+        self.store = store
+        self.worker_count = worker_count
+        self.max_queue_size = max_queue_size
+        self.queue: Optional[asyncio.Queue] = None
+        self.workers: List[asyncio.Task] = []
+        self.running_tasks: Dict[str, asyncio.Task] = {}
+        # Jobs cancelled through the API, as opposed to workers cancelled at shutdown
+        self.cancelled_ids: set = set()
+
+    def start(self):
+        if self.workers:
+            return
+        self.queue = asyncio.Queue(maxsize=self.max_queue_size)
+        self.workers = [asyncio.ensure_future(self._worker(index)) for index in range(self.worker_count)]
+        logger.info(f"Analysis job queue started with {self.worker_count} workers")
+
+    async def stop(self):
+        for worker in self.workers:
+            worker.cancel()
+        await asyncio.gather(*self.workers, return_exceptions=True)
+        self.workers = []
+
+    def submit(self, file_content: bytes, filename: str, job_description: str = "") -> Dict[str, Any]:
+        """Queue an analysis and return its job record immediately"""
+        if self.queue is None:
+            self.start()
+        if self.queue.full():
+            raise HTTPException(status_code=503, detail="Analysis queue is full, please retry later")
+
+        job = self.store.create(filename)
+        self.queue.put_nowait((job['job_id'], file_content, filename, job_description))
+        return job
+
+    def cancel(self, job_id: str) -> bool:
+        """Cancel a queued or running job; returns False if it had already finished"""
+        job = self.store.get(job_id)
+        if job is None or job['status'] in JOB_TERMINAL_STATUSES:
+            return False
+
+        running_task = self.running_tasks.get(job_id)
+        if running_task is not None:
+            if running_task.done():
+                # Finished but not yet recorded; the worker is about to store the outcome
+                return False
+            self.cancelled_ids.add(job_id)
+            running_task.cancel()
+        # Queued jobs stay in the queue and are skipped by the worker that picks them up
+        self.store.update(job_id, status='cancelled', finished_at=datetime.now().isoformat())
+        return True
+
+    def get_stats(self) -> Dict[str, Any]:
+        return {
+            'workers': self.worker_count,
+            'queued': self.queue.qsize() if self.queue is not None else 0,
+            'running': len(self.running_tasks),
+            'max_queue_size': self.max_queue_size
+        }
+
+    async def _worker(self, worker_index: int):
+        while True:
+            job_id, file_content, filename, job_description = await self.queue.get()
+            try:
+                job = self.store.get(job_id)
+                if job is None or job['status'] == 'cancelled':
+                    continue
+                await self._run_job(job_id, file_content, filename, job_description)
+            finally:
+                self.queue.task_done()
+
+    async def _run_job(self, job_id: str, file_content: bytes, filename: str, job_description: str):
+        self.store.update(job_id, status='running', started_at=datetime.now().isoformat())
+        task = asyncio.ensure_future(analyzer.analyze_resume_file(
+            file_content, filename, job_description,
+            cpu_executor=get_cpu_executor(),
+            progress_callback=lambda stage: self.store.start_stage(job_id, stage)
+        ))
+        self.running_tasks[job_id] = task
+        try:
+            result = await task
+            if job_id not in self.cancelled_ids:
+                self.store.update(
+                    job_id, status='completed', stage='done', result=result, percent_complete=100,
+                    progress={stage: 'done' for stage in JOB_STAGES}, finished_at=datetime.now().isoformat()
+                )
+        except asyncio.CancelledError:
+            # Cancelling the worker also cancels the task it awaits, so task.cancelled()
+            # cannot tell the two apart; only cancel() records API cancellations
+            if job_id in self.cancelled_ids:
+                return  # the job record is already marked 'cancelled'
+            self.store.update(job_id, status='failed', error='Server shutting down',
+                              finished_at=datetime.now().isoformat())
+            raise
+        except HTTPException as e:
+            self.store.update(job_id, status='failed', error=e.detail, finished_at=datetime.now().isoformat())
+        except Exception as e:
+            logger.error(f"Analysis job {job_id} failed: {e}")
+            self.store.update(job_id, status='failed', error=str(e), finished_at=datetime.now().isoformat())
+        finally:
+            self.running_tasks.pop(job_id, None)
+            self.cancelled_ids.discard(job_id)
+
+def public_job_view(job: Dict[str, Any]) -> Dict[str, Any]:
+    """Job record as returned by the API"""
+    return {key: value for key, value in job.items() if key not in ('created_ts', 'version')}
 
 # Initialize analyzer
 analyzer = AdvancedATSAnalyzer()
 
+# Background analysis jobs
+job_queue = AnalysisJobQueue(
+    AnalysisJobStore(
+        max_jobs=int(os.getenv("JOB_STORE_MAX_JOBS", "1000")),
+        db_path=os.getenv("JOB_STORE_DB") or None
+    ),
+    worker_count=int(os.getenv("JOB_WORKERS", "2")),
+    max_queue_size=int(os.getenv("JOB_QUEUE_MAX_SIZE", "100"))
+)
+
+@app.on_event("startup")
+async def startup_event():
+    """Open the pooled HTTP session used by all coding-platform fetchers and start job workers"""
+    analyzer.get_http_session()
+    job_queue.start()
+    event_loop_monitor.start()
+    logger.info(
+        f"HTTP session pool ready (limit={analyzer.http_pool_limit}, "
+        f"per_host={analyzer.http_pool_limit_per_host})"
+    )
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop job workers and the loop-lag monitor, close the pooled HTTP/LLM sessions and the CPU/PDF executors"""
+    await job_queue.stop()
+    await event_loop_monitor.stop()
+    await analyzer.close_http_session()
+    await llm_gateway.aclose()
+    shutdown_cpu_executor()
+    pdf_engine.shutdown()
+
 @app.get("/")
 async def root():
     """Root endpoint with API information"""
     return {
         "message": "Advanced ATS Resume Score Analyzer with Coding Profiles",
-        "version": "6.0.0",
+        "version": ANALYZER_VERSION,
         "current_model": analyzer.model_name or "Advanced Rule-Based Analysis",
         "groq_status": "connected" if analyzer.model_name else "using_advanced_rules",
         "features": [
@@ -2318,22 +4278,35 @@ async def root():
         "endpoints": {
             "/analyze": "POST - Upload resume file (includes coding profile analysis)",
             "/analyze-text": "POST - Analyze text input",
+            "/batch-analyze": "POST - Analyze up to 10 resume files",
+            "/batch-analyze/stream": "POST - Stream batch results as NDJSON or SSE as each file finishes",
+            "/job-descriptions": "POST - Compile a job description once, returns a jd_id for analyze/batch calls",
+            "/job-descriptions/{jd_id}": "GET - Compiled job description summary",
+            "/match-matrix": "POST - Score N resumes against M job descriptions (N x M match matrix)",
+            "/jobs": "POST - Queue a resume analysis, returns a job id",
+            "/jobs/{job_id}": "GET - Job status and result, DELETE - cancel job",
+            "/jobs/{job_id}/events": "GET - Stream job progress as SSE or NDJSON",
             "/analyze-coding-profile": "POST - Analyze specific coding profile",
             "/health": "GET - System health check",
-            "/models": "GET - Available models"
+            "/models": "GET - Available models",
+            "/rate-limits": "GET - LLM rate limiter queue depth and wait times",
+            "/cache-stats": "GET - Cache hit rates and sizes"
         }
     }
 
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
-    groq_status = "connected" if analyzer.test_groq_connection() else "disconnected"
+    groq_status = "connected" if await analyzer.test_groq_connection() else "disconnected"
     
     return {
         "status": "healthy",
         "groq_status": groq_status,
         "current_model": analyzer.model_name or "Advanced Rules",
         "nlp_ready": analyzer.nlp is not None,
+        "analysis_executor": ANALYSIS_EXECUTOR,
+        "event_loop_lag": event_loop_monitor.get_stats(),
+        "llm_gateway": llm_gateway.get_stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -2347,18 +4320,79 @@ async def list_models():
         "current_model": analyzer.model_name
     }
 
+@app.get("/rate-limits")
+async def get_rate_limits():
+    """LLM rate limiter backpressure: queue depth, wait times and remaining budget per model"""
+    return {
+        **llm_rate_limiter.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+@app.get("/cache-stats")
+async def get_cache_stats():
+    """Hit rates and sizes of the in-process caches"""
+    return {
+        "profile_cache": profile_cache.get_stats(),
+        "codeforces_user_info_batching": analyzer.codeforces_user_info.stats,
+        "result_cache": result_cache.get_stats(),
+        "llm_responses": llm_cache.get_stats(),
+        "tfidf_model": tfidf_model.get_stats() if tfidf_model else None,
+        "job_descriptions": analyzer.job_profiles.get_stats(),
+        "timestamp": datetime.now().isoformat()
+    }
+
+JOB_DESCRIPTION_MAX_CHARS = int(os.getenv("JOB_DESCRIPTION_MAX_CHARS", "20000"))
+
+def resolve_job_description(job_description: str, jd_id: Optional[str]) -> str:
+    """Job description text for a request: the compiled profile's text when jd_id is given"""
+    if not jd_id:
+        return job_description or ""
+    profile = analyzer.job_profiles.get(jd_id)
+    if profile is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Unknown or expired jd_id '{jd_id}'. Submit the job description to /job-descriptions again."
+        )
+    return profile.text
+
+@app.post("/job-descriptions", status_code=201)
+async def create_job_description(request: JobDescriptionRequest):
+    """Compile a job description once; pass the returned jd_id to analyze/batch calls"""
+    job_description = request.job_description.strip()
+    if not job_description:
+        raise HTTPException(status_code=400, detail="Job description is empty")
+    if len(job_description) > JOB_DESCRIPTION_MAX_CHARS:
+        raise HTTPException(status_code=400, detail=f"Job description exceeds {JOB_DESCRIPTION_MAX_CHARS} characters")
+
+    profile = analyzer.get_job_profile(job_description)
+    if request.title:
+        profile.title = request.title
+    return profile.summary()
+
+@app.get("/job-descriptions/{jd_id}")
+async def get_job_description(jd_id: str):
+    """Summary of a compiled job description"""
+    profile = analyzer.job_profiles.get(jd_id)
+    if profile is None:
+        raise HTTPException(status_code=404, detail="Job description not found or expired")
+    return profile.summary()
+
 @app.post("/analyze")
 async def analyze_resume(
     resume: UploadFile = File(...),
-    job_description: str = Form("")
+    job_description: str = Form(""),
+    jd_id: str = Form("")
 ):
     """Analyze uploaded resume file"""
     try:
         if not resume.filename:
             raise HTTPException(status_code=400, detail="No file selected")
         
+        job_description = resolve_job_description(job_description, jd_id)
         file_content = await resume.read()
-        result = await analyzer.analyze_resume_file(file_content, resume.filename, job_description)
+        result = await analyzer.analyze_resume_file(
+            file_content, resume.filename, job_description, cpu_executor=get_cpu_executor()
+        )
         
         return result
     
@@ -2374,8 +4408,9 @@ async def analyze_resume_text(request: TextAnalysisRequest):
     try:
         result = await analyzer.analyze_resume_comprehensive(
             request.resume_text, 
-            request.job_description, 
-            "text_input.txt"
+            resolve_job_description(request.job_description, request.jd_id), 
+            "text_input.txt",
+            cpu_executor=get_cpu_executor()
         )
         
         return result
@@ -2389,36 +4424,31 @@ async def analyze_resume_text(request: TextAnalysisRequest):
 @app.post("/batch-analyze")
 async def batch_analyze_resumes(
     resumes: List[UploadFile] = File(...),
-    job_description: str = Form("")
+    job_description: str = Form(""),
+    jd_id: str = Form("")
 ):
     """Analyze multiple resume files at once"""
     try:
         if len(resumes) > 10:
             raise HTTPException(status_code=400, detail="Maximum 10 files allowed per batch")
+        job_description = resolve_job_description(job_description, jd_id)
         
-        results = []
+        batch_start = time.time()
+        files = []
         for resume in resumes:
             if not resume.filename:
                 continue
-                
-            try:
-                file_content = await resume.read()
-                result = await analyzer.analyze_resume_file(file_content, resume.filename, job_description)
-                result["filename"] = resume.filename
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    "filename": resume.filename,
-                    "error": str(e),
-                    "overall_score": 0
-                })
+            files.append((resume.filename, await resume.read()))
+
+        results = await run_batch_analysis(files, job_description)
         
-        # Sort by overall score (highest first)
+        # Sort by overall score (highest first); ties keep upload order
         results.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
         
         return {
             "batch_results": results,
             "total_analyzed": len(results),
+            "batch_time_seconds": round(time.time() - batch_start, 2),
             "analysis_timestamp": datetime.now().isoformat()
         }
     
@@ -2428,12 +4458,210 @@ async def batch_analyze_resumes(
         logger.error(f"Batch analysis failed: {str(e)}")
         raise HTTPException(status_code=500, detail=f"Batch analysis failed: {str(e)}")
 
+@app.post("/batch-analyze/stream")
+async def batch_analyze_resumes_stream(
+    resumes: List[UploadFile] = File(...),
+    job_description: str = Form(""),
+    jd_id: str = Form(""),
+    stream_format: str = Form("ndjson")
+):
+    """Analyze multiple resume files, streaming each result as soon as it finishes.
+
+    Emits one `result` frame per file (NDJSON lines or Server-Sent Events) followed
+    by a `summary` frame with the ranked order of the whole batch.
+    """
+    if len(resumes) > 10:
+        raise HTTPException(status_code=400, detail="Maximum 10 files allowed per batch")
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"stream_format must be one of: {', '.join(STREAM_MEDIA_TYPES)}")
+    job_description = resolve_job_description(job_description, jd_id)
+
+    files = []
+    for resume in resumes:
+        if not resume.filename:
+            continue
+        files.append((resume.filename, await resume.read()))
+
+    async def stream_results():
+        batch_start = time.time()
+        # Only the ranking fields are kept once a result has been sent
+        ranking = []
+        async for result in iter_batch_analysis(files, job_description):
+            ranking.append({
+                "filename": result["filename"],
+                "batch_index": result["batch_index"],
+                "overall_score": result.get("overall_score", 0),
+                "error": result.get("error")
+            })
+            yield format_stream_frame("result", result, stream_format)
+
+        ranking.sort(key=lambda x: (-x["overall_score"], x["batch_index"]))
+        yield format_stream_frame("summary", {
+            "ranked_results": ranking,
+            "total_analyzed": len(ranking),
+            "batch_time_seconds": round(time.time() - batch_start, 2),
+            "analysis_timestamp": datetime.now().isoformat()
+        }, stream_format)
+
+    return StreamingResponse(
+        stream_results(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.post("/match-matrix")
+async def match_matrix(
+    resumes: List[UploadFile] = File(...),
+    job_descriptions: str = Form("[]"),
+    jd_ids: str = Form("")
+):
+    """Score N resumes against M job descriptions in one vectorized pass.
+
+    `job_descriptions` is a JSON array of job description texts and `jd_ids` a
+    comma-separated list of ids from /job-descriptions; both may be combined.
+    Returns the overall match and each component as N x M percentage matrices.
+    """
+    try:
+        job_texts = json.loads(job_descriptions or "[]")
+    except json.JSONDecodeError:
+        raise HTTPException(status_code=400, detail="job_descriptions must be a JSON array of strings")
+    if not isinstance(job_texts, list) or not all(isinstance(text, str) for text in job_texts):
+        raise HTTPException(status_code=400, detail="job_descriptions must be a JSON array of strings")
+
+    job_texts = [text.strip() for text in job_texts if text.strip()]
+    job_texts += [resolve_job_description("", jd_id.strip()) for jd_id in jd_ids.split(",") if jd_id.strip()]
+    if not job_texts:
+        raise HTTPException(status_code=400, detail="Provide at least one job description or jd_id")
+    if len(job_texts) > MATRIX_MAX_JOBS:
+        raise HTTPException(status_code=400, detail=f"Maximum {MATRIX_MAX_JOBS} job descriptions allowed")
+    if any(len(text) > JOB_DESCRIPTION_MAX_CHARS for text in job_texts):
+        raise HTTPException(status_code=400, detail=f"Job description exceeds {JOB_DESCRIPTION_MAX_CHARS} characters")
+    if len(resumes) > MATRIX_MAX_RESUMES:
+        raise HTTPException(status_code=400, detail=f"Maximum {MATRIX_MAX_RESUMES} files allowed")
+
+    start_time = time.time()
+    files = [(resume.filename, await resume.read()) for resume in resumes if resume.filename]
+    extracted = await extract_matrix_resumes(files)
+    scored = [entry for entry in extracted if "text" in entry]
+
+    resume_entries = []
+    row = 0
+    for entry in extracted:
+        if "text" in entry:
+            resume_entries.append({"filename": entry["filename"], "row": row})
+            row += 1
+        else:
+            resume_entries.append({"filename": entry["filename"], "error": entry["error"]})
+
+    # Compile (or reuse) every JD in this process; workers receive the texts
+    profiles = [analyzer.get_job_profile(text) for text in job_texts]
+    job_entries = [{"column": column, "jd_id": profile.jd_id, "title": profile.title} for column, profile in enumerate(profiles)]
+
+    if not scored:
+        raise HTTPException(status_code=400, detail="None of the resumes could be read")
+
+    try:
+        matrix = await analyzer.run_cpu_stage(
+            get_cpu_executor(), 'score_match_matrix', [entry["text"] for entry in scored], job_texts
+        )
+    except Exception as e:
+        logger.error(f"Match matrix failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Match matrix failed: {str(e)}")
+
+    def as_percentages(values):
+        # NaN marks a component that could not be computed for that pair
+        return None if values is None else np.where(np.isnan(values), None, np.round(values * 100, 1)).tolist()
+
+    overall = matrix['overall_match']
+    return {
+        "resumes": resume_entries,
+        "jobs": job_entries,
+        "overall_match": as_percentages(overall),
+        "component_scores": {name: as_percentages(values) for name, values in matrix['component_scores'].items()},
+        # For each job, resume rows from best to worst match
+        "rankings": [np.argsort(-overall[:, column], kind='stable').tolist() for column in range(len(profiles))],
+        "pairs_scored": int(overall.size),
+        "processing_time_seconds": round(time.time() - start_time, 3),
+        "analysis_timestamp": datetime.now().isoformat()
+    }
+
+@app.post("/jobs", status_code=202)
+async def create_analysis_job(
+    resume: UploadFile = File(...),
+    job_description: str = Form(""),
+    jd_id: str = Form("")
+):
+    """Queue a resume analysis and return its job id immediately"""
+    if not resume.filename:
+        raise HTTPException(status_code=400, detail="No file selected")
+    if not resume.filename.lower().endswith(('.pdf', '.docx')):
+        raise HTTPException(status_code=400, detail="Unsupported file format. Please use PDF or DOCX.")
+    job_description = resolve_job_description(job_description, jd_id)
+
+    file_content = await resume.read()
+    job = job_queue.submit(file_content, resume.filename, job_description)
+    return {
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "status_url": f"/jobs/{job['job_id']}",
+        "events_url": f"/jobs/{job['job_id']}/events",
+        "queue": job_queue.get_stats()
+    }
+
+@app.get("/jobs/{job_id}")
+async def get_analysis_job(job_id: str):
+    """Current status, per-stage progress and (when completed) the result of a job"""
+    job = job_queue.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    return public_job_view(job)
+
+@app.get("/jobs/{job_id}/events")
+async def stream_analysis_job(job_id: str, stream_format: str = "sse"):
+    """Stream job status frames (SSE or NDJSON) until the job finishes"""
+    if job_queue.store.get(job_id) is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"stream_format must be one of: {', '.join(STREAM_MEDIA_TYPES)}")
+
+    async def stream_status():
+        last_version = None
+        while True:
+            job = job_queue.store.get(job_id)
+            if job is None:
+                break
+            if job['version'] != last_version:
+                last_version = job['version']
+                finished = job['status'] in JOB_TERMINAL_STATUSES
+                yield format_stream_frame("result" if finished else "status", public_job_view(job), stream_format)
+                if finished:
+                    break
+            if not await job_queue.store.wait_for_update(job_id, last_version, timeout=15):
+                # Keep idle connections (and proxies) alive
+                yield ": keep-alive\n\n" if stream_format == "sse" else "\n"
+
+    return StreamingResponse(
+        stream_status(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+@app.delete("/jobs/{job_id}")
+async def cancel_analysis_job(job_id: str):
+    """Cancel a queued or running job"""
+    job = job_queue.store.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job '{job_id}' not found")
+    if not job_queue.cancel(job_id):
+        raise HTTPException(status_code=409, detail=f"Job '{job_id}' already {job['status']}")
+    return public_job_view(job_queue.store.get(job_id))
+
 @app.get("/analytics")
 async def get_analytics():
     """Get system analytics and statistics"""
     return {
         "system_info": {
-            "analyzer_version": "6.0.0",
+            "analyzer_version": ANALYZER_VERSION,
             "nlp_engine": "spaCy + NLTK" if analyzer.nlp else "NLTK only",
             "llm_available": analyzer.model_name is not None,
             "current_model": analyzer.model_name or "Rule-based",
@@ -2506,15 +4734,13 @@ async def extract_coding_profiles_from_resume(
         
         file_content = await resume.read()
         
-        # Extract text
-        if resume.filename.lower().endswith('.pdf'):
-            text = analyzer.extract_text_from_pdf(file_content)
-            urls = analyzer.extract_urls_from_pdf(file_content)
-        elif resume.filename.lower().endswith('.docx'):
-            text = analyzer.extract_text_from_docx(file_content)
-            urls = []  # DOCX URL extraction is more complex
-        else:
+        # Extract text (DOCX URL extraction is more complex, so only PDFs yield URLs)
+        if not resume.filename.lower().endswith(('.pdf', '.docx')):
             raise HTTPException(status_code=400, detail="Unsupported file format")
+        extracted = await analyzer.run_cpu_stage(
+            get_cpu_executor(), 'extract_resume_content', file_content, resume.filename
+        )
+        text, urls = extracted['text'], extracted['urls']
         
         # Extract coding profiles
         profiles_from_text = analyzer.extract_coding_profiles_from_text(text)
@@ -2603,16 +4829,19 @@ async def get_industry_keywords(industry: str):
 async def compare_resumes(
     resume1: UploadFile = File(...),
     resume2: UploadFile = File(...),
-    job_description: str = Form("")
+    job_description: str = Form(""),
+    jd_id: str = Form("")
 ):
     """Compare two resumes side by side"""
     try:
+        job_description = resolve_job_description(job_description, jd_id)
         # Analyze both resumes
         file1_content = await resume1.read()
         file2_content = await resume2.read()
         
-        result1 = await analyzer.analyze_resume_file(file1_content, resume1.filename, job_description)
-        result2 = await analyzer.analyze_resume_file(file2_content, resume2.filename, job_description)
+        executor = get_cpu_executor()
+        result1 = await analyzer.analyze_resume_file(file1_content, resume1.filename, job_description, cpu_executor=executor)
+        result2 = await analyzer.analyze_resume_file(file2_content, resume2.filename, job_description, cpu_executor=executor)
         
         # Create comparison
         comparison = {
@@ -1,6 +1,7 @@
 from fastapi import FastAPI, File, UploadFile, Form, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, StreamingResponse
+from fastapi.encoders import jsonable_encoder
 from pydantic import BaseModel
 import PyPDF2
 import docx
@@ -17,15 +18,21 @@ from nltk.tokenize import word_tokenize, sent_tokenize
 from collections import Counter
 import string
 import asyncio
+from concurrent.futures import BrokenExecutor, Executor, ProcessPoolExecutor
 from typing import Optional, List, Dict, Any
 import logging
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
 import os
-from groq import Groq
+import sys
 from pathlib import Path
 
+# Shared modules (llm_cache, llm_gateway) live at the repository root
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+from llm_cache import LLMCache  # noqa: E402
+from llm_gateway import CircuitOpenError, LLMError, LLMGateway  # noqa: E402
+
 # Download required NLTK data
 def download_nltk_data():
     """Download required NLTK data with proper error handling"""
@@ -80,20 +87,144 @@ class AnalysisResponse(BaseModel):
     analysis_timestamp: str
     metrics: Dict[str, Any]
 
+# Completions keyed by prompt fingerprint; repeated resume + JD prompts skip the API
+llm_cache = LLMCache.from_env()
+
+# Pooled Groq connections with retries, circuit breaking and ordered model fallback
+llm_gateway = LLMGateway.from_env()
+
+# Scored dimensions of the comprehensive analysis and the labels /analyze reports them under
+ANALYSIS_DIMENSIONS = {
+    "ats_compatibility": "ATS Compatibility",
+    "content_quality": "Content Quality",
+    "keyword_optimization": "Keyword Optimization",
+    "structure_organization": "Structure & Organization",
+    "language_quality": "Language Quality"
+}
+
+class IncrementalJSONParser:
+    """Parse a JSON object as it streams in, reporting each value as soon as it closes.
+
+    feed() takes the next chunk of LLM output and returns (path, value) pairs for the
+    values completed in that chunk whose path is at most max_depth keys deep, e.g.
+    (("scores", "ats_compatibility"), 82). Text before the first "{" (markdown fences,
+    preamble) and after the top-level object closes is ignored.
+    """
+
+    def __init__(self, max_depth: int = 2):
+        self.max_depth = max_depth
+        self.buffer = ""
+        self.position = 0
+        self.stack: List[Dict[str, Any]] = []  # open containers: kind, path, start, key/index
+        self.root_span: Optional[tuple] = None
+        self.in_string = False
+        self.escaped = False
+        self.string_start = 0
+        self.string_is_key = False
+        self.scalar_start: Optional[int] = None
+
+    @property
+    def done(self) -> bool:
+        return self.root_span is not None
+
+    def value_path(self) -> tuple:
+        top = self.stack[-1]
+        return top["path"] + ((top["key"],) if top["kind"] == "{" else (top["index"],))
+
+    def complete(self, path: tuple, start: int, end: int, completed: List[tuple]):
+        if len(path) > self.max_depth:
+            return
+        try:
+            completed.append((path, json.loads(self.buffer[start:end])))
+        except json.JSONDecodeError:
+            pass  # malformed value (e.g. a placeholder the model copied); the final parse decides
+
+    def feed(self, chunk: str) -> List[tuple]:
+        completed = []
+        self.buffer += chunk
+        for i in range(self.position, len(self.buffer)):
+            if self.done:
+                break
+            char = self.buffer[i]
+            if not self.stack:
+                if char == "{":
+                    self.stack.append({"kind": "{", "path": (), "start": i, "key": None, "index": 0, "expect_key": True})
+                continue
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == "\\":
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+                    if self.string_is_key:
+                        try:
+                            self.stack[-1]["key"] = json.loads(self.buffer[self.string_start:i + 1])
+                        except json.JSONDecodeError:
+                            self.stack[-1]["key"] = self.buffer[self.string_start + 1:i]
+                    else:
+                        self.complete(self.value_path(), self.string_start, i + 1, completed)
+                continue
+            if self.scalar_start is not None:
+                if char not in ",}]" and not char.isspace():
+                    continue
+                self.complete(self.value_path(), self.scalar_start, i, completed)
+                self.scalar_start = None
+
+            top = self.stack[-1]
+            if char == '"':
+                self.in_string = True
+                self.string_start = i
+                self.string_is_key = top["kind"] == "{" and top["expect_key"]
+            elif char in "{[":
+                self.stack.append({"kind": char, "path": self.value_path(), "start": i,
+                                   "key": None, "index": 0, "expect_key": True})
+            elif char in "}]":
+                frame = self.stack.pop()
+                if self.stack:
+                    self.complete(frame["path"], frame["start"], i + 1, completed)
+                else:
+                    self.root_span = (frame["start"], i + 1)
+            elif char == ":":
+                top["expect_key"] = False
+            elif char == ",":
+                if top["kind"] == "{":
+                    top["expect_key"] = True
+                else:
+                    top["index"] += 1
+            elif not char.isspace():
+                self.scalar_start = i
+        self.position = len(self.buffer)
+        return completed
+
+    def result(self) -> Dict[str, Any]:
+        """The whole object once it has closed; raises json.JSONDecodeError otherwise"""
+        if self.root_span is None:
+            return GroqATSAnalyzer.parse_json_response(self.buffer)
+        return json.loads(self.buffer[self.root_span[0]:self.root_span[1]])
+
 class GroqATSAnalyzer:
     def __init__(self):
-        # Initialize Groq client
+        # Groq credentials for the shared LLM gateway
         self.groq_api_key = os.getenv("GROQ_API_KEY","")
         if not self.groq_api_key:
             logger.error("GROQ_API_KEY environment variable not set!")
-            self.client = None
         else:
-            try:
-                self.client = Groq(api_key=self.groq_api_key)
-                logger.info("Groq client initialized successfully")
-            except Exception as e:
-                logger.error(f"Failed to initialize Groq client: {e}")
-                self.client = None
+            llm_gateway.configure("groq", api_key=self.groq_api_key)
+            logger.info("Groq client initialized successfully")
+        
+        # Upper bound on concurrent completions; further callers wait without blocking the loop
+        self.llm_semaphore = asyncio.Semaphore(int(os.getenv("GROQ_MAX_CONCURRENT_REQUESTS", "8")))
+        
+        # Long-form insight sections: prompt builder and the analysis_type their endpoints report
+        self.insight_sections = {
+            "detailed_insights": (self.detailed_insights_prompt, "Strategic Career Insights"),
+            "optimization_suggestions": (self.optimization_suggestions_prompt, "Resume Optimization Recommendations"),
+            "ats_deep_dive": (self.ats_deep_dive_prompt, "Comprehensive ATS Analysis")
+        }
+        self.system_prompt = "You are an expert resume analyzer and career advisor with deep knowledge of ATS systems, hiring practices, and industry standards."
+        # Completion budget for the single-prompt /full-report mode (all four sections in one response)
+        self.merged_report_max_tokens = int(os.getenv("FULL_REPORT_MERGED_MAX_TOKENS", "8000"))
         
         # Available Groq models (in order of preference)
         self.available_models = [
@@ -130,10 +261,10 @@ class GroqATSAnalyzer:
     
     def is_groq_available(self) -> bool:
         """Check if Groq API is available"""
-        return self.client is not None and self.groq_api_key is not None
+        return bool(self.groq_api_key) and llm_gateway.is_configured("groq")
     
     async def call_groq_api(self, prompt: str, model: str = None, max_tokens: int = 2000) -> str:
-        """Call Groq API with error handling and model fallback"""
+        """Call Groq API through the gateway, falling back along available_models"""
         if not self.is_groq_available():
             raise HTTPException(status_code=503, detail="Groq API not available. Please set GROQ_API_KEY environment variable.")
         
@@ -141,35 +272,78 @@ class GroqATSAnalyzer:
         if not model:
             model = self.available_models[0]
         
+        cache_key = self.completion_cache_key(prompt, model, max_tokens)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
+        # Preferred model first, then the remaining models in preference order
+        models = [model] + [fallback for fallback in self.available_models if fallback != model]
+        
         try:
-            response = self.client.chat.completions.create(
-                model=model,
-                messages=[
-                    {"role": "system", "content": "You are an expert resume analyzer and career advisor with deep knowledge of ATS systems, hiring practices, and industry standards."},
-                    {"role": "user", "content": prompt}
-                ],
-                max_tokens=max_tokens,
-                temperature=0.1,
-                top_p=0.9,
-                timeout=60
-            )
-            
-            return response.choices[0].message.content
-            
-        except Exception as e:
-            error_msg = str(e).lower()
+            async with self.llm_semaphore:
+                response = await llm_gateway.complete("groq", models, prompt, system=self.system_prompt,
+                                                      max_tokens=max_tokens, temperature=0.1, top_p=0.9)
             
-            # Try fallback models if current model fails
-            if "model" in error_msg and model != self.available_models[-1]:
-                current_index = self.available_models.index(model)
-                if current_index < len(self.available_models) - 1:
-                    fallback_model = self.available_models[current_index + 1]
-                    logger.warning(f"Model {model} failed, trying {fallback_model}")
-                    return await self.call_groq_api(prompt, fallback_model, max_tokens)
+            # Truncated completions and fallback-model answers are not worth replaying
+            if response.finish_reason == "stop" and response.model == model:
+                llm_cache.set(cache_key, response.text, "groq", model,
+                              response.prompt_tokens, response.completion_tokens)
+            return response.text
             
+        except CircuitOpenError as e:
+            logger.error(f"Groq API unavailable: {e}")
+            raise HTTPException(status_code=503, detail="LLM analysis temporarily unavailable, please retry shortly")
+        except LLMError as e:
             logger.error(f"Groq API call failed: {e}")
             raise HTTPException(status_code=503, detail=f"LLM analysis failed: {str(e)}")
     
+    def completion_cache_key(self, prompt: str, model: str, max_tokens: int) -> Optional[str]:
+        """LLM cache key shared by call_groq_api and stream_groq_api"""
+        return llm_cache.make_key("groq", model, prompt, system=self.system_prompt,
+                                  params={"max_tokens": max_tokens, "temperature": 0.1, "top_p": 0.9})
+    
+    async def stream_groq_api(self, prompt: str, model: str = None, max_tokens: int = 2000,
+                              info: Optional[Dict[str, Any]] = None):
+        """Yield a Groq completion as text deltas while it is generated; a cached completion arrives as one delta"""
+        if not self.is_groq_available():
+            raise HTTPException(status_code=503, detail="Groq API not available. Please set GROQ_API_KEY environment variable.")
+        
+        if not model:
+            model = self.available_models[0]
+        info = info if info is not None else {}
+        
+        cache_key = self.completion_cache_key(prompt, model, max_tokens)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            info.update(model=model, finish_reason="stop", cached=True, time_to_first_token=0.0)
+            yield cached
+            return
+        
+        models = [model] + [fallback for fallback in self.available_models if fallback != model]
+        chunks = []
+        try:
+            async with self.llm_semaphore:
+                stream = llm_gateway.stream("groq", models, prompt, system=self.system_prompt,
+                                            max_tokens=max_tokens, temperature=0.1, top_p=0.9, info=info)
+                try:
+                    async for delta in stream:
+                        chunks.append(delta)
+                        yield delta
+                finally:
+                    # Closes the provider connection promptly if our consumer stopped early
+                    await stream.aclose()
+        except CircuitOpenError as e:
+            logger.error(f"Groq API unavailable: {e}")
+            raise HTTPException(status_code=503, detail="LLM analysis temporarily unavailable, please retry shortly")
+        except LLMError as e:
+            logger.error(f"Groq streaming call failed: {e}")
+            raise HTTPException(status_code=503, detail=f"LLM analysis failed: {str(e)}")
+        
+        if info.get("finish_reason") == "stop" and info.get("model") == model:
+            llm_cache.set(cache_key, "".join(chunks), "groq", model,
+                          info.get("prompt_tokens"), info.get("completion_tokens"))
+    
     def safe_word_tokenize(self, text: str) -> List[str]:
         """Safe word tokenization with fallback"""
         try:
@@ -209,11 +383,9 @@ class GroqATSAnalyzer:
         except Exception as e:
             raise HTTPException(status_code=400, detail=f"Error reading DOCX: {str(e)}")
     
-    async def llm_comprehensive_analysis(self, text: str, job_description: str = "", filename: str = "") -> Dict[str, Any]:
-        """Single comprehensive LLM analysis that evaluates all aspects of the resume"""
-        
-        # Create a comprehensive prompt that analyzes all aspects at once
-        prompt = f"""
+    def comprehensive_analysis_prompt(self, text: str, job_description: str = "", filename: str = "") -> str:
+        """Prompt for the single-pass scored analysis behind /analyze"""
+        return f"""
         You are an expert resume analyzer with deep knowledge of ATS systems, hiring practices, and recruitment standards. 
         Analyze this resume comprehensively across all important dimensions.
 
@@ -302,22 +474,19 @@ class GroqATSAnalyzer:
 
         Ensure your response is valid JSON and be specific, actionable, and insightful in your analysis.
         """
+    
+    async def llm_comprehensive_analysis(self, text: str, job_description: str = "", filename: str = "") -> Dict[str, Any]:
+        """Single comprehensive LLM analysis that evaluates all aspects of the resume"""
+        
+        # Create a comprehensive prompt that analyzes all aspects at once
+        prompt = self.comprehensive_analysis_prompt(text, job_description, filename)
         
         try:
             response = await self.call_groq_api(prompt, max_tokens=3000)
             
             # Try to parse the JSON response
             try:
-                # Extract JSON from response if it's wrapped in markdown or other text
-                json_match = re.search(r'\{.*\}', response, re.DOTALL)
-                if json_match:
-                    json_str = json_match.group()
-                    analysis_data = json.loads(json_str)
-                else:
-                    # If no JSON found, try parsing the entire response
-                    analysis_data = json.loads(response)
-                
-                return analysis_data
+                return self.parse_json_response(response)
                 
             except json.JSONDecodeError as e:
                 logger.error(f"Failed to parse LLM JSON response: {e}")
@@ -328,6 +497,308 @@ class GroqATSAnalyzer:
             logger.error(f"LLM comprehensive analysis failed: {e}")
             raise HTTPException(status_code=503, detail=f"Resume analysis failed: {str(e)}")
     
+    async def stream_comprehensive_analysis(self, text: str, job_description: str = "", filename: str = "",
+                                            info: Optional[Dict[str, Any]] = None):
+        """Streaming llm_comprehensive_analysis: yields (event, data) pairs while the JSON is generated.
+
+        "token" carries each raw text delta; "score" and "feedback" fire as soon as a
+        dimension's value closes in the JSON; "field" reports the other top-level fields
+        (overall_score, key_strengths, ...); "result" is the same body /analyze returns.
+        `info` collects timings (time_to_first_token, time_to_first_score) and LLM usage.
+        """
+        if len(text.strip()) < 50:
+            raise HTTPException(status_code=400, detail="Resume content appears to be too short or unreadable.")
+        
+        start_time = time.time()
+        info = info if info is not None else {}
+        prompt = self.comprehensive_analysis_prompt(text, job_description, filename)
+        parser = IncrementalJSONParser(max_depth=2)
+        chunks = []
+        
+        stream = self.stream_groq_api(prompt, max_tokens=3000, info=info)
+        try:
+            async for delta in stream:
+                if not chunks:
+                    # Measured from the request, so cache lookups and queueing for a slot count too
+                    info["time_to_first_token"] = time.time() - start_time
+                chunks.append(delta)
+                yield "token", {"text": delta}
+                for path, value in parser.feed(delta):
+                    elapsed = round(time.time() - start_time, 3)
+                    if len(path) == 2 and path[0] in ("scores", "feedback") and path[1] in ANALYSIS_DIMENSIONS:
+                        event = "score" if path[0] == "scores" else "feedback"
+                        if event == "score":
+                            info.setdefault("time_to_first_score", elapsed)
+                        yield event, {"dimension": path[1], "label": ANALYSIS_DIMENSIONS[path[1]],
+                                      event: value, "elapsed_seconds": elapsed}
+                    elif len(path) == 1 and path[0] not in ("scores", "feedback"):
+                        yield "field", {"field": path[0], "value": value, "elapsed_seconds": elapsed}
+        finally:
+            await stream.aclose()
+        
+        response = "".join(chunks)
+        try:
+            analysis_data = parser.result()
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse streamed LLM JSON response: {e}")
+            analysis_data = self._parse_fallback_analysis(response)
+        
+        yield "result", self.build_analysis_result(text, job_description, analysis_data, time.time() - start_time)
+    
+    def detailed_insights_prompt(self, text: str, job_description: str = "") -> str:
+        """Prompt for /detailed-insights (strategic career insights)"""
+        return f"""
+        You are a senior career strategist and resume expert. Provide deep, strategic insights about this resume that go beyond basic analysis.
+
+        RESUME TEXT:
+        {text[:4000]}
+
+        JOB DESCRIPTION (if provided):
+        {job_description[:2000] if job_description else "No specific job description provided"}
+
+        Provide comprehensive strategic insights covering:
+
+        1. **Career Positioning Analysis**
+           - Current professional brand and positioning
+           - Career trajectory and progression story
+           - Unique value proposition assessment
+           - Market positioning strengths and gaps
+
+        2. **Competitive Differentiation**
+           - What makes this candidate stand out
+           - Potential red flags or concerns for employers
+           - Missing elements that competitors might have
+           - Strategic advantages and leverage points
+
+        3. **Industry & Role Fit Assessment**
+           - Best-fit industries and role types
+           - Career pivot opportunities
+           - Skills transferability analysis
+           - Growth potential indicators
+
+        4. **Strategic Improvement Roadmap**
+           - High-impact changes for immediate improvement
+           - Long-term career development recommendations
+           - Skills gap analysis and development priorities
+           - Personal branding enhancement strategies
+
+        5. **Hiring Manager Perspective**
+           - First impression and initial assessment
+           - Questions or concerns that might arise
+           - Interview preparation recommendations
+           - Salary negotiation position assessment
+
+        Format your response as detailed, strategic insights with specific examples and actionable recommendations.
+        """
+    
+    def optimization_suggestions_prompt(self, text: str, job_description: str = "") -> str:
+        """Prompt for /optimization-suggestions (specific rewrites and keyword fixes)"""
+        return f"""
+        You are an expert resume optimization specialist. Analyze this resume and provide specific, actionable optimization suggestions.
+
+        RESUME TEXT:
+        {text[:4000]}
+
+        JOB DESCRIPTION (if provided):
+        {job_description[:2000] if job_description else "No specific job description provided"}
+
+        Provide specific optimization recommendations in these areas:
+
+        1. **Content Optimization**
+           - Specific phrases to replace with stronger alternatives
+           - Missing quantifiable achievements to add
+           - Weak statements that need strengthening
+           - Action verbs that should be upgraded
+
+        2. **Keyword Enhancement**
+           - Critical missing keywords for the target role/industry
+           - Keyword placement optimization suggestions
+           - Industry-specific terminology to incorporate
+           - ATS-friendly keyword integration strategies
+
+        3. **Structure & Format Improvements**
+           - Section reordering recommendations
+           - Information to add, remove, or relocate
+           - Formatting adjustments for better readability
+           - Length optimization suggestions
+
+        4. **Impact Statement Upgrades**
+           - Current statements that lack impact
+           - Suggested rewrites with stronger impact
+           - Missing context or results to add
+           - Better ways to showcase achievements
+
+        5. **Personalization Strategies**
+           - How to better align with specific job descriptions
+           - Industry-specific customization recommendations
+           - Role-specific emphasis adjustments
+           - Company culture alignment suggestions
+
+        Provide specific before/after examples where possible and prioritize suggestions by potential impact.
+        """
+    
+    def ats_deep_dive_prompt(self, text: str, job_description: str = "") -> str:
+        """Prompt for /ats-deep-dive (parsing, ranking and filtering behaviour)"""
+        return f"""
+        You are an ATS (Applicant Tracking System) expert with deep knowledge of how different ATS platforms parse, rank, and filter resumes.
+
+        RESUME TEXT:
+        {text[:4000]}
+
+        JOB DESCRIPTION (if provided):
+        {job_description[:2000] if job_description else "No specific job description provided"}
+
+        Provide a comprehensive ATS analysis covering:
+
+        1. **Parsing & Readability Assessment**
+           - How well ATS systems can extract information
+           - Potential parsing issues or challenges
+           - Text extraction quality assessment
+           - Format compatibility across different ATS platforms
+
+        2. **Keyword Matching Analysis**
+           - Keyword density and relevance assessment
+           - Critical missing keywords that ATS systems prioritize
+           - Keyword placement optimization for ATS ranking
+           - Synonym and variation coverage analysis
+
+        3. **Section Recognition & Structure**
+           - How well ATS systems will identify resume sections
+           - Standard vs. non-standard section headers
+           - Information categorization accuracy
+           - Contact information extractability
+
+        4. **Ranking & Filtering Predictions**
+           - Likely ATS ranking score predictions
+           - Common filtering criteria this resume would pass/fail
+           - Competitive positioning against other applicants
+           - Probability of passing initial ATS screening
+
+        5. **ATS Optimization Roadmap**
+           - Specific changes to improve ATS performance
+           - Technical formatting adjustments needed
+           - Content restructuring for better ATS recognition
+           - Priority fixes ranked by impact
+
+        Provide specific, technical recommendations based on actual ATS system behaviors and requirements.
+        """
+    
+    def merged_report_prompt(self, text: str, job_description: str = "", filename: str = "") -> str:
+        """One structured-output prompt for every /full-report section, sending the resume and JD once"""
+        return f"""
+        You are an expert resume analyzer, senior career strategist, resume optimization specialist and
+        ATS (Applicant Tracking System) expert. Produce a complete report for this resume in one response.
+
+        RESUME TEXT:
+        {text[:4000]}
+
+        JOB DESCRIPTION (if provided):
+        {job_description[:2000] if job_description else "No specific job description provided"}
+
+        FILENAME: {filename}
+
+        The report has four parts:
+
+        1. "analysis": score the resume 0-100 on ATS compatibility & technical format, content quality &
+           professional impact, keyword optimization & job alignment, structure/organization/completeness,
+           and language quality. Give 2-3 specific feedback points per dimension, key strengths, 3-5
+           high-impact improvements, industry observations and a competitive assessment.
+
+        2. "detailed_insights": strategic career insights - career positioning, competitive differentiation,
+           industry & role fit, a strategic improvement roadmap and the hiring manager's perspective.
+
+        3. "optimization_suggestions": specific optimizations - content rewrites (with before/after examples),
+           missing keywords and their placement, structure & format changes, impact statement upgrades and
+           personalization for the target role, prioritized by impact.
+
+        4. "ats_deep_dive": ATS analysis - parsing & readability, keyword matching, section recognition,
+           ranking & filtering predictions and an ATS optimization roadmap with priority fixes.
+
+        **IMPORTANT FORMATTING REQUIREMENTS:**
+        Your response must be valid JSON with exactly this structure:
+
+        {{
+            "analysis": {{
+                "scores": {{
+                    "ats_compatibility": [0-100 score],
+                    "content_quality": [0-100 score],
+                    "keyword_optimization": [0-100 score],
+                    "structure_organization": [0-100 score],
+                    "language_quality": [0-100 score]
+                }},
+                "feedback": {{
+                    "ats_compatibility": ["feedback point 1", "feedback point 2"],
+                    "content_quality": ["feedback point 1", "feedback point 2"],
+                    "keyword_optimization": ["feedback point 1", "feedback point 2"],
+                    "structure_organization": ["feedback point 1", "feedback point 2"],
+                    "language_quality": ["feedback point 1", "feedback point 2"]
+                }},
+                "overall_score": [0-100 weighted average],
+                "overall_assessment": "Brief 2-3 sentence summary",
+                "key_strengths": ["strength 1", "strength 2", "strength 3"],
+                "priority_improvements": ["improvement 1", "improvement 2", "improvement 3"],
+                "industry_insights": "Industry-specific observations and recommendations",
+                "competitive_position": "Assessment against market standards"
+            }},
+            "detailed_insights": "Markdown text covering all five insight areas",
+            "optimization_suggestions": "Markdown text covering all five optimization areas",
+            "ats_deep_dive": "Markdown text covering all five ATS areas"
+        }}
+        """
+    
+    async def generate_insight_section(self, section: str, text: str, job_description: str = "") -> Dict[str, Any]:
+        """One long-form insight section, shaped like its standalone endpoint's response"""
+        prompt_builder, _ = self.insight_sections[section]
+        content = await self.call_groq_api(prompt_builder(text, job_description), max_tokens=2500)
+        return self.insight_section_payload(section, content)
+    
+    def insight_section_payload(self, section: str, content: str) -> Dict[str, Any]:
+        _, analysis_type = self.insight_sections[section]
+        return {
+            section: content,
+            "analysis_type": analysis_type,
+            "provider": "Groq API",
+            "model_used": self.available_models[0],
+            "timestamp": datetime.now().isoformat()
+        }
+    
+    async def merged_report_sections(self, text: str, job_description: str = "", filename: str = "") -> Dict[str, Dict[str, Any]]:
+        """All /full-report sections from one LLM call; sections missing from the response are left out"""
+        start_time = time.time()
+        response = await self.call_groq_api(
+            self.merged_report_prompt(text, job_description, filename),
+            max_tokens=self.merged_report_max_tokens
+        )
+        analysis_time = time.time() - start_time
+        
+        try:
+            data = self.parse_json_response(response)
+        except json.JSONDecodeError as e:
+            logger.error(f"Failed to parse merged report JSON: {e}")
+            return {}
+        
+        sections = {}
+        analysis_data = data.get("analysis")
+        if isinstance(analysis_data, dict) and analysis_data.get("scores"):
+            sections["analysis"] = self.build_analysis_result(text, job_description, analysis_data, analysis_time)
+        for section in self.insight_sections:
+            content = data.get(section)
+            if isinstance(content, (dict, list)):
+                content = json.dumps(content, indent=2)
+            if isinstance(content, str) and content.strip():
+                sections[section] = self.insight_section_payload(section, content)
+        return sections
+    
+    @staticmethod
+    def parse_json_response(response: str) -> Dict[str, Any]:
+        """JSON object from an LLM response, tolerating markdown fences or surrounding text"""
+        # Extract JSON from response if it's wrapped in markdown or other text
+        json_match = re.search(r'\{.*\}', response, re.DOTALL)
+        if json_match:
+            return json.loads(json_match.group())
+        # If no JSON found, try parsing the entire response
+        return json.loads(response)
+    
     def _parse_fallback_analysis(self, response: str) -> Dict[str, Any]:
         """Fallback parser when JSON parsing fails"""
         try:
@@ -422,7 +893,11 @@ class GroqATSAnalyzer:
         analysis_data = await self.llm_comprehensive_analysis(text, job_description, filename)
         
         analysis_time = time.time() - start_time
-        
+        return self.build_analysis_result(text, job_description, analysis_data, analysis_time)
+    
+    def build_analysis_result(self, text: str, job_description: str, analysis_data: Dict[str, Any],
+                              analysis_time: float) -> Dict[str, Any]:
+        """Shape the LLM's scored analysis into the /analyze response"""
         # Extract scores and feedback
         scores = analysis_data.get("scores", {})
         feedback = analysis_data.get("feedback", {})
@@ -517,18 +992,178 @@ class GroqATSAnalyzer:
             }
         }
     
-    async def analyze_resume_file(self, file_content: bytes, filename: str, job_description: str = "") -> Dict[str, Any]:
+    def extract_resume_text(self, file_content: bytes, filename: str) -> Dict[str, Any]:
+        """Extraction stage (CPU-bound); errors are returned instead of raised so they can cross process boundaries"""
+        try:
+            if filename.lower().endswith('.pdf'):
+                return {'text': self.extract_text_from_pdf(file_content)}
+            elif filename.lower().endswith('.docx'):
+                return {'text': self.extract_text_from_docx(file_content)}
+        except HTTPException as e:
+            return {'error': e.detail, 'status_code': e.status_code}
+        return {'error': "Unsupported file format. Please use PDF or DOCX.", 'status_code': 400}
+
+    async def extract_text(self, file_content: bytes, filename: str, cpu_executor: Optional[Executor] = None) -> str:
+        """Extract text based on file type, on the process pool when one is given"""
+        if cpu_executor is None:
+            extracted = self.extract_resume_text(file_content, filename)
+        else:
+            loop = asyncio.get_event_loop()
+            try:
+                extracted = await loop.run_in_executor(cpu_executor, run_extraction_worker, file_content, filename)
+            except BrokenExecutor as e:
+                logger.error(f"CPU executor unavailable for extraction, running inline: {e}")
+                extracted = self.extract_resume_text(file_content, filename)
+
+        if 'error' in extracted:
+            raise HTTPException(status_code=extracted['status_code'], detail=extracted['error'])
+        return extracted['text']
+
+    async def analyze_resume_file(self, file_content: bytes, filename: str, job_description: str = "",
+                                  cpu_executor: Optional[Executor] = None) -> Dict[str, Any]:
         """Analyze resume from file upload"""
         
-        # Extract text based on file type
-        if filename.lower().endswith('.pdf'):
-            text = self.extract_text_from_pdf(file_content)
-        elif filename.lower().endswith('.docx'):
-            text = self.extract_text_from_docx(file_content)
-        else:
-            raise HTTPException(status_code=400, detail="Unsupported file format. Please use PDF or DOCX.")
+        stage_start = time.time()
+        text = await self.extract_text(file_content, filename, cpu_executor)
+        extract_time = time.time() - stage_start
         
-        return await self.analyze_resume_comprehensive(text, job_description, filename)
+        result = await self.analyze_resume_comprehensive(text, job_description, filename)
+        result["metrics"]["stage_timings"] = {
+            "extract": round(extract_time, 3),
+            "llm": result["metrics"]["analysis_time_seconds"]
+        }
+        return result
+
+def run_extraction_worker(file_content: bytes, filename: str) -> Dict[str, Any]:
+    """Process pool entry point for text extraction"""
+    return analyzer.extract_resume_text(file_content, filename)
+
+# Process pool for text extraction (created on first use)
+cpu_executor: Optional[Executor] = None
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "4"))
+BATCH_FILE_TIMEOUT_SECONDS = float(os.getenv("BATCH_FILE_TIMEOUT_SECONDS", "180"))
+
+def get_cpu_executor() -> Executor:
+    """Return the shared process pool, creating it if needed"""
+    global cpu_executor
+    if cpu_executor is None:
+        workers = int(os.getenv("ANALYSIS_CPU_WORKERS", str(os.cpu_count() or 2)))
+        cpu_executor = ProcessPoolExecutor(max_workers=workers)
+        logger.info(f"CPU process pool started with {workers} workers")
+    return cpu_executor
+
+async def run_batch_analysis(files: List[tuple], job_description: str = "") -> List[Dict[str, Any]]:
+    """Analyze (filename, file_content) pairs concurrently; results keep upload order.
+
+    At most BATCH_MAX_CONCURRENCY files are in flight. Extraction runs on the
+    process pool while LLM calls overlap on the event loop, and each file has its
+    own timeout so one slow resume cannot stall the batch.
+    """
+    semaphore = asyncio.Semaphore(BATCH_MAX_CONCURRENCY)
+    executor = get_cpu_executor()
+
+    async def analyze_one(index: int, filename: str, file_content: bytes) -> Dict[str, Any]:
+        async with semaphore:
+            try:
+                result = await asyncio.wait_for(
+                    analyzer.analyze_resume_file(file_content, filename, job_description, cpu_executor=executor),
+                    timeout=BATCH_FILE_TIMEOUT_SECONDS
+                )
+            except HTTPException as e:
+                result = {"error": e.detail, "overall_score": 0}
+            except asyncio.TimeoutError:
+                result = {"error": f"Analysis timed out after {BATCH_FILE_TIMEOUT_SECONDS:.0f}s", "overall_score": 0}
+            except Exception as e:
+                result = {"error": str(e), "overall_score": 0}
+
+        result["filename"] = filename
+        result["batch_index"] = index
+        return result
+
+    return list(await asyncio.gather(*(
+        analyze_one(index, filename, file_content)
+        for index, (filename, file_content) in enumerate(files)
+    )))
+
+REPORT_SECTIONS = ("analysis", "detailed_insights", "optimization_suggestions", "ats_deep_dive")
+FULL_REPORT_MODES = ("parallel", "merged")
+
+async def report_section(section: str, text: str, job_description: str, filename: str) -> Dict[str, Any]:
+    """One /full-report section; failures come back as {"error": ...} so the other sections still arrive"""
+    try:
+        if section == "analysis":
+            return await analyzer.analyze_resume_comprehensive(text, job_description, filename)
+        return await analyzer.generate_insight_section(section, text, job_description)
+    except HTTPException as e:
+        return {"error": e.detail}
+    except Exception as e:
+        logger.error(f"Report section {section} failed: {e}")
+        return {"error": str(e)}
+
+def section_prompt_chars(section: str, text: str, job_description: str, filename: str) -> int:
+    if section == "analysis":
+        return len(analyzer.comprehensive_analysis_prompt(text, job_description, filename))
+    prompt_builder, _ = analyzer.insight_sections[section]
+    return len(prompt_builder(text, job_description))
+
+async def iter_full_report(text: str, job_description: str = "", filename: str = "", mode: str = "parallel",
+                           usage: Optional[Dict[str, int]] = None):
+    """Yield (section, result) pairs as each /full-report section completes.
+
+    parallel: the four prompts run concurrently over the same extracted text.
+    merged: one structured-output prompt carries the resume and JD once; any section
+    missing from the merged response is then generated on its own, so the report is
+    always complete. `usage` accumulates LLM calls and prompt characters sent.
+    """
+    usage = usage if usage is not None else {}
+    usage.setdefault("llm_calls", 0)
+    usage.setdefault("prompt_chars", 0)
+    remaining = list(REPORT_SECTIONS)
+
+    if mode == "merged":
+        usage["llm_calls"] += 1
+        usage["prompt_chars"] += len(analyzer.merged_report_prompt(text, job_description, filename))
+        try:
+            merged = await analyzer.merged_report_sections(text, job_description, filename)
+        except HTTPException as e:
+            logger.warning(f"Merged report call failed: {e.detail}")
+            merged = {}
+        for section in REPORT_SECTIONS:
+            if section in merged:
+                remaining.remove(section)
+                yield section, merged[section]
+        if remaining:
+            logger.warning(f"Merged report missing {', '.join(remaining)}; generating separately")
+
+    tasks = {}
+    for section in remaining:
+        usage["llm_calls"] += 1
+        usage["prompt_chars"] += section_prompt_chars(section, text, job_description, filename)
+        tasks[asyncio.ensure_future(report_section(section, text, job_description, filename))] = section
+
+    try:
+        pending = set(tasks)
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in sorted(done, key=lambda t: REPORT_SECTIONS.index(tasks[t])):
+                yield tasks[task], task.result()
+    finally:
+        # Client went away mid-stream: don't leave LLM calls running
+        for task in tasks:
+            if not task.done():
+                task.cancel()
+
+def format_stream_frame(event: str, data: Dict[str, Any], stream_format: str = "ndjson") -> str:
+    """Encode one streaming frame as an NDJSON line or a Server-Sent Event"""
+    payload = json.dumps(jsonable_encoder(data))
+    if stream_format == "sse":
+        return f"event: {event}\ndata: {payload}\n\n"
+    return f'{{"type": "{event}", "data": {payload}}}\n'
+
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
 
 # Initialize analyzer
 analyzer = GroqATSAnalyzer()
@@ -569,6 +1204,8 @@ async def root():
             "/health": "GET - System health check",
             "/batch-analyze": "POST - Analyze multiple files",
             "/compare": "POST - Compare two resumes using LLM",
+            "/full-report": "POST - Analysis, insights, optimizations and ATS deep dive in one request (parallel or merged, optionally streamed)",
+            "/analyze-stream": "POST - /analyze streamed while the LLM generates: tokens, then each dimension's score and feedback as it completes",
             "/model-status": "GET - Check LLM model availability"
         },
         "setup_required": "Set GROQ_API_KEY environment variable" if not analyzer.is_groq_available() else "Ready for pure LLM analysis"
@@ -588,6 +1225,8 @@ async def health_check():
         "api_key_configured": analyzer.groq_api_key is not None,
         "version": "8.0.0",
         "analysis_method": "No hardcoded assumptions, pure LLM evaluation",
+        "llm_cache": llm_cache.get_stats(),
+        "llm_gateway": llm_gateway.get_stats(),
         "timestamp": datetime.now().isoformat()
     }
 
@@ -649,29 +1288,22 @@ async def batch_analyze_resumes(
         if not analyzer.is_groq_available():
             raise HTTPException(status_code=503, detail="Groq API not available. Please set GROQ_API_KEY environment variable.")
         
-        results = []
+        batch_start = time.time()
+        files = []
         for resume in resumes:
             if not resume.filename:
                 continue
-                
-            try:
-                file_content = await resume.read()
-                result = await analyzer.analyze_resume_file(file_content, resume.filename, job_description)
-                result["filename"] = resume.filename
-                results.append(result)
-            except Exception as e:
-                results.append({
-                    "filename": resume.filename,
-                    "error": str(e),
-                    "overall_score": 0
-                })
+            files.append((resume.filename, await resume.read()))
+
+        results = await run_batch_analysis(files, job_description)
         
-        # Sort by overall score (highest first)
+        # Sort by overall score (highest first); ties keep upload order
         results.sort(key=lambda x: x.get("overall_score", 0), reverse=True)
         
         return {
             "batch_results": results,
             "total_analyzed": len(results),
+            "batch_time_seconds": round(time.time() - batch_start, 2),
             "analysis_method": f"Pure LLM Analysis ({analyzer.available_models[0]})",
             "analysis_timestamp": datetime.now().isoformat()
         }
@@ -742,60 +1374,7 @@ async def get_detailed_insights(request: TextAnalysisRequest):
         if not analyzer.is_groq_available():
             raise HTTPException(status_code=503, detail="Groq API not available.")
         
-        # Create a specialized prompt for deep insights
-        prompt = f"""
-        You are a senior career strategist and resume expert. Provide deep, strategic insights about this resume that go beyond basic analysis.
-
-        RESUME TEXT:
-        {request.resume_text[:4000]}
-
-        JOB DESCRIPTION (if provided):
-        {request.job_description[:2000] if request.job_description else "No specific job description provided"}
-
-        Provide comprehensive strategic insights covering:
-
-        1. **Career Positioning Analysis**
-           - Current professional brand and positioning
-           - Career trajectory and progression story
-           - Unique value proposition assessment
-           - Market positioning strengths and gaps
-
-        2. **Competitive Differentiation**
-           - What makes this candidate stand out
-           - Potential red flags or concerns for employers
-           - Missing elements that competitors might have
-           - Strategic advantages and leverage points
-
-        3. **Industry & Role Fit Assessment**
-           - Best-fit industries and role types
-           - Career pivot opportunities
-           - Skills transferability analysis
-           - Growth potential indicators
-
-        4. **Strategic Improvement Roadmap**
-           - High-impact changes for immediate improvement
-           - Long-term career development recommendations
-           - Skills gap analysis and development priorities
-           - Personal branding enhancement strategies
-
-        5. **Hiring Manager Perspective**
-           - First impression and initial assessment
-           - Questions or concerns that might arise
-           - Interview preparation recommendations
-           - Salary negotiation position assessment
-
-        Format your response as detailed, strategic insights with specific examples and actionable recommendations.
-        """
-        
-        insights = await analyzer.call_groq_api(prompt, max_tokens=2500)
-        
-        return {
-            "detailed_insights": insights,
-            "analysis_type": "Strategic Career Insights",
-            "provider": "Groq API",
-            "model_used": analyzer.available_models[0],
-            "timestamp": datetime.now().isoformat()
-        }
+        return await analyzer.generate_insight_section("detailed_insights", request.resume_text, request.job_description)
     
     except HTTPException:
         raise
@@ -810,59 +1389,7 @@ async def get_optimization_suggestions(request: TextAnalysisRequest):
         if not analyzer.is_groq_available():
             raise HTTPException(status_code=503, detail="Groq API not available.")
         
-        prompt = f"""
-        You are an expert resume optimization specialist. Analyze this resume and provide specific, actionable optimization suggestions.
-
-        RESUME TEXT:
-        {request.resume_text[:4000]}
-
-        JOB DESCRIPTION (if provided):
-        {request.job_description[:2000] if request.job_description else "No specific job description provided"}
-
-        Provide specific optimization recommendations in these areas:
-
-        1. **Content Optimization**
-           - Specific phrases to replace with stronger alternatives
-           - Missing quantifiable achievements to add
-           - Weak statements that need strengthening
-           - Action verbs that should be upgraded
-
-        2. **Keyword Enhancement**
-           - Critical missing keywords for the target role/industry
-           - Keyword placement optimization suggestions
-           - Industry-specific terminology to incorporate
-           - ATS-friendly keyword integration strategies
-
-        3. **Structure & Format Improvements**
-           - Section reordering recommendations
-           - Information to add, remove, or relocate
-           - Formatting adjustments for better readability
-           - Length optimization suggestions
-
-        4. **Impact Statement Upgrades**
-           - Current statements that lack impact
-           - Suggested rewrites with stronger impact
-           - Missing context or results to add
-           - Better ways to showcase achievements
-
-        5. **Personalization Strategies**
-           - How to better align with specific job descriptions
-           - Industry-specific customization recommendations
-           - Role-specific emphasis adjustments
-           - Company culture alignment suggestions
-
-        Provide specific before/after examples where possible and prioritize suggestions by potential impact.
-        """
-        
-        suggestions = await analyzer.call_groq_api(prompt, max_tokens=2500)
-        
-        return {
-            "optimization_suggestions": suggestions,
-            "analysis_type": "Resume Optimization Recommendations",
-            "provider": "Groq API",
-            "model_used": analyzer.available_models[0],
-            "timestamp": datetime.now().isoformat()
-        }
+        return await analyzer.generate_insight_section("optimization_suggestions", request.resume_text, request.job_description)
     
     except HTTPException:
         raise
@@ -877,65 +1404,148 @@ async def ats_deep_dive_analysis(request: TextAnalysisRequest):
         if not analyzer.is_groq_available():
             raise HTTPException(status_code=503, detail="Groq API not available.")
         
-        prompt = f"""
-        You are an ATS (Applicant Tracking System) expert with deep knowledge of how different ATS platforms parse, rank, and filter resumes.
+        return await analyzer.generate_insight_section("ats_deep_dive", request.resume_text, request.job_description)
+    
+    except HTTPException:
+        raise
+    except Exception as e:
+        logger.error(f"ATS deep dive failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"ATS analysis failed: {str(e)}")
 
-        RESUME TEXT:
-        {request.resume_text[:4000]}
+@app.post("/full-report")
+async def full_report(
+    resume: Optional[UploadFile] = File(None),
+    resume_text: str = Form(""),
+    job_description: str = Form(""),
+    mode: str = Form("parallel"),
+    stream: bool = Form(False),
+    stream_format: str = Form("ndjson")
+):
+    """Everything the report page needs for one resume in a single request.
 
-        JOB DESCRIPTION (if provided):
-        {request.job_description[:2000] if request.job_description else "No specific job description provided"}
+    Combines /analyze, /detailed-insights, /optimization-suggestions and
+    /ats-deep-dive over one uploaded (or pasted) resume that is extracted once.
+    mode=parallel runs the four prompts concurrently; mode=merged sends the resume
+    and JD once in a single structured-output prompt (roughly a quarter of the
+    input tokens). With stream=true each section is sent as soon as it completes
+    (NDJSON lines or Server-Sent Events), followed by a `summary` frame.
+    """
+    if not analyzer.is_groq_available():
+        raise HTTPException(status_code=503, detail="Groq API not available.")
+    if mode not in FULL_REPORT_MODES:
+        raise HTTPException(status_code=400, detail=f"mode must be one of: {', '.join(FULL_REPORT_MODES)}")
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"stream_format must be one of: {', '.join(STREAM_MEDIA_TYPES)}")
 
-        Provide a comprehensive ATS analysis covering:
+    if resume is not None and resume.filename:
+        filename = resume.filename
+        text = await analyzer.extract_text(await resume.read(), filename, cpu_executor=get_cpu_executor())
+    else:
+        filename = "text_input.txt"
+        text = resume_text
+    if len(text.strip()) < 50:
+        raise HTTPException(status_code=400, detail="Resume content appears to be too short or unreadable.")
 
-        1. **Parsing & Readability Assessment**
-           - How well ATS systems can extract information
-           - Potential parsing issues or challenges
-           - Text extraction quality assessment
-           - Format compatibility across different ATS platforms
+    report_start = time.time()
+    usage = {"llm_calls": 0, "prompt_chars": 0}
+    section_timings = {}
 
-        2. **Keyword Matching Analysis**
-           - Keyword density and relevance assessment
-           - Critical missing keywords that ATS systems prioritize
-           - Keyword placement optimization for ATS ranking
-           - Synonym and variation coverage analysis
+    def summary() -> Dict[str, Any]:
+        return {
+            "mode": mode,
+            "filename": filename,
+            "llm_calls": usage["llm_calls"],
+            "prompt_chars": usage["prompt_chars"],
+            "section_timings": section_timings,
+            "report_time_seconds": round(time.time() - report_start, 2),
+            "model_used": analyzer.available_models[0],
+            "timestamp": datetime.now().isoformat()
+        }
 
-        3. **Section Recognition & Structure**
-           - How well ATS systems will identify resume sections
-           - Standard vs. non-standard section headers
-           - Information categorization accuracy
-           - Contact information extractability
+    if not stream:
+        sections = {}
+        async for section, result in iter_full_report(text, job_description, filename, mode, usage):
+            section_timings[section] = round(time.time() - report_start, 2)
+            sections[section] = result
+        return {"sections": {section: sections[section] for section in REPORT_SECTIONS}, **summary()}
 
-        4. **Ranking & Filtering Predictions**
-           - Likely ATS ranking score predictions
-           - Common filtering criteria this resume would pass/fail
-           - Competitive positioning against other applicants
-           - Probability of passing initial ATS screening
+    async def stream_sections():
+        async for section, result in iter_full_report(text, job_description, filename, mode, usage):
+            section_timings[section] = round(time.time() - report_start, 2)
+            yield format_stream_frame("section", {
+                "section": section,
+                "elapsed_seconds": section_timings[section],
+                "result": result
+            }, stream_format)
+        yield format_stream_frame("summary", summary(), stream_format)
 
-        5. **ATS Optimization Roadmap**
-           - Specific changes to improve ATS performance
-           - Technical formatting adjustments needed
-           - Content restructuring for better ATS recognition
-           - Priority fixes ranked by impact
+    return StreamingResponse(
+        stream_sections(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
-        Provide specific, technical recommendations based on actual ATS system behaviors and requirements.
-        """
-        
-        ats_analysis = await analyzer.call_groq_api(prompt, max_tokens=2500)
-        
-        return {
-            "ats_deep_dive": ats_analysis,
-            "analysis_type": "Comprehensive ATS Analysis",
-            "provider": "Groq API",
-            "model_used": analyzer.available_models[0],
+@app.post("/analyze-stream")
+async def analyze_resume_stream(
+    resume: Optional[UploadFile] = File(None),
+    resume_text: str = Form(""),
+    job_description: str = Form(""),
+    stream_format: str = Form("sse"),
+    include_tokens: bool = Form(True)
+):
+    """/analyze with the LLM output streamed as it is generated.
+
+    Frames (Server-Sent Events by default, or NDJSON): `token` for each text delta
+    (unless include_tokens=false), `score` and `feedback` per dimension as soon as its
+    value closes in the JSON, `field` for the other top-level fields, `result` with the
+    full /analyze body, then `summary` with time-to-first-token/score. Failures after
+    the stream has started arrive as an `error` frame.
+    """
+    if not analyzer.is_groq_available():
+        raise HTTPException(status_code=503, detail="Groq API not available.")
+    if stream_format not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"stream_format must be one of: {', '.join(STREAM_MEDIA_TYPES)}")
+
+    if resume is not None and resume.filename:
+        filename = resume.filename
+        text = await analyzer.extract_text(await resume.read(), filename, cpu_executor=get_cpu_executor())
+    else:
+        filename = "text_input.txt"
+        text = resume_text
+    if len(text.strip()) < 50:
+        raise HTTPException(status_code=400, detail="Resume content appears to be too short or unreadable.")
+
+    async def stream_analysis():
+        stream_start = time.time()
+        info = {}
+        try:
+            async for event, data in analyzer.stream_comprehensive_analysis(text, job_description, filename, info):
+                if event == "token" and not include_tokens:
+                    continue
+                yield format_stream_frame(event, data, stream_format)
+        except HTTPException as e:
+            yield format_stream_frame("error", {"status_code": e.status_code, "detail": e.detail}, stream_format)
+            return
+        except Exception as e:
+            logger.error(f"Streamed analysis failed: {e}")
+            yield format_stream_frame("error", {"status_code": 500, "detail": f"Analysis failed: {str(e)}"}, stream_format)
+            return
+        yield format_stream_frame("summary", {
+            "filename": filename,
+            "model_used": info.get("model", analyzer.available_models[0]),
+            "cached": info.get("cached", False),
+            "time_to_first_token_seconds": round(info["time_to_first_token"], 3) if "time_to_first_token" in info else None,
+            "time_to_first_score_seconds": info.get("time_to_first_score"),
+            "total_seconds": round(time.time() - stream_start, 3),
+            "completion_tokens": info.get("completion_tokens"),
             "timestamp": datetime.now().isoformat()
-        }
-    
-    except HTTPException:
-        raise
-    except Exception as e:
-        logger.error(f"ATS deep dive failed: {str(e)}")
-        raise HTTPException(status_code=500, detail=f"ATS analysis failed: {str(e)}")
+        }, stream_format)
+
+    return StreamingResponse(
+        stream_analysis(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @app.get("/model-status")
 async def get_model_status():
@@ -1046,6 +1656,15 @@ async def startup_event():
     else:
         logger.warning("⚠️ Groq API not configured. Set GROQ_API_KEY environment variable.")
 
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the extraction process pool and close the pooled LLM connections"""
+    global cpu_executor
+    if cpu_executor is not None:
+        cpu_executor.shutdown(wait=False, cancel_futures=True)
+        cpu_executor = None
+    await llm_gateway.aclose()
+
 if __name__ == "__main__":
     import uvicorn
     
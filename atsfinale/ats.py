@@ -22,6 +22,13 @@ import logging
 from sklearn.feature_extraction.text import TfidfVectorizer
 from sklearn.metrics.pairwise import cosine_similarity
 import numpy as np
+import os
+import sys
+
+# Shared modules (llm_cache, llm_gateway) live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from llm_cache import LLMCache
+from llm_gateway import LLMError, LLMGateway
 
 # Download required NLTK data
 def download_nltk_data():
@@ -46,6 +53,10 @@ download_nltk_data()
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+llm_cache = LLMCache.from_env()
+# Pooled Ollama calls with retries, circuit breaking and model fallback
+llm_gateway = LLMGateway.from_env()
+
 app = FastAPI(
     title="Advanced ATS Resume Analyzer",
     description="AI-powered resume analysis with comprehensive scoring",
@@ -78,10 +89,13 @@ class AnalysisResponse(BaseModel):
     metrics: Dict[str, Any]
 
 class AdvancedATSAnalyzer:
-    def __init__(self, ollama_url="http://localhost:11434"):
-        self.ollama_url = ollama_url
+    def __init__(self, ollama_url=None):
+        self.ollama_url = ollama_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.preferred_models = ["qwen2.5:3b", "llama3.2:3b", "phi3:mini"]
         self.model_name = None
+        # Other installed preferred models, tried in order when model_name fails
+        self.fallback_models: List[str] = []
+        llm_gateway.configure("ollama", base_url=self.ollama_url)
         
         # Load spaCy model
         try:
@@ -170,12 +184,13 @@ class AdvancedATSAnalyzer:
         available_models = self.get_available_models()
         logger.info(f"Available models: {available_models}")
         
-        for preferred_model in self.preferred_models:
-            for available_model in available_models:
-                if preferred_model in available_model:
-                    self.model_name = available_model
-                    logger.info(f"Selected model: {self.model_name}")
-                    return
+        matching_models = [available_model for preferred_model in self.preferred_models
+                           for available_model in available_models if preferred_model in available_model]
+        if matching_models:
+            self.model_name = matching_models[0]
+            self.fallback_models = [model for model in dict.fromkeys(matching_models[1:]) if model != self.model_name]
+            logger.info(f"Selected model: {self.model_name}")
+            return
         
         if available_models:
             self.model_name = available_models[0]
@@ -188,37 +203,29 @@ class AdvancedATSAnalyzer:
         if not self.model_name:
             return "Error: No model available"
         
+        options = {
+            "temperature": 0.1,
+            "top_p": 0.9,
+            "num_predict": max_tokens,
+            "num_ctx": 2048,
+            "num_gpu": 1,
+            "num_thread": 4,
+        }
+        cache_key = llm_cache.make_key("ollama", self.model_name, prompt, params=options)
+        cached = llm_cache.get(cache_key)
+        if cached is not None:
+            return cached
+        
         try:
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: requests.post(
-                    f"{self.ollama_url}/api/generate",
-                    json={
-                        "model": self.model_name,
-                        "prompt": prompt,
-                        "stream": False,
-                        "options": {
-                            "temperature": 0.1,
-                            "top_p": 0.9,
-                            "num_predict": max_tokens,
-                            "num_ctx": 2048,
-                            "num_gpu": 1,
-                            "num_thread": 4,
-                        }
-                    },
-                    timeout=120
-                )
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "Error: Empty response")
-            else:
-                return f"Error: HTTP {response.status_code}"
-                
-        except Exception as e:
+            response = await llm_gateway.complete("ollama", [self.model_name] + self.fallback_models, prompt,
+                                                  options=options, timeout=120)
+        except LLMError as e:
             return f"Error: {str(e)}"
+        
+        if response.text and response.finish_reason == "stop" and response.model == self.model_name:
+            llm_cache.set(cache_key, response.text, "ollama", self.model_name,
+                          response.prompt_tokens, response.completion_tokens)
+        return response.text or "Error: Empty response"
     
     def safe_word_tokenize(self, text: str) -> List[str]:
         """Safe word tokenization with fallback"""
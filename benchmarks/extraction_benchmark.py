@@ -0,0 +1,570 @@
+"""
+Benchmark resume text/URL extraction across the PDF/DOCX backends in this repo.
+
+Usage:
+    python benchmarks/extraction_benchmark.py [--documents 60] [--repeat 3]
+        [--corpus DIR] [--backends ats3,ats_groq,ats_script,atsbackend]
+        [--output extraction_benchmark.json] [--baseline previous.json]
+
+A synthetic corpus of resumes is generated first (single and two-column layouts,
+1-10 pages, PDF and DOCX, with hyperlinks) together with a manifest of the text and
+URLs that were written into each file. Every backend then runs in its own
+subprocess so peak RSS is per backend. For each extraction function the report
+has p50/p95 latency, characters extracted, word recall against the manifest and
+URL recall. The JSON output can be diffed across releases with --baseline.
+
+Backends:
+    ats3        AdvancedATSAnalyzer in ats3.py (extract_text_from_pdf,
+                extract_urls_from_pdf, extract_text_from_docx)
+    ats_groq    GroqATSAnalyzer in ats_groq/app.py
+    ats_script  ResumeATSScorer.read_pdf/read_docx in ATS/ats.py
+    atsbackend  extract_text_from_pdf/docx in POSTMID_ATS/ats-frontend/src/atsbackend.py
+
+ats3 and ats_groq are imported as-is. ATS/ats.py (tkinter GUI) and atsbackend.py
+(Flask app that configures Gemini and downloads NLTK data at import time) only
+have their extraction functions loaded from source, so no side effects run.
+"""
+
+import argparse
+import ast
+import io
+import json
+import os
+import platform
+import random
+import re
+import resource
+import subprocess
+import sys
+import tempfile
+import textwrap
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+import numpy as np
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+BACKENDS = ('ats3', 'ats_groq', 'ats_script', 'atsbackend')
+
+WORD_PATTERN = re.compile(r'[a-z0-9]{3,}')
+URL_PATTERN = re.compile(r'(?:https?://)?(?:www\.)?(?:[a-z0-9-]+\.)+[a-z]{2,}/[^\s]*', re.IGNORECASE)
+
+# --------------------------------------------------------------------------
+# Synthetic corpus
+# --------------------------------------------------------------------------
+
+FIRST_NAMES = ['Aarav', 'Priya', 'Jordan', 'Mei', 'Lucas', 'Fatima', 'Noah', 'Sofia', 'Ravi', 'Elena']
+LAST_NAMES = ['Sharma', 'Chen', 'Okafor', 'Garcia', 'Nguyen', 'Patel', 'Schmidt', 'Kowalski', 'Silva', 'Kim']
+COMPANIES = ['Acme Analytics', 'Northwind Systems', 'Globex Cloud', 'Initech Labs', 'Umbrella Health', 'Stark Robotics']
+TITLES = ['Software Engineer', 'Data Scientist', 'Backend Developer', 'ML Engineer', 'DevOps Engineer', 'Full Stack Developer']
+SKILLS = ['Python', 'Java', 'JavaScript', 'TypeScript', 'React', 'Django', 'FastAPI', 'PostgreSQL', 'MongoDB',
+          'Docker', 'Kubernetes', 'AWS', 'Terraform', 'TensorFlow', 'PyTorch', 'Spark', 'Kafka', 'Redis', 'GraphQL', 'Git']
+VERBS = ['Developed', 'Led', 'Implemented', 'Optimized', 'Designed', 'Automated', 'Migrated', 'Built', 'Reduced', 'Improved']
+OBJECTS = ['a real-time analytics pipeline', 'the payments microservice', 'CI/CD workflows for 12 services',
+           'query latency on reporting dashboards', 'a recommendation engine', 'the customer onboarding API',
+           'monitoring and alerting with Prometheus', 'batch ETL jobs on Spark', 'a feature store for ML models']
+OUTCOMES = ['cutting costs by {n}%', 'serving {n}k daily users', 'improving throughput by {n}%',
+            'reducing incidents by {n}%', 'saving {n} engineering hours per month']
+DEGREES = ['Bachelor of Technology in Computer Science', 'Master of Science in Data Science', 'Bachelor of Engineering in IT']
+
+PAGE_WIDTH, PAGE_HEIGHT = 612, 792  # US Letter
+MARGIN = 50
+FONT_SIZE = 10
+LINE_HEIGHT = 14
+LINES_PER_PAGE = (PAGE_HEIGHT - 2 * MARGIN) // LINE_HEIGHT
+
+def bullet(rng: random.Random) -> str:
+    outcome = rng.choice(OUTCOMES).format(n=rng.randint(10, 90))
+    return f"- {rng.choice(VERBS)} {rng.choice(OBJECTS)}, {outcome}"
+
+def resume_pages(rng: random.Random, pages: int, person: Dict[str, str]) -> List[Dict[str, List[str]]]:
+    """Page-by-page content: 'main' lines plus 'side' lines for two-column layouts"""
+    content = []
+    for page_number in range(pages):
+        main = []
+        side = []
+        if page_number == 0:
+            main += ["PROFESSIONAL SUMMARY",
+                     f"{rng.choice(TITLES)} with {rng.randint(2, 12)} years of experience building scalable systems.", ""]
+            side += ["CONTACT", person['email'], person['phone'], "", "SKILLS"] + rng.sample(SKILLS, 8) + [""]
+        main.append("EXPERIENCE" if page_number == 0 else "EXPERIENCE (continued)")
+        while len(main) < LINES_PER_PAGE - 8:
+            main += [f"{rng.choice(TITLES)} - {rng.choice(COMPANIES)} ({rng.randint(2012, 2020)} - {rng.randint(2021, 2025)})"]
+            main += [bullet(rng) for _ in range(rng.randint(3, 5))] + [""]
+        if page_number == pages - 1:
+            main += ["EDUCATION", f"{rng.choice(DEGREES)} - State University ({rng.randint(2008, 2018)})"]
+            side += ["CERTIFICATIONS", "AWS Certified Developer", "CKA Kubernetes Administrator"]
+        content.append({'main': main, 'side': side})
+    return content
+
+def wrap_lines(lines: List[str], width: int) -> List[str]:
+    wrapped = []
+    for line in lines:
+        wrapped += textwrap.wrap(line, width) if line else [""]
+    return wrapped
+
+def build_pdf(path: str, person: Dict[str, str], pages: List[Dict[str, List[str]]],
+              columns: int, links: List[Dict[str, str]]) -> str:
+    """Write a resume PDF; returns the text that was drawn"""
+    import fitz  # PyMuPDF
+
+    drawn = []
+    document = fitz.open()
+    for page_number, page_content in enumerate(pages):
+        page = document.new_page(width=PAGE_WIDTH, height=PAGE_HEIGHT)
+        y = MARGIN
+        if page_number == 0:
+            page.insert_text((MARGIN, y), person['name'], fontsize=16)
+            drawn.append(person['name'])
+            y += 22
+            x = MARGIN
+            # Link row: some anchors show the URL, some only a label
+            for link in links:
+                label = link['label']
+                page.insert_text((x, y), label, fontsize=FONT_SIZE)
+                width = fitz.get_text_length(label, fontsize=FONT_SIZE)
+                page.insert_link({'kind': fitz.LINK_URI, 'uri': link['uri'],
+                                  'from': fitz.Rect(x, y - FONT_SIZE, x + width, y + 2)})
+                drawn.append(label)
+                x += width + 14
+            y += LINE_HEIGHT * 2
+
+        if columns == 1:
+            blocks = [(MARGIN, wrap_lines(page_content['side'] + page_content['main'], 95))]
+        else:
+            side_width = 160
+            blocks = [(MARGIN, wrap_lines(page_content['side'], 28)),
+                      (MARGIN + side_width + 20, wrap_lines(page_content['main'], 62))]
+
+        for x, lines in blocks:
+            line_y = y
+            for line in lines:
+                if line_y > PAGE_HEIGHT - MARGIN:
+                    break
+                if line:
+                    page.insert_text((x, line_y), line, fontsize=FONT_SIZE)
+                    drawn.append(line)
+                line_y += LINE_HEIGHT
+
+    document.save(path)
+    document.close()
+    return "\n".join(drawn)
+
+def add_docx_hyperlink(paragraph, uri: str, label: str):
+    from docx.opc.constants import RELATIONSHIP_TYPE
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    rel_id = paragraph.part.relate_to(uri, RELATIONSHIP_TYPE.HYPERLINK, is_external=True)
+    hyperlink = OxmlElement('w:hyperlink')
+    hyperlink.set(qn('r:id'), rel_id)
+    run = OxmlElement('w:r')
+    text = OxmlElement('w:t')
+    text.text = label
+    run.append(text)
+    hyperlink.append(run)
+    paragraph._p.append(hyperlink)
+
+def build_docx(path: str, person: Dict[str, str], pages: List[Dict[str, List[str]]],
+               columns: int, links: List[Dict[str, str]]) -> str:
+    """Write a resume DOCX; returns the text that was written"""
+    import docx
+    from docx.enum.text import WD_BREAK
+    from docx.oxml import OxmlElement
+    from docx.oxml.ns import qn
+
+    written = [person['name']]
+    document = docx.Document()
+    document.add_heading(person['name'], level=1)
+
+    if columns == 2:
+        section_properties = document.sections[0]._sectPr
+        cols = section_properties.find(qn('w:cols'))
+        if cols is None:
+            cols = OxmlElement('w:cols')
+            section_properties.append(cols)
+        cols.set(qn('w:num'), '2')
+
+    link_paragraph = document.add_paragraph()
+    for index, link in enumerate(links):
+        if index:
+            link_paragraph.add_run(" | ")
+        add_docx_hyperlink(link_paragraph, link['uri'], link['label'])
+        written.append(link['label'])
+
+    for page_number, page_content in enumerate(pages):
+        for line in page_content['side'] + page_content['main']:
+            if line:
+                document.add_paragraph(line)
+                written.append(line)
+        if page_number < len(pages) - 1:
+            document.add_paragraph().add_run().add_break(WD_BREAK.PAGE)
+
+    document.save(path)
+    return "\n".join(written)
+
+def generate_corpus(corpus_dir: str, documents: int, seed: int) -> Dict[str, Any]:
+    """Generate the synthetic corpus and its manifest"""
+    rng = random.Random(seed)
+    os.makedirs(corpus_dir, exist_ok=True)
+    entries = []
+
+    for index in range(documents):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        handle = f"{first.lower()}{last.lower()}{index}"
+        person = {
+            'name': f"{first} {last}",
+            'email': f"{handle}@example.com",
+            'phone': f"+1 555 {rng.randint(100, 999)} {rng.randint(1000, 9999)}"
+        }
+        links = [
+            {'label': f"github.com/{handle}", 'uri': f"https://github.com/{handle}"},
+            {'label': "LinkedIn", 'uri': f"https://www.linkedin.com/in/{handle}"},
+            {'label': "Portfolio", 'uri': f"https://{handle}.dev/projects"},
+            {'label': f"leetcode.com/{handle}", 'uri': f"https://leetcode.com/{handle}"},
+        ]
+        fmt = 'docx' if index % 3 == 2 else 'pdf'
+        columns = 1 + (index % 2)
+        pages = 1 + (index * 7) % 10
+        content = resume_pages(rng, pages, person)
+
+        name = f"resume_{index:03d}_{columns}col_{pages}p.{fmt}"
+        path = os.path.join(corpus_dir, name)
+        if fmt == 'pdf':
+            text = build_pdf(path, person, content, columns, links)
+        else:
+            text = build_docx(path, person, content, columns, links)
+
+        entries.append({
+            'file': name,
+            'format': fmt,
+            'columns': columns,
+            'pages': pages,
+            'size_bytes': os.path.getsize(path),
+            'urls': [link['uri'] for link in links],
+            'visible_urls': [link['uri'] for link in links if link['label'] in link['uri']],
+            'text': text
+        })
+
+    manifest = {'seed': seed, 'documents': entries, 'created_at': datetime.now().isoformat()}
+    with open(os.path.join(corpus_dir, 'manifest.json'), 'w', encoding='utf-8') as f:
+        json.dump(manifest, f, indent=2)
+    return manifest
+
+# --------------------------------------------------------------------------
+# Backends
+# --------------------------------------------------------------------------
+
+def load_source_functions(path: str, names: List[str], class_name: Optional[str] = None) -> Dict[str, Callable]:
+    """Compile only the named functions (or methods of class_name) from a source file"""
+    import docx
+    import PyPDF2
+
+    with open(path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    body = tree.body
+    if class_name:
+        body = next(node.body for node in tree.body if isinstance(node, ast.ClassDef) and node.name == class_name)
+    functions = [node for node in body if isinstance(node, ast.FunctionDef) and node.name in names]
+    missing = set(names) - {node.name for node in functions}
+    if missing:
+        raise RuntimeError(f"{', '.join(sorted(missing))} not found in {path}")
+
+    namespace = {'PyPDF2': PyPDF2, 'docx': docx, 'io': io, 'os': os, 're': re}
+    exec(compile(ast.Module(body=functions, type_ignores=[]), path, 'exec'), namespace)
+    if class_name:
+        # Methods that don't touch self
+        return {name: (lambda fn: lambda *args: fn(None, *args))(namespace[name]) for name in names}
+    return {name: namespace[name] for name in names}
+
+def load_backend(name: str) -> Dict[str, Callable[[str, bytes], Any]]:
+    """Map of operation -> fn(path, content) for one backend"""
+    if name == 'ats3':
+        sys.path.insert(0, REPO_ROOT)
+        import ats3
+        return {
+            'pdf_text': lambda path, content: ats3.analyzer.extract_text_from_pdf(content),
+            'pdf_urls': lambda path, content: ats3.analyzer.extract_urls_from_pdf(content),
+            'docx_text': lambda path, content: ats3.analyzer.extract_text_from_docx(content),
+        }
+    if name == 'ats_groq':
+        sys.path.insert(0, os.path.join(REPO_ROOT, 'ats_groq'))
+        import app as ats_groq
+        return {
+            'pdf_text': lambda path, content: ats_groq.analyzer.extract_text_from_pdf(content),
+            'docx_text': lambda path, content: ats_groq.analyzer.extract_text_from_docx(content),
+        }
+    if name == 'ats_script':
+        functions = load_source_functions(os.path.join(REPO_ROOT, 'ATS', 'ats.py'),
+                                          ['read_pdf', 'read_docx'], class_name='ResumeATSScorer')
+        return {
+            'pdf_text': lambda path, content: functions['read_pdf'](path),
+            'docx_text': lambda path, content: functions['read_docx'](path),
+        }
+    if name == 'atsbackend':
+        functions = load_source_functions(
+            os.path.join(REPO_ROOT, 'POSTMID_ATS', 'ats-frontend', 'src', 'atsbackend.py'),
+            ['extract_text_from_pdf', 'extract_text_from_docx'])
+        return {
+            'pdf_text': lambda path, content: functions['extract_text_from_pdf'](path),
+            'docx_text': lambda path, content: functions['extract_text_from_docx'](path),
+        }
+    raise ValueError(f"Unknown backend: {name}")
+
+# --------------------------------------------------------------------------
+# Measurement
+# --------------------------------------------------------------------------
+
+def peak_rss_mb() -> float:
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # kilobytes on Linux, bytes on macOS
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+def normalize_url(url: str) -> str:
+    url = url.strip().lower().rstrip('/')
+    url = re.sub(r'^https?://', '', url)
+    return re.sub(r'^www\.', '', url)
+
+def word_recall(expected_text: str, extracted_text: str) -> float:
+    expected = set(WORD_PATTERN.findall(expected_text.lower()))
+    if not expected:
+        return 1.0
+    return len(expected & set(WORD_PATTERN.findall(extracted_text.lower()))) / len(expected)
+
+def url_recall(expected_urls: List[str], found_urls: List[str]) -> float:
+    expected = {normalize_url(url) for url in expected_urls}
+    if not expected:
+        return 1.0
+    return len(expected & {normalize_url(url) for url in found_urls}) / len(expected)
+
+def is_error(result: Any) -> bool:
+    return isinstance(result, str) and result.startswith('Error reading')
+
+def summarize(samples: List[float]) -> Dict[str, float]:
+    if not samples:
+        return {}
+    values = np.array(samples) * 1000
+    return {
+        'p50_ms': round(float(np.percentile(values, 50)), 3),
+        'p95_ms': round(float(np.percentile(values, 95)), 3),
+        'mean_ms': round(float(values.mean()), 3),
+        'max_ms': round(float(values.max()), 3)
+    }
+
+def run_worker(backend: str, corpus_dir: str, repeat: int) -> Dict[str, Any]:
+    """Benchmark one backend in the current process"""
+    with open(os.path.join(corpus_dir, 'manifest.json'), 'r', encoding='utf-8') as f:
+        manifest = json.load(f)
+
+    load_start = time.perf_counter()
+    operations = load_backend(backend)
+    load_seconds = time.perf_counter() - load_start
+    rss_after_load = peak_rss_mb()
+
+    records = {operation: [] for operation in operations}
+    for entry in manifest['documents']:
+        path = os.path.join(corpus_dir, entry['file'])
+        with open(path, 'rb') as f:
+            content = f.read()
+
+        for operation, fn in operations.items():
+            if not operation.startswith(entry['format']):
+                continue
+            samples = []
+            result, error = None, None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                try:
+                    result = fn(path, content)
+                except Exception as e:
+                    error = str(getattr(e, 'detail', e))
+                samples.append(time.perf_counter() - start)
+            if error is None and is_error(result):
+                error = result
+
+            record = {
+                'file': entry['file'],
+                'columns': entry['columns'],
+                'pages': entry['pages'],
+                'samples': samples,
+                'error': error
+            }
+            if error is None and operation.endswith('_urls'):
+                record['urls_found'] = len(result)
+                record['url_recall'] = url_recall(entry['urls'], result)
+            elif error is None:
+                record['chars'] = len(result)
+                record['word_recall'] = word_recall(entry['text'], result)
+                # Links whose URL is printed on the page can be recovered from text alone
+                record['text_url_recall'] = url_recall(entry['visible_urls'], URL_PATTERN.findall(result))
+            records[operation].append(record)
+
+    return {
+        'backend': backend,
+        'load_seconds': round(load_seconds, 3),
+        'rss_after_load_mb': rss_after_load,
+        'peak_rss_mb': peak_rss_mb(),
+        'records': records
+    }
+
+def aggregate(records: List[Dict[str, Any]]) -> Dict[str, Any]:
+    ok = [record for record in records if not record['error']]
+    report = {
+        'documents': len(records),
+        'errors': len(records) - len(ok),
+        **summarize([sample for record in records for sample in record['samples']])
+    }
+    for metric in ('chars', 'word_recall', 'text_url_recall', 'url_recall', 'urls_found'):
+        values = [record[metric] for record in ok if metric in record]
+        if values:
+            report[f"{metric}_total" if metric in ('chars', 'urls_found') else f"{metric}_mean"] = (
+                int(sum(values)) if metric in ('chars', 'urls_found') else round(float(np.mean(values)), 4))
+    by_layout = {}
+    for columns in (1, 2):
+        layout_records = [record for record in records if record['columns'] == columns]
+        if layout_records:
+            layout = summarize([sample for record in layout_records for sample in record['samples']])
+            recalls = [record.get('word_recall', record.get('url_recall')) for record in layout_records
+                       if not record['error']]
+            if recalls:
+                layout['recall_mean'] = round(float(np.mean(recalls)), 4)
+            by_layout[f"{columns}_column"] = layout
+    report['by_layout'] = by_layout
+    errors = sorted({record['error'] for record in records if record['error']})
+    if errors:
+        report['error_samples'] = errors[:3]
+    return report
+
+def run_backend(backend: str, corpus_dir: str, repeat: int) -> Dict[str, Any]:
+    """Run one backend in a fresh interpreter so RSS and imports don't leak between backends"""
+    with tempfile.NamedTemporaryFile(suffix='.json', delete=False) as f:
+        result_path = f.name
+    try:
+        completed = subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--worker', backend,
+             '--corpus', corpus_dir, '--repeat', str(repeat), '--output', result_path],
+            capture_output=True, text=True
+        )
+        if completed.returncode != 0:
+            tail = (completed.stderr or completed.stdout).strip().splitlines()[-1:] or ['no output']
+            return {'backend': backend, 'skipped': True, 'reason': tail[0]}
+        with open(result_path, 'r', encoding='utf-8') as f:
+            raw = json.load(f)
+    finally:
+        os.unlink(result_path)
+
+    return {
+        'backend': backend,
+        'load_seconds': raw['load_seconds'],
+        'rss_after_load_mb': raw['rss_after_load_mb'],
+        'peak_rss_mb': raw['peak_rss_mb'],
+        'extraction_rss_mb': round(raw['peak_rss_mb'] - raw['rss_after_load_mb'], 1),
+        'operations': {operation: aggregate(records) for operation, records in raw['records'].items()}
+    }
+
+def git_commit() -> Optional[str]:
+    try:
+        return subprocess.run(['git', 'rev-parse', '--short', 'HEAD'], cwd=REPO_ROOT,
+                              capture_output=True, text=True, check=True).stdout.strip()
+    except Exception:
+        return None
+
+def library_versions() -> Dict[str, Optional[str]]:
+    versions = {}
+    for module_name in ('PyPDF2', 'fitz', 'docx'):
+        try:
+            module = __import__(module_name)
+            versions[module_name] = getattr(module, '__version__', None) or getattr(module, 'VersionBind', None)
+        except ImportError:
+            versions[module_name] = None
+    return versions
+
+def print_report(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None):
+    baseline_backends = {entry['backend']: entry for entry in (baseline or {}).get('backends', [])}
+    print(f"\n{'backend':<12} {'operation':<10} {'p50 ms':>9} {'p95 ms':>9} {'chars':>9} "
+          f"{'recall':>7} {'url rec':>7} {'errors':>6} {'peak MB':>8}")
+    for entry in report['backends']:
+        if entry.get('skipped'):
+            print(f"{entry['backend']:<12} skipped: {entry['reason']}")
+            continue
+        for operation, stats in entry['operations'].items():
+            recall = stats.get('word_recall_mean', stats.get('url_recall_mean'))
+            url_rec = stats.get('url_recall_mean', stats.get('text_url_recall_mean'))
+            line = (f"{entry['backend']:<12} {operation:<10} {stats.get('p50_ms', 0):>9.2f} {stats.get('p95_ms', 0):>9.2f} "
+                    f"{stats.get('chars_total', '-'):>9} "
+                    f"{'-' if recall is None else f'{recall:.3f}':>7} {'-' if url_rec is None else f'{url_rec:.3f}':>7} "
+                    f"{stats['errors']:>6} {entry['peak_rss_mb']:>8.1f}")
+            previous = baseline_backends.get(entry['backend'], {}).get('operations', {}).get(operation)
+            if previous and previous.get('p50_ms'):
+                change = (stats.get('p50_ms', 0) - previous['p50_ms']) / previous['p50_ms'] * 100
+                line += f"  ({change:+.1f}% p50 vs baseline)"
+            print(line)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark PDF/DOCX extraction backends")
+    parser.add_argument('--documents', type=int, default=60, help="Synthetic resumes to generate")
+    parser.add_argument('--repeat', type=int, default=3, help="Timed runs per document and operation")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--corpus', help="Corpus directory (reused if it has a manifest.json)")
+    parser.add_argument('--backends', default=','.join(BACKENDS))
+    parser.add_argument('--output', default='extraction_benchmark.json')
+    parser.add_argument('--baseline', help="Previous JSON report to compare p50 latency against")
+    parser.add_argument('--worker', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        result = run_worker(args.worker, args.corpus, args.repeat)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(result, f)
+        return
+
+    corpus_dir = args.corpus or tempfile.mkdtemp(prefix='resume_corpus_')
+    manifest_path = os.path.join(corpus_dir, 'manifest.json')
+    if os.path.exists(manifest_path):
+        with open(manifest_path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+        print(f"✓ Reusing corpus of {len(manifest['documents'])} documents in {corpus_dir}")
+    else:
+        manifest = generate_corpus(corpus_dir, args.documents, args.seed)
+        print(f"✓ Generated {len(manifest['documents'])} synthetic resumes in {corpus_dir}")
+
+    backends = []
+    for backend in [name.strip() for name in args.backends.split(',') if name.strip()]:
+        print(f"… {backend}")
+        backends.append(run_backend(backend, corpus_dir, args.repeat))
+
+    documents = manifest['documents']
+    report = {
+        'created_at': datetime.now().isoformat(),
+        'git_commit': git_commit(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'libraries': library_versions(),
+        'corpus': {
+            'path': corpus_dir,
+            'seed': manifest['seed'],
+            'documents': len(documents),
+            'pdf': sum(1 for entry in documents if entry['format'] == 'pdf'),
+            'docx': sum(1 for entry in documents if entry['format'] == 'docx'),
+            'pages': sum(entry['pages'] for entry in documents),
+            'urls': sum(len(entry['urls']) for entry in documents)
+        },
+        'repeat': args.repeat,
+        'backends': backends
+    }
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+    print_report(report, baseline)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"\n✓ Report written to {args.output}")
+
+if __name__ == "__main__":
+    main()
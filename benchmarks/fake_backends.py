@@ -0,0 +1,363 @@
+"""
+Local stand-ins for the LLM providers and coding platforms the services call.
+
+Usage:
+    python benchmarks/fake_backends.py [--port 8790] [--llm-latency-ms 800]
+        [--platform-latency-ms 150] [--jitter 0.25] [--llm-error-rate 0.0] [--llm-tokens-per-second 0]
+
+One aiohttp server answers:
+    Groq (OpenAI-compatible)  POST /openai/v1/chat/completions (JSON or SSE stream), GET /openai/v1/models
+    Ollama                    POST /api/generate, POST /api/chat, GET /api/tags
+    Gemini                    POST /v1beta/models/<model>:generateContent
+    LeetCode                  POST /leetcode/graphql
+    Codeforces                GET /codeforces/api/user.info, GET /codeforces/api/user.status
+    CodeChef                  GET /codechef/users/<username>
+
+Point the services at it with:
+    GROQ_BASE_URL=http://127.0.0.1:8790         (llm_gateway; GROQ_API_BASE for langchain_groq)
+    LEETCODE_GRAPHQL_URL=http://127.0.0.1:8790/leetcode/graphql
+    CODEFORCES_API_URL=http://127.0.0.1:8790/codeforces/api
+    CODECHEF_BASE_URL=http://127.0.0.1:8790/codechef
+    OLLAMA_BASE_URL=http://127.0.0.1:8790       (llm_gateway, temp3, atsfinale)
+    GEMINI_BASE_URL=http://127.0.0.1:8790       (llm_gateway: ResumeGen, POSTMID backend)
+
+Responses are deterministic per username/prompt so repeated runs are comparable.
+Every request sleeps for the configured latency (uniform +/- jitter) before answering.
+With --llm-tokens-per-second, Groq completions also take generation time (~4 chars per
+token): streamed responses pace their chunks, non-streamed ones wait for the whole text.
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import random
+import time
+from collections import Counter
+from typing import Any, Dict
+
+from aiohttp import web
+
+# A completion that parses as the JSON analysis ats_groq asks for and reads as
+# plain suggestions for ats3 / temp4 prompts
+CANNED_ANALYSIS = {
+    "scores": {
+        "ats_compatibility": 82,
+        "content_quality": 76,
+        "keyword_optimization": 71,
+        "structure_organization": 84,
+        "language_quality": 88
+    },
+    "feedback": {
+        "ats_compatibility": ["Standard section headers are used", "Contact details are easy to parse"],
+        "content_quality": ["Most bullets start with action verbs", "Add metrics to older roles"],
+        "keyword_optimization": ["Core stack keywords are present", "Mirror the job title in the summary"],
+        "structure_organization": ["Sections follow a logical order", "Keep experience in reverse chronological order"],
+        "language_quality": ["Tone is professional", "Tense is consistent across roles"]
+    },
+    "overall_score": 79.4,
+    "overall_assessment": "A solid technical resume with clear structure; quantifying more outcomes would strengthen it.",
+    "key_strengths": ["Clear structure", "Relevant technical stack", "Action-oriented bullets"],
+    "priority_improvements": [
+        "Quantify impact in every recent role",
+        "Add a skills section grouped by category",
+        "Tailor the summary to the target role"
+    ],
+    "industry_insights": "Backend and cloud skills match current market demand.",
+    "competitive_position": "Above average for mid-level engineering applicants."
+}
+
+class FakeBackends:
+    def __init__(self, llm_latency_ms: float, platform_latency_ms: float, jitter: float,
+                 llm_error_rate: float, seed: int = 7, llm_tokens_per_second: float = 0.0):
+        self.llm_latency = llm_latency_ms / 1000
+        self.platform_latency = platform_latency_ms / 1000
+        self.jitter = jitter
+        self.llm_error_rate = llm_error_rate
+        self.llm_tokens_per_second = llm_tokens_per_second
+        self.rng = random.Random(seed)
+        self.requests = Counter()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.started_at = time.time()
+
+    async def delay(self, base: float):
+        if base > 0:
+            await asyncio.sleep(base * self.rng.uniform(1 - self.jitter, 1 + self.jitter))
+
+    @web.middleware
+    async def track(self, request: web.Request, handler):
+        self.requests[request.path.split('/')[1] or 'root'] += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        try:
+            return await handler(request)
+        finally:
+            self.in_flight -= 1
+
+    def generation_time(self, text: str) -> float:
+        return (len(text) / 4) / self.llm_tokens_per_second if self.llm_tokens_per_second else 0.0
+
+    def llm_failure(self):
+        """Injected provider failure: 429 with retry-after, or 503"""
+        if self.llm_error_rate and self.rng.random() < self.llm_error_rate:
+            if self.rng.random() < 0.5:
+                return web.json_response({'error': {'message': 'Rate limit reached', 'type': 'rate_limit'}},
+                                         status=429, headers={'retry-after': '1'})
+            return web.json_response({'error': {'message': 'Service unavailable', 'type': 'server_error'}}, status=503)
+        return None
+
+    @staticmethod
+    def completion_text(prompt: str) -> str:
+        if '"ats_deep_dive":' in prompt:
+            # ats_groq /full-report merged mode asks for every section in one object
+            return json.dumps({
+                'analysis': CANNED_ANALYSIS,
+                'detailed_insights': "## Career Positioning\nStrong backend profile with a clear progression.",
+                'optimization_suggestions': "## Content Optimization\n- Replace 'worked on' with 'built'.",
+                'ats_deep_dive': "## Parsing & Readability\nStandard headers; single-column text parses cleanly."
+            }, indent=2)
+        return json.dumps(CANNED_ANALYSIS, indent=2)
+
+    # ----- Groq / OpenAI-compatible -----
+
+    async def groq_chat(self, request: web.Request) -> web.StreamResponse:
+        body = await request.json()
+        await self.delay(self.llm_latency)
+        failure = self.llm_failure()
+        if failure:
+            return failure
+
+        prompt = "\n".join(str(message.get('content', '')) for message in body.get('messages', []))
+        content = self.completion_text(prompt)
+        prompt_tokens = max(1, len(prompt) // 4)
+        completion_tokens = max(1, len(content) // 4)
+        model = body.get('model', 'fake-model')
+        created = int(time.time())
+        headers = {
+            'x-ratelimit-limit-requests': '14400',
+            'x-ratelimit-remaining-requests': '14399',
+            'x-ratelimit-limit-tokens': '1000000',
+            'x-ratelimit-remaining-tokens': str(1000000 - prompt_tokens - completion_tokens),
+            'x-ratelimit-reset-requests': '6s',
+            'x-ratelimit-reset-tokens': '1s'
+        }
+
+        if not body.get('stream'):
+            await asyncio.sleep(self.generation_time(content))
+            return web.json_response({
+                'id': f"chatcmpl-{created}",
+                'object': 'chat.completion',
+                'created': created,
+                'model': model,
+                'choices': [{'index': 0, 'message': {'role': 'assistant', 'content': content}, 'finish_reason': 'stop'}],
+                'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                          'total_tokens': prompt_tokens + completion_tokens}
+            }, headers=headers)
+
+        response = web.StreamResponse(headers={**headers, 'Content-Type': 'text/event-stream'})
+        await response.prepare(request)
+        chunk_size = 24
+        for start in range(0, len(content), chunk_size):
+            chunk = {
+                'id': f"chatcmpl-{created}", 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+                'choices': [{'index': 0, 'delta': {'content': content[start:start + chunk_size]}, 'finish_reason': None}]
+            }
+            await response.write(f"data: {json.dumps(chunk)}\n\n".encode())
+            await asyncio.sleep(self.generation_time(content[start:start + chunk_size]))
+        final = {
+            'id': f"chatcmpl-{created}", 'object': 'chat.completion.chunk', 'created': created, 'model': model,
+            'choices': [{'index': 0, 'delta': {}, 'finish_reason': 'stop'}],
+            'x_groq': {'usage': {'prompt_tokens': prompt_tokens, 'completion_tokens': completion_tokens,
+                                 'total_tokens': prompt_tokens + completion_tokens}}
+        }
+        await response.write(f"data: {json.dumps(final)}\n\ndata: [DONE]\n\n".encode())
+        await response.write_eof()
+        return response
+
+    async def groq_models(self, request: web.Request) -> web.Response:
+        models = ["llama-3.3-70b-versatile", "llama-3.1-70b-versatile", "llama-3.1-8b-instant", "mixtral-8x7b-32768"]
+        return web.json_response({'object': 'list', 'data': [{'id': model, 'object': 'model'} for model in models]})
+
+    # ----- Ollama -----
+
+    async def ollama_generate(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await self.delay(self.llm_latency)
+        failure = self.llm_failure()
+        if failure:
+            return failure
+        return web.json_response({
+            'model': body.get('model', 'llama3'),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'response': self.completion_text(body.get('prompt', '')),
+            'done': True
+        })
+
+    async def ollama_chat(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await self.delay(self.llm_latency)
+        failure = self.llm_failure()
+        if failure:
+            return failure
+        prompt = "\n".join(str(message.get('content', '')) for message in body.get('messages', []))
+        return web.json_response({
+            'model': body.get('model', 'llama3'),
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+            'message': {'role': 'assistant', 'content': self.completion_text(prompt)},
+            'done': True
+        })
+
+    async def ollama_tags(self, request: web.Request) -> web.Response:
+        return web.json_response({'models': [{'name': 'llama3:latest'}, {'name': 'mistral:latest'}]})
+
+    # ----- Gemini -----
+
+    async def gemini_generate(self, request: web.Request) -> web.Response:
+        model, _, action = request.match_info['model_action'].partition(':')
+        if action != 'generateContent':
+            raise web.HTTPNotFound()
+        body = await request.json()
+        await self.delay(self.llm_latency)
+        failure = self.llm_failure()
+        if failure:
+            return failure
+        prompt = " ".join(part.get('text', '') for content in body.get('contents', []) for part in content.get('parts', []))
+        text = self.completion_text(prompt)
+        return web.json_response({
+            'candidates': [{'content': {'parts': [{'text': text}], 'role': 'model'}, 'finishReason': 'STOP', 'index': 0}],
+            'usageMetadata': {'promptTokenCount': len(prompt) // 4, 'candidatesTokenCount': len(text) // 4,
+                              'totalTokenCount': (len(prompt) + len(text)) // 4},
+            'modelVersion': model
+        })
+
+    # ----- Coding platforms -----
+
+    @staticmethod
+    def user_seed(username: str) -> int:
+        return int(hashlib.sha256(username.lower().encode()).hexdigest()[:8], 16)
+
+    async def leetcode_graphql(self, request: web.Request) -> web.Response:
+        body = await request.json()
+        await self.delay(self.platform_latency)
+        username = body.get('variables', {}).get('username', '')
+        seed = self.user_seed(username)
+        easy, medium, hard = 50 + seed % 200, 30 + seed % 150, seed % 60
+        return web.json_response({'data': {
+            'allQuestionsCount': [{'difficulty': 'All', 'count': 3200}, {'difficulty': 'Easy', 'count': 800},
+                                  {'difficulty': 'Medium', 'count': 1700}, {'difficulty': 'Hard', 'count': 700}],
+            'matchedUser': {
+                'username': username,
+                'profile': {'ranking': 10000 + seed % 500000, 'userAvatar': '', 'realName': username.title(),
+                            'aboutMe': '', 'reputation': seed % 100},
+                'submitStats': {'acSubmissionNum': [
+                    {'difficulty': 'All', 'count': easy + medium + hard, 'submissions': (easy + medium + hard) * 2},
+                    {'difficulty': 'Easy', 'count': easy, 'submissions': easy * 2},
+                    {'difficulty': 'Medium', 'count': medium, 'submissions': medium * 2},
+                    {'difficulty': 'Hard', 'count': hard, 'submissions': hard * 2}
+                ]},
+                'badges': [{'id': str(i), 'displayName': f"Badge {i}", 'icon': '', 'creationDate': '2024-01-01'}
+                           for i in range(seed % 4)]
+            }
+        }})
+
+    def codeforces_user(self, handle: str) -> Dict[str, Any]:
+        seed = self.user_seed(handle)
+        rating = 1000 + seed % 1500
+        return {
+            'handle': handle, 'rating': rating, 'maxRating': rating + seed % 200,
+            'rank': 'specialist', 'maxRank': 'expert', 'contribution': seed % 50,
+            'lastOnlineTimeSeconds': 1700000000, 'registrationTimeSeconds': 1500000000
+        }
+
+    async def codeforces_user_info(self, request: web.Request) -> web.Response:
+        await self.delay(self.platform_latency)
+        handles = [handle for handle in request.query.get('handles', '').split(';') if handle]
+        return web.json_response({'status': 'OK', 'result': [self.codeforces_user(handle) for handle in handles]})
+
+    async def codeforces_user_status(self, request: web.Request) -> web.Response:
+        await self.delay(self.platform_latency)
+        handle = request.query.get('handle', '')
+        start = int(request.query.get('from', '1'))
+        count = int(request.query.get('count', '100'))
+        total = 50 + self.user_seed(handle) % 400
+        verdicts = ['OK', 'OK', 'OK', 'WRONG_ANSWER', 'TIME_LIMIT_EXCEEDED']
+        # Newest first, ids descending
+        submissions = []
+        for index in range(start - 1, min(start - 1 + count, total)):
+            submission_id = total - index
+            submissions.append({
+                'id': submission_id,
+                'creationTimeSeconds': 1600000000 + submission_id * 600,
+                'verdict': verdicts[submission_id % len(verdicts)],
+                'problem': {'contestId': 1000 + submission_id % 300, 'index': 'ABCDE'[submission_id % 5],
+                            'name': f"Problem {submission_id}", 'rating': 800 + (submission_id % 20) * 100}
+            })
+        return web.json_response({'status': 'OK', 'result': submissions})
+
+    async def codechef_user(self, request: web.Request) -> web.Response:
+        await self.delay(self.platform_latency)
+        username = request.match_info['username']
+        seed = self.user_seed(username)
+        html = f"""<html><body>
+            <div class="rating-number">{1400 + seed % 900}</div>
+            <span class="rating-star">{1 + seed % 5} star</span>
+            <section class="problems-solved"><h3>Problems Solved: {seed % 500}</h3></section>
+            <div class="rating-ranks"><a>Global Rank: {seed % 90000}</a></div>
+        </body></html>"""
+        return web.Response(text=html, content_type='text/html')
+
+    async def stats(self, request: web.Request) -> web.Response:
+        return web.json_response({
+            'requests': dict(self.requests),
+            'in_flight': self.in_flight,
+            'max_in_flight': self.max_in_flight,
+            'uptime_seconds': round(time.time() - self.started_at, 1)
+        })
+
+    def build_app(self) -> web.Application:
+        app = web.Application(middlewares=[self.track], client_max_size=32 * 1024 * 1024)
+        app.router.add_post('/openai/v1/chat/completions', self.groq_chat)
+        app.router.add_get('/openai/v1/models', self.groq_models)
+        app.router.add_post('/api/generate', self.ollama_generate)
+        app.router.add_post('/api/chat', self.ollama_chat)
+        app.router.add_get('/api/tags', self.ollama_tags)
+        app.router.add_post('/v1beta/models/{model_action}', self.gemini_generate)
+        app.router.add_post('/leetcode/graphql', self.leetcode_graphql)
+        app.router.add_get('/codeforces/api/user.info', self.codeforces_user_info)
+        app.router.add_get('/codeforces/api/user.status', self.codeforces_user_status)
+        app.router.add_get('/codechef/users/{username}', self.codechef_user)
+        app.router.add_get('/_stats', self.stats)
+        return app
+
+def service_env(base_url: str) -> Dict[str, str]:
+    """Environment variables that point the services at a fake backend server"""
+    return {
+        'GROQ_BASE_URL': base_url,
+        'GROQ_API_BASE': base_url,
+        'OLLAMA_BASE_URL': base_url,
+        'GEMINI_BASE_URL': base_url,
+        'LEETCODE_GRAPHQL_URL': f"{base_url}/leetcode/graphql",
+        'CODEFORCES_API_URL': f"{base_url}/codeforces/api",
+        'CODECHEF_BASE_URL': f"{base_url}/codechef"
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Fake LLM and coding-platform backends for load testing")
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8790)
+    parser.add_argument('--llm-latency-ms', type=float, default=800)
+    parser.add_argument('--platform-latency-ms', type=float, default=150)
+    parser.add_argument('--jitter', type=float, default=0.25, help="Latency spread as a fraction of the base")
+    parser.add_argument('--llm-error-rate', type=float, default=0.0, help="Fraction of LLM calls answered with 429/503")
+    parser.add_argument('--llm-tokens-per-second', type=float, default=0.0,
+                        help="Groq generation speed; 0 answers instantly after the latency")
+    args = parser.parse_args()
+
+    backends = FakeBackends(args.llm_latency_ms, args.platform_latency_ms, args.jitter, args.llm_error_rate,
+                            llm_tokens_per_second=args.llm_tokens_per_second)
+    print(f"✓ Fake backends on http://{args.host}:{args.port}")
+    web.run_app(backends.build_app(), host=args.host, port=args.port, print=None, access_log=None)
+
+if __name__ == "__main__":
+    main()
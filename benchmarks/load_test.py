@@ -0,0 +1,559 @@
+"""
+End-to-end load test for the FastAPI services with stubbed LLM and coding-platform backends.
+
+Usage:
+    python benchmarks/load_test.py --service ats3 [--rps 5] [--duration 60] [--warmup 10]
+        [--mix analyze=4,analyze-text=3,batch-analyze=1,compare=2]
+        [--llm-latency-ms 800] [--platform-latency-ms 150] [--llm-error-rate 0.0]
+        [--with-caches] [--env KEY=VALUE ...] [--output load_test.json]
+
+Services:
+    ats3      ats3.py             /analyze, /analyze-text, /batch-analyze, /compare
+    ats_groq  ats_groq/app.py     /analyze, /analyze-text, /batch-analyze, /compare
+    temp4     temp4.py            /api/generate-resume
+
+The harness starts benchmarks/fake_backends.py, boots the service under uvicorn with
+its Groq/LeetCode/Codeforces/CodeChef endpoints pointed at the fakes, then replays the
+request mix open-loop at the target rate. Latency is measured from each request's
+scheduled start, so a backed-up service shows up as latency rather than as a lower
+send rate. While the run is in progress the service process (and its worker
+processes) is sampled for CPU and RSS.
+
+The request pool is small and shares one job description, so the service's LLM,
+analysis-result and coding-profile caches are turned off by default; otherwise most
+requests after warm-up would be cache hits. Pass --with-caches to measure with them on.
+
+Use --service-url to load an already running service instead (add --service-pid to
+sample its CPU/RSS).
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from collections import Counter, defaultdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import aiohttp
+import numpy as np
+import psutil
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from extraction_benchmark import REPO_ROOT, build_pdf, git_commit, resume_pages  # noqa: E402
+from fake_backends import service_env  # noqa: E402
+
+SERVICES = {
+    'ats3': {
+        'cwd': REPO_ROOT,
+        'app': 'ats3:app',
+        'health': '/health',
+        'mix': 'analyze=4,analyze-text=3,batch-analyze=1,compare=2'
+    },
+    'ats_groq': {
+        'cwd': os.path.join(REPO_ROOT, 'ats_groq'),
+        'app': 'app:app',
+        'health': '/health',
+        'mix': 'analyze=4,analyze-text=3,batch-analyze=1,compare=2'
+    },
+    'temp4': {
+        'cwd': REPO_ROOT,
+        'app': 'temp4:app',
+        'health': '/api/health',
+        'mix': 'generate-resume=1'
+    }
+}
+
+JOB_DESCRIPTION = """Senior Backend Engineer
+We are looking for a backend engineer with 5+ years of experience building scalable
+distributed systems in Python. Required: FastAPI or Django, PostgreSQL, Redis, Docker,
+Kubernetes, AWS, CI/CD and monitoring. Experience with Kafka, Spark or machine learning
+pipelines is a plus. Bachelor's degree in Computer Science or related field."""
+
+PERCENTILES = (50, 90, 95, 99)
+
+# --------------------------------------------------------------------------
+# Request payloads
+# --------------------------------------------------------------------------
+
+class Workload:
+    """Pool of synthetic resumes (PDF bytes + text) and the request builders for each scenario"""
+
+    def __init__(self, resumes: int, batch_size: int, seed: int):
+        self.rng = random.Random(seed)
+        self.batch_size = batch_size
+        self.files = []
+        self.texts = []
+        directory = tempfile.mkdtemp(prefix='load_test_resumes_')
+        for index in range(resumes):
+            handle = f"loaduser{index}"
+            person = {'name': f"Load User {index}", 'email': f"{handle}@example.com", 'phone': "555-010-2030"}
+            # Every coding-platform fetcher gets exercised
+            links = [
+                {'label': f"github.com/{handle}", 'uri': f"https://github.com/{handle}"},
+                {'label': f"leetcode.com/u/{handle}", 'uri': f"https://leetcode.com/u/{handle}"},
+                {'label': f"codeforces.com/profile/{handle}", 'uri': f"https://codeforces.com/profile/{handle}"},
+                {'label': f"codechef.com/users/{handle}", 'uri': f"https://www.codechef.com/users/{handle}"},
+            ]
+            pages = resume_pages(self.rng, 1 + index % 3, person)
+            path = os.path.join(directory, f"resume_{index:03d}.pdf")
+            text = build_pdf(path, person, pages, 1 + index % 2, links)
+            with open(path, 'rb') as f:
+                self.files.append((os.path.basename(path), f.read()))
+            self.texts.append(text)
+
+    def pick_file(self):
+        return self.rng.choice(self.files)
+
+    def build(self, scenario: str):
+        """(method, path, request kwargs) for one request of a scenario"""
+        if scenario == 'analyze':
+            form = aiohttp.FormData()
+            name, content = self.pick_file()
+            form.add_field('resume', content, filename=name, content_type='application/pdf')
+            form.add_field('job_description', JOB_DESCRIPTION)
+            return 'POST', '/analyze', {'data': form}
+        if scenario == 'analyze-text':
+            return 'POST', '/analyze-text', {'json': {'resume_text': self.rng.choice(self.texts),
+                                                      'job_description': JOB_DESCRIPTION}}
+        if scenario == 'batch-analyze':
+            form = aiohttp.FormData()
+            for name, content in self.rng.sample(self.files, min(self.batch_size, len(self.files))):
+                form.add_field('resumes', content, filename=name, content_type='application/pdf')
+            form.add_field('job_description', JOB_DESCRIPTION)
+            return 'POST', '/batch-analyze', {'data': form}
+        if scenario == 'compare':
+            form = aiohttp.FormData()
+            for field in ('resume1', 'resume2'):
+                name, content = self.pick_file()
+                form.add_field(field, content, filename=name, content_type='application/pdf')
+            form.add_field('job_description', JOB_DESCRIPTION)
+            return 'POST', '/compare', {'data': form}
+        if scenario == 'generate-resume':
+            return 'POST', '/api/generate-resume', {'json': self.resume_request()}
+        raise ValueError(f"Unknown scenario: {scenario}")
+
+    def resume_request(self) -> Dict[str, Any]:
+        index = self.rng.randrange(len(self.texts))
+        return {
+            'resume_data': {
+                'personal_info': {'name': f"Load User {index}", 'email': f"loaduser{index}@example.com",
+                                  'phone': "555-010-2030", 'location': "Remote"},
+                'professional_summary': "Backend engineer building data-intensive services.",
+                'work_experience': [{
+                    'company': "Northwind Systems",
+                    'position': "Software Engineer",
+                    'start_date': "2021-01",
+                    'end_date': "2024-06",
+                    'responsibilities': ["Worked on the payments API", "Responsible for CI pipelines"],
+                    'achievements': ["Reduced p95 latency by 40%"]
+                }],
+                'education': [{
+                    'institution': "State University",
+                    'degree': "B.Tech",
+                    'field_of_study': "Computer Science",
+                    'graduation_date': "2020"
+                }],
+                'skills': {'languages': ["Python", "Go"], 'tools': ["Docker", "Kubernetes", "PostgreSQL"]},
+                'projects': [{'name': "Feature store", 'description': "Online/offline feature serving",
+                              'technologies': ["Python", "Redis"]}]
+            },
+            'job_description': JOB_DESCRIPTION,
+            'resume_format': "professional"
+        }
+
+def parse_mix(mix: str) -> Dict[str, float]:
+    weights = {}
+    for part in mix.split(','):
+        if part.strip():
+            scenario, _, weight = part.partition('=')
+            weights[scenario.strip()] = float(weight or 1)
+    return weights
+
+# --------------------------------------------------------------------------
+# Processes
+# --------------------------------------------------------------------------
+
+async def wait_for_http(url: str, timeout: float, process: Optional[subprocess.Popen] = None) -> bool:
+    deadline = time.monotonic() + timeout
+    async with aiohttp.ClientSession() as session:
+        while time.monotonic() < deadline:
+            if process is not None and process.poll() is not None:
+                return False
+            try:
+                async with session.get(url, timeout=aiohttp.ClientTimeout(total=2)) as response:
+                    if response.status < 500:
+                        return True
+            except (aiohttp.ClientError, asyncio.TimeoutError):
+                pass
+            await asyncio.sleep(0.25)
+    return False
+
+def start_process(command: List[str], cwd: str, env: Dict[str, str], log_path: str) -> subprocess.Popen:
+    log = open(log_path, 'w')
+    return subprocess.Popen(command, cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+
+def stop_process(process: Optional[subprocess.Popen]):
+    if process is None or process.poll() is not None:
+        return
+    process.terminate()
+    try:
+        process.wait(timeout=10)
+    except subprocess.TimeoutExpired:
+        process.kill()
+
+def log_tail(log_path: str, lines: int = 15) -> str:
+    try:
+        with open(log_path, 'r', errors='ignore') as f:
+            return "".join(f.readlines()[-lines:])
+    except OSError:
+        return ""
+
+# --------------------------------------------------------------------------
+# Measurement
+# --------------------------------------------------------------------------
+
+class ResourceSampler:
+    """Samples CPU% and RSS of a process tree (uvicorn plus any worker pools)"""
+
+    def __init__(self, pid: int, interval: float = 0.5):
+        self.root = psutil.Process(pid)
+        self.interval = interval
+        self.processes: Dict[int, psutil.Process] = {}
+        self.samples: List[Dict[str, float]] = []
+
+    def tree(self) -> List[psutil.Process]:
+        try:
+            current = [self.root] + self.root.children(recursive=True)
+        except psutil.NoSuchProcess:
+            return []
+        for process in current:
+            if process.pid not in self.processes:
+                self.processes[process.pid] = process
+                try:
+                    process.cpu_percent(None)  # prime the counter
+                except psutil.Error:
+                    pass
+        return [self.processes[process.pid] for process in current]
+
+    def sample(self) -> Dict[str, float]:
+        cpu, rss, count = 0.0, 0, 0
+        for process in self.tree():
+            try:
+                cpu += process.cpu_percent(None)
+                rss += process.memory_info().rss
+                count += 1
+            except psutil.Error:
+                continue
+        return {'time': time.time(), 'cpu_percent': cpu, 'rss_mb': rss / (1024 * 1024), 'processes': count}
+
+    async def run(self, stop: asyncio.Event):
+        self.tree()
+        while not stop.is_set():
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=self.interval)
+            except asyncio.TimeoutError:
+                pass
+            self.samples.append(self.sample())
+
+    def summary(self, since: float) -> Dict[str, Any]:
+        samples = [sample for sample in self.samples if sample['time'] >= since]
+        if not samples:
+            return {}
+        cpu = np.array([sample['cpu_percent'] for sample in samples])
+        rss = np.array([sample['rss_mb'] for sample in samples])
+        return {
+            'samples': len(samples),
+            'cpu_percent_mean': round(float(cpu.mean()), 1),
+            'cpu_percent_p95': round(float(np.percentile(cpu, 95)), 1),
+            'cpu_percent_max': round(float(cpu.max()), 1),
+            'rss_mb_mean': round(float(rss.mean()), 1),
+            'rss_mb_max': round(float(rss.max()), 1),
+            'processes_max': max(sample['processes'] for sample in samples)
+        }
+
+def latency_stats(latencies: List[float]) -> Dict[str, float]:
+    if not latencies:
+        return {}
+    values = np.array(latencies) * 1000
+    stats = {f"p{p}_ms": round(float(np.percentile(values, p)), 1) for p in PERCENTILES}
+    stats['mean_ms'] = round(float(values.mean()), 1)
+    stats['max_ms'] = round(float(values.max()), 1)
+    return stats
+
+async def send_request(session: aiohttp.ClientSession, base_url: str, workload: Workload, scenario: str,
+                       scheduled: float, timeout: float) -> Dict[str, Any]:
+    method, path, kwargs = workload.build(scenario)
+    sent = time.monotonic()
+    record = {'scenario': scenario, 'scheduled': scheduled, 'status': None, 'error': None}
+    try:
+        async with session.request(method, base_url + path, timeout=aiohttp.ClientTimeout(total=timeout),
+                                   **kwargs) as response:
+            body = await response.read()
+            record['status'] = response.status
+            record['bytes'] = len(body)
+            if response.status >= 400:
+                record['error'] = f"HTTP {response.status}: {body[:160].decode(errors='ignore')}"
+    except asyncio.TimeoutError:
+        record['error'] = 'timeout'
+    except aiohttp.ClientError as e:
+        record['error'] = f"{type(e).__name__}: {e}"
+    finished = time.monotonic()
+    record['latency'] = finished - scheduled
+    record['service_time'] = finished - sent
+    return record
+
+async def run_load(base_url: str, workload: Workload, mix: Dict[str, float], rps: float, duration: float,
+                   warmup: float, max_in_flight: int, timeout: float) -> Dict[str, Any]:
+    """Open-loop arrivals at a fixed rate; requests over max_in_flight are counted as dropped"""
+    scenarios = list(mix)
+    weights = [mix[scenario] for scenario in scenarios]
+    connector = aiohttp.TCPConnector(limit=max_in_flight)
+    records = []
+    dropped = Counter()
+    in_flight = set()
+
+    async with aiohttp.ClientSession(connector=connector) as session:
+        start = time.monotonic()
+        index = 0
+        while True:
+            offset = index / rps
+            if offset >= warmup + duration:
+                break
+            scheduled = start + offset
+            await asyncio.sleep(max(0.0, scheduled - time.monotonic()))
+            scenario = workload.rng.choices(scenarios, weights)[0]
+            measured = offset >= warmup
+            index += 1
+            if len(in_flight) >= max_in_flight:
+                if measured:
+                    dropped[scenario] += 1
+                continue
+
+            task = asyncio.ensure_future(send_request(session, base_url, workload, scenario, scheduled, timeout))
+            in_flight.add(task)
+
+            def done(task, measured=measured):
+                in_flight.discard(task)
+                if measured and not task.cancelled():
+                    records.append(task.result())
+            task.add_done_callback(done)
+
+        sending_finished = time.monotonic()
+        if in_flight:
+            await asyncio.wait(list(in_flight))
+        finished = time.monotonic()
+
+    return {
+        'records': records,
+        'dropped': dropped,
+        'measured_start': start + warmup,
+        'sending_seconds': sending_finished - start - warmup,
+        'drain_seconds': finished - sending_finished
+    }
+
+def build_report(run: Dict[str, Any], duration: float) -> Dict[str, Any]:
+    records = run['records']
+    by_scenario = defaultdict(list)
+    for record in records:
+        by_scenario[record['scenario']].append(record)
+
+    scenarios = {}
+    for scenario, scenario_records in sorted(by_scenario.items()):
+        errors = [record for record in scenario_records if record['error']]
+        scenarios[scenario] = {
+            'requests': len(scenario_records),
+            'errors': len(errors),
+            'error_rate': round(len(errors) / len(scenario_records), 4),
+            'dropped': run['dropped'].get(scenario, 0),
+            'latency': latency_stats([record['latency'] for record in scenario_records if not record['error']]),
+            'service_time': latency_stats([record['service_time'] for record in scenario_records if not record['error']]),
+            'status_codes': dict(Counter(str(record['status']) for record in scenario_records)),
+            'error_samples': sorted({record['error'] for record in errors})[:3]
+        }
+
+    ok = [record for record in records if not record['error']]
+    return {
+        'requests': len(records),
+        'succeeded': len(ok),
+        'errors': len(records) - len(ok),
+        'error_rate': round((len(records) - len(ok)) / len(records), 4) if records else 0.0,
+        'dropped': sum(run['dropped'].values()),
+        'achieved_rps': round(len(ok) / duration, 2) if duration else 0.0,
+        'drain_seconds': round(run['drain_seconds'], 2),
+        'latency': latency_stats([record['latency'] for record in ok]),
+        'scenarios': scenarios
+    }
+
+def print_report(report: Dict[str, Any]):
+    summary = report['summary']
+    print(f"\n{'scenario':<16} {'reqs':>6} {'err%':>6} {'p50 ms':>9} {'p90 ms':>9} {'p95 ms':>9} {'p99 ms':>9} {'max ms':>9}")
+    rows = list(summary['scenarios'].items()) + [('ALL', {**summary, 'error_rate': summary['error_rate']})]
+    for scenario, stats in rows:
+        latency = stats.get('latency', {})
+        print(f"{scenario:<16} {stats['requests']:>6} {stats['error_rate'] * 100:>6.1f} "
+              + " ".join(f"{latency.get(key, 0):>9.1f}" for key in ('p50_ms', 'p90_ms', 'p95_ms', 'p99_ms', 'max_ms')))
+    print(f"\nTarget {report['config']['rps']} rps, achieved {summary['achieved_rps']} rps; "
+          f"dropped {summary['dropped']}; drain {summary['drain_seconds']}s")
+    caches = report['config'].get('caches')
+    if caches is not None:
+        print(f"Service caches {'on' if caches else 'off'}")
+    resources = report.get('resources') or {}
+    if resources:
+        print(f"CPU mean {resources['cpu_percent_mean']}% (p95 {resources['cpu_percent_p95']}%, max {resources['cpu_percent_max']}%), "
+              f"RSS max {resources['rss_mb_max']} MB across {resources['processes_max']} processes")
+    for scenario, stats in summary['scenarios'].items():
+        for sample in stats['error_samples']:
+            print(f"⚠ {scenario}: {sample}")
+
+async def main_async(args) -> int:
+    service = SERVICES[args.service]
+    mix = parse_mix(args.mix or service['mix'])
+    fake_process = service_process = None
+    logs_dir = tempfile.mkdtemp(prefix='load_test_logs_')
+    fake_url = f"http://127.0.0.1:{args.fake_port}"
+
+    try:
+        if not args.service_url:
+            fake_log = os.path.join(logs_dir, 'fake_backends.log')
+            fake_process = start_process(
+                [sys.executable, os.path.join(os.path.dirname(os.path.abspath(__file__)), 'fake_backends.py'),
+                 '--port', str(args.fake_port), '--llm-latency-ms', str(args.llm_latency_ms),
+                 '--platform-latency-ms', str(args.platform_latency_ms), '--jitter', str(args.jitter),
+                 '--llm-error-rate', str(args.llm_error_rate)],
+                REPO_ROOT, dict(os.environ), fake_log)
+            if not await wait_for_http(f"{fake_url}/_stats", 30, fake_process):
+                print(f"✗ Fake backends failed to start:\n{log_tail(fake_log)}")
+                return 1
+
+            env = dict(os.environ)
+            env.update(service_env(fake_url))
+            env.update({
+                'GROQ_API_KEY': 'fake-load-test-key',
+                # The stub has no quota; keep the local limiter out of the measurement
+                'GROQ_REQUESTS_PER_MINUTE': '1000000',
+                'GROQ_TOKENS_PER_MINUTE': '1000000000',
+                'LANGCHAIN_TRACING_V2': 'false'
+            })
+            if not args.with_caches:
+                env.update({
+                    'LLM_CACHE_ENABLED': 'false',
+                    'RESULT_CACHE_MAX_MB': '0',
+                    'RESULT_CACHE_DB': '',
+                    'PROFILE_CACHE_MAX_ENTRIES': '0',
+                    'PROFILE_CACHE_DB': ''
+                })
+            for item in args.env:
+                key, _, value = item.partition('=')
+                env[key] = value
+
+            service_log = os.path.join(logs_dir, f"{args.service}.log")
+            service_process = start_process(
+                [sys.executable, '-m', 'uvicorn', service['app'], '--host', '127.0.0.1', '--port', str(args.port),
+                 '--log-level', 'warning'],
+                service['cwd'], env, service_log)
+            base_url = f"http://127.0.0.1:{args.port}"
+            boot_start = time.monotonic()
+            if not await wait_for_http(base_url + service['health'], args.boot_timeout, service_process):
+                print(f"✗ {args.service} failed to start:\n{log_tail(service_log)}")
+                return 1
+            boot_seconds = time.monotonic() - boot_start
+            print(f"✓ {args.service} up in {boot_seconds:.1f}s (logs in {logs_dir})")
+            service_pid = service_process.pid
+        else:
+            base_url = args.service_url.rstrip('/')
+            boot_seconds = None
+            service_pid = args.service_pid
+
+        workload = Workload(args.resumes, args.batch_size, args.seed)
+        print(f"… {args.rps} rps for {args.duration}s (+{args.warmup}s warm-up), mix {mix}")
+
+        sampler = ResourceSampler(service_pid) if service_pid else None
+        stop = asyncio.Event()
+        sampler_task = asyncio.ensure_future(sampler.run(stop)) if sampler else None
+        run = await run_load(base_url, workload, mix, args.rps, args.duration, args.warmup,
+                             args.max_in_flight, args.timeout)
+        stop.set()
+        if sampler_task:
+            await sampler_task
+
+        fake_stats = None
+        if fake_process is not None:
+            try:
+                async with aiohttp.ClientSession() as session:
+                    async with session.get(f"{fake_url}/_stats") as response:
+                        fake_stats = await response.json()
+            except aiohttp.ClientError:
+                pass
+
+        report = {
+            'created_at': datetime.now().isoformat(),
+            'git_commit': git_commit(),
+            'service': args.service,
+            'config': {
+                'rps': args.rps,
+                'duration_seconds': args.duration,
+                'warmup_seconds': args.warmup,
+                'mix': mix,
+                'resumes': args.resumes,
+                'batch_size': args.batch_size,
+                'max_in_flight': args.max_in_flight,
+                'timeout_seconds': args.timeout,
+                'llm_latency_ms': args.llm_latency_ms,
+                'platform_latency_ms': args.platform_latency_ms,
+                'jitter': args.jitter,
+                'llm_error_rate': args.llm_error_rate,
+                # Caches of an already running service (--service-url) are whatever it was started with
+                'caches': None if args.service_url else args.with_caches,
+                'env_overrides': args.env
+            },
+            'boot_seconds': round(boot_seconds, 2) if boot_seconds is not None else None,
+            'summary': build_report(run, args.duration),
+            'resources': sampler.summary(run['measured_start'] - time.monotonic() + time.time()) if sampler else None,
+            'fake_backends': fake_stats
+        }
+        print_report(report)
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2)
+        print(f"\n✓ Report written to {args.output}")
+        return 0
+    finally:
+        stop_process(service_process)
+        stop_process(fake_process)
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test a FastAPI service against stubbed LLM/platform backends")
+    parser.add_argument('--service', choices=sorted(SERVICES), default='ats3')
+    parser.add_argument('--rps', type=float, default=5.0, help="Target arrival rate (requests per second)")
+    parser.add_argument('--duration', type=float, default=60.0, help="Measured seconds")
+    parser.add_argument('--warmup', type=float, default=10.0, help="Seconds of load before measuring")
+    parser.add_argument('--mix', help="Scenario weights, e.g. analyze=4,analyze-text=3,batch-analyze=1,compare=2")
+    parser.add_argument('--resumes', type=int, default=20, help="Distinct synthetic resumes in the request pool")
+    parser.add_argument('--batch-size', type=int, default=3, help="Files per /batch-analyze request")
+    parser.add_argument('--max-in-flight', type=int, default=256)
+    parser.add_argument('--timeout', type=float, default=120.0, help="Per-request client timeout (seconds)")
+    parser.add_argument('--llm-latency-ms', type=float, default=800)
+    parser.add_argument('--platform-latency-ms', type=float, default=150)
+    parser.add_argument('--jitter', type=float, default=0.25)
+    parser.add_argument('--llm-error-rate', type=float, default=0.0)
+    parser.add_argument('--port', type=int, default=8800, help="Port for the service under test")
+    parser.add_argument('--fake-port', type=int, default=8790, help="Port for the fake backends")
+    parser.add_argument('--boot-timeout', type=float, default=180.0)
+    parser.add_argument('--with-caches', action='store_true',
+                        help="Leave the service's LLM, result and profile caches on (off by default)")
+    parser.add_argument('--env', action='append', default=[], help="Extra KEY=VALUE for the service environment")
+    parser.add_argument('--service-url', help="Load an already running service instead of booting one")
+    parser.add_argument('--service-pid', type=int, help="PID to sample CPU/RSS for with --service-url")
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--output', default='load_test.json')
+    args = parser.parse_args()
+
+    sys.exit(asyncio.run(main_async(args)))
+
+if __name__ == "__main__":
+    main()
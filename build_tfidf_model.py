@@ -0,0 +1,94 @@
+"""
+Fit the TF-IDF vocabulary used by ats3.py for resume <-> job description similarity.
+
+Usage:
+    python build_tfidf_model.py <corpus_dir> [<corpus_dir> ...] [--output tfidf_model]
+
+Every .txt, .md, .pdf and .docx file under the corpus directories is one document.
+The output directory gets vocabulary.json, idf.npy and model.json; point
+TFIDF_MODEL_DIR at it (ats3.py looks for ./tfidf_model next to itself by default).
+"""
+
+import argparse
+import io
+import json
+import os
+from datetime import datetime
+
+import docx
+import fitz  # PyMuPDF
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+
+CORPUS_EXTENSIONS = ('.txt', '.md', '.pdf', '.docx')
+
+def read_document(path: str) -> str:
+    """Plain text of a corpus file"""
+    if path.lower().endswith('.pdf'):
+        with fitz.open(path) as pdf:
+            return "\n".join(page.get_text() for page in pdf)
+    if path.lower().endswith('.docx'):
+        with open(path, 'rb') as f:
+            document = docx.Document(io.BytesIO(f.read()))
+        return "\n".join(paragraph.text for paragraph in document.paragraphs)
+    with open(path, 'r', encoding='utf-8', errors='ignore') as f:
+        return f.read()
+
+def iter_corpus(corpus_dirs):
+    for corpus_dir in corpus_dirs:
+        for root, _, files in os.walk(corpus_dir):
+            for name in sorted(files):
+                if name.lower().endswith(CORPUS_EXTENSIONS):
+                    path = os.path.join(root, name)
+                    try:
+                        text = read_document(path)
+                    except Exception as e:
+                        print(f"⚠ Skipping {path}: {e}")
+                        continue
+                    if text.strip():
+                        yield text
+
+def build_model(corpus_dirs, output_dir: str, max_features: int, min_df: int, sublinear_tf: bool):
+    documents = list(iter_corpus(corpus_dirs))
+    if len(documents) < 2:
+        raise SystemExit("Need at least two documents to fit IDF weights")
+
+    # Same preprocessing as the per-request vectorizer in ats3.py
+    vectorizer = TfidfVectorizer(
+        stop_words='english',
+        ngram_range=(1, 2),
+        max_features=max_features,
+        min_df=min_df,
+        max_df=0.95,
+        sublinear_tf=sublinear_tf
+    )
+    vectorizer.fit(doc.lower() for doc in documents)
+
+    terms = vectorizer.get_feature_names_out()
+    os.makedirs(output_dir, exist_ok=True)
+    with open(os.path.join(output_dir, 'vocabulary.json'), 'w', encoding='utf-8') as f:
+        json.dump(terms.tolist(), f)
+    np.save(os.path.join(output_dir, 'idf.npy'), vectorizer.idf_.astype(np.float64))
+    with open(os.path.join(output_dir, 'model.json'), 'w', encoding='utf-8') as f:
+        json.dump({
+            'ngram_range': [1, 2],
+            'stop_words': 'english',
+            'sublinear_tf': sublinear_tf,
+            'min_df': min_df,
+            'max_features': max_features,
+            'n_documents': len(documents),
+            'created_at': datetime.now().isoformat()
+        }, f, indent=2)
+
+    print(f"✓ Fitted {len(terms)} terms on {len(documents)} documents -> {output_dir}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Fit the pre-computed TF-IDF model used by ats3.py")
+    parser.add_argument('corpus_dirs', nargs='+', help="Directories of resumes and job descriptions")
+    parser.add_argument('--output', default=os.path.join(os.path.dirname(os.path.abspath(__file__)), 'tfidf_model'))
+    parser.add_argument('--max-features', type=int, default=50000)
+    parser.add_argument('--min-df', type=int, default=2)
+    parser.add_argument('--sublinear-tf', action='store_true')
+    args = parser.parse_args()
+
+    build_model(args.corpus_dirs, args.output, args.max_features, args.min_df, args.sublinear_tf)
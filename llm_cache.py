@@ -0,0 +1,215 @@
+"""
+Provider-agnostic cache for LLM completions, shared by the Groq, Gemini and Ollama services.
+
+The key is a SHA-256 over the provider, model, whitespace-normalised system and user
+prompts and the sampling parameters, so re-indenting a prompt template does not
+invalidate entries but changing the model, prompt or max_tokens does. Entries live in
+an in-memory LRU and, when LLM_CACHE_DB is set, in a SQLite file that survives
+restarts. Both tiers expire entries after LLM_CACHE_TTL_SECONDS.
+
+Only near-deterministic calls are cached: a call whose temperature is above
+LLM_CACHE_MAX_TEMPERATURE, or that leaves temperature to the provider default
+(typically ~1.0), gets no key and goes straight to the provider.
+
+Usage:
+    cache_key = llm_cache.make_key("groq", model, prompt, system=system_prompt,
+                                   params={"temperature": 0.1, "max_tokens": 1500})
+    cached = llm_cache.get(cache_key)
+    if cached is not None:
+        return cached
+    ...call the provider...
+    llm_cache.set(cache_key, content, "groq", model, prompt_tokens, completion_tokens)
+"""
+
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+class LLMCache:
+    """Two-tier (memory LRU + optional SQLite) cache of LLM responses with TTL and token accounting"""
+
+    def __init__(self, max_entries: int = 2000, ttl_seconds: int = 86400, db_path: Optional[str] = None,
+                 max_temperature: float = 0.2, enabled: bool = True):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.max_temperature = max_temperature
+        self.enabled = enabled and max_entries > 0
+        self.memory: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self.lock = threading.Lock()
+        self.db = None
+        self.writes_since_purge = 0
+        self.stats = {
+            'hits': 0,
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'misses': 0,
+            'sets': 0,
+            'bypassed': 0,
+            'saved_prompt_tokens': 0,
+            'saved_completion_tokens': 0
+        }
+
+        if self.enabled and db_path:
+            try:
+                self.db = sqlite3.connect(db_path, check_same_thread=False)
+                self.db.execute(
+                    "CREATE TABLE IF NOT EXISTS llm_responses ("
+                    "cache_key TEXT PRIMARY KEY, provider TEXT, model TEXT, response TEXT NOT NULL, "
+                    "prompt_tokens INTEGER, completion_tokens INTEGER, created_at REAL NOT NULL)"
+                )
+                self.db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache database unavailable ({db_path}): {e}")
+                self.db = None
+
+    @classmethod
+    def from_env(cls) -> "LLMCache":
+        return cls(
+            max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "2000")),
+            ttl_seconds=int(os.getenv("LLM_CACHE_TTL_SECONDS", str(24 * 3600))),
+            db_path=os.getenv("LLM_CACHE_DB") or None,
+            max_temperature=float(os.getenv("LLM_CACHE_MAX_TEMPERATURE", "0.2")),
+            enabled=os.getenv("LLM_CACHE_ENABLED", "true").lower() in ("1", "true", "yes")
+        )
+
+    @staticmethod
+    def normalize(text: Optional[str]) -> str:
+        """Collapse whitespace so indentation-only template changes map to the same key"""
+        return " ".join((text or "").split())
+
+    @staticmethod
+    def normalize_params(params: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        normalized = {}
+        for name, value in sorted((params or {}).items()):
+            if value is None:
+                continue
+            normalized[name] = round(value, 4) if isinstance(value, float) else value
+        return normalized
+
+    def make_key(self, provider: str, model: str, prompt: str, system: Optional[str] = None,
+                 params: Optional[Dict[str, Any]] = None) -> Optional[str]:
+        """Cache key for a call, or None when the call should not be cached"""
+        if not self.enabled:
+            return None
+        temperature = (params or {}).get('temperature')
+        # Sampled output (explicitly or at the provider's default temperature) must not be replayed
+        if temperature is None or temperature > self.max_temperature:
+            with self.lock:
+                self.stats['bypassed'] += 1
+            return None
+        fingerprint = json.dumps([
+            provider.lower(),
+            model or "",
+            self.normalize(system),
+            self.normalize(prompt),
+            self.normalize_params(params)
+        ], sort_keys=True, default=str)
+        return hashlib.sha256(fingerprint.encode('utf-8')).hexdigest()
+
+    def _expired(self, entry: Dict[str, Any]) -> bool:
+        return time.time() - entry['created_at'] > self.ttl_seconds
+
+    def _record_hit(self, entry: Dict[str, Any], tier: str):
+        self.stats['hits'] += 1
+        self.stats[f"{tier}_hits"] += 1
+        self.stats['saved_prompt_tokens'] += entry.get('prompt_tokens') or 0
+        self.stats['saved_completion_tokens'] += entry.get('completion_tokens') or 0
+
+    def _remember(self, key: str, entry: Dict[str, Any]):
+        self.memory[key] = entry
+        self.memory.move_to_end(key)
+        while len(self.memory) > self.max_entries:
+            self.memory.popitem(last=False)
+
+    def get(self, key: Optional[str]) -> Optional[str]:
+        """Cached response text, or None on a miss (or when key is None)"""
+        if key is None:
+            return None
+        with self.lock:
+            entry = self.memory.get(key)
+            if entry is not None:
+                if not self._expired(entry):
+                    self.memory.move_to_end(key)
+                    self._record_hit(entry, 'memory')
+                    return entry['response']
+                del self.memory[key]
+
+            if self.db is not None:
+                try:
+                    row = self.db.execute(
+                        "SELECT provider, model, response, prompt_tokens, completion_tokens, created_at "
+                        "FROM llm_responses WHERE cache_key = ?", (key,)
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    logger.warning(f"LLM cache read failed: {e}")
+                    row = None
+                if row is not None:
+                    entry = dict(zip(('provider', 'model', 'response', 'prompt_tokens', 'completion_tokens', 'created_at'), row))
+                    if not self._expired(entry):
+                        self._remember(key, entry)
+                        self._record_hit(entry, 'disk')
+                        return entry['response']
+
+            self.stats['misses'] += 1
+            return None
+
+    def set(self, key: Optional[str], response: str, provider: Optional[str] = None, model: Optional[str] = None,
+            prompt_tokens: Optional[int] = None, completion_tokens: Optional[int] = None):
+        """Store a successful response; callers should not cache errors or truncated output"""
+        if key is None or not response:
+            return
+        entry = {
+            'provider': provider,
+            'model': model,
+            'response': response,
+            'prompt_tokens': prompt_tokens,
+            'completion_tokens': completion_tokens,
+            'created_at': time.time()
+        }
+        with self.lock:
+            self._remember(key, entry)
+            self.stats['sets'] += 1
+            if self.db is None:
+                return
+            try:
+                self.db.execute(
+                    "INSERT OR REPLACE INTO llm_responses "
+                    "(cache_key, provider, model, response, prompt_tokens, completion_tokens, created_at) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                    (key, provider, model, response, prompt_tokens, completion_tokens, entry['created_at'])
+                )
+                self.writes_since_purge += 1
+                if self.writes_since_purge >= 100:
+                    self.db.execute("DELETE FROM llm_responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+                    self.writes_since_purge = 0
+                self.db.commit()
+            except sqlite3.Error as e:
+                logger.warning(f"LLM cache write failed: {e}")
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.stats['hits'] + self.stats['misses']
+            disk_entries = None
+            if self.db is not None:
+                try:
+                    disk_entries = self.db.execute("SELECT COUNT(*) FROM llm_responses").fetchone()[0]
+                except sqlite3.Error:
+                    pass
+            return {
+                **self.stats,
+                'enabled': self.enabled,
+                'hit_rate': round(self.stats['hits'] / lookups, 4) if lookups else 0.0,
+                'memory_entries': len(self.memory),
+                'disk_entries': disk_entries,
+                'max_entries': self.max_entries,
+                'ttl_seconds': self.ttl_seconds,
+                'max_temperature': self.max_temperature
+            }
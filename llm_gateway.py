@@ -0,0 +1,726 @@
+"""
+Provider-agnostic LLM gateway shared by the Groq, Ollama and Gemini services.
+
+Retry, timeout, fallback and hedging policy for every completion lives here instead
+of in each service:
+
+- Connection pooling: one keep-alive httpx client per event loop (LLM_MAX_CONNECTIONS).
+- Retries: 408/409/425/429/5xx and transport errors are retried up to LLM_MAX_RETRIES
+  times with exponential backoff and full jitter, honouring retry-after when sent.
+- Circuit breakers: LLM_BREAKER_FAILURES consecutive failures open a provider's
+  breaker for LLM_BREAKER_RESET_SECONDS; calls fail fast until a half-open probe
+  succeeds. Rate limiting (429) is not counted as a failure.
+- Model fallback: a call takes an ordered model list (a single model is extended
+  with <PROVIDER>_FALLBACK_MODELS); the next model is tried when a model is unknown
+  or exhausted its retries.
+- Hedging: when LLM_HEDGE_AFTER_SECONDS is set (a number, or "auto" for the model's
+  recent p95 latency), a second identical request is sent if the first has not
+  answered by then and whichever finishes first wins. Off by default since it can
+  double token spend.
+
+Async services await complete(); sync callers (Flask, thread-pool code) use
+complete_sync(), which runs the same coroutine on a private background loop.
+stream() yields text deltas as the provider generates them; retries and fallback
+apply until the first token arrives (streams are not hedged).
+
+Usage:
+    response = await llm_gateway.complete("groq", ["llama-3.3-70b-versatile", "llama-3.1-8b-instant"],
+                                          prompt, system=system_prompt, max_tokens=1500, temperature=0.1)
+    response.text, response.model, response.finish_reason, response.completion_tokens
+"""
+
+import asyncio
+import json
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+
+import httpx
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+
+class LLMError(Exception):
+    """A failed completion; retryable errors are worth another attempt on the same model"""
+
+    def __init__(self, message: str, provider: Optional[str] = None, model: Optional[str] = None,
+                 status: Optional[int] = None, retryable: bool = False, headers: Optional[Dict[str, str]] = None):
+        super().__init__(message)
+        self.provider = provider
+        self.model = model
+        self.status = status
+        self.retryable = retryable
+        self.headers = headers or {}
+
+    @property
+    def model_error(self) -> bool:
+        """The model itself is unknown or unavailable, so another model may still work"""
+        return self.status == 404 or (self.status == 400 and "model" in str(self).lower())
+
+    @property
+    def retry_after(self) -> Optional[float]:
+        try:
+            return float(self.headers.get('retry-after'))
+        except (TypeError, ValueError):
+            return None
+
+class CircuitOpenError(LLMError):
+    """The provider's circuit breaker is open; the call was not attempted"""
+
+@dataclass
+class LLMResponse:
+    text: str
+    provider: str
+    model: str
+    finish_reason: Optional[str] = None  # normalised: "stop", "length", ...
+    prompt_tokens: Optional[int] = None
+    completion_tokens: Optional[int] = None
+    headers: Dict[str, str] = field(default_factory=dict)
+    latency: float = 0.0
+    attempts: int = 1
+    hedged: bool = False
+
+@dataclass
+class ProviderConfig:
+    name: str
+    base_url: str
+    api_key: Optional[str] = None
+    timeout: float = 60.0
+    fallback_models: List[str] = field(default_factory=list)
+
+class CircuitBreaker:
+    """Consecutive-failure breaker: closed -> open -> half-open (one probe) -> closed"""
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.probe_in_flight = False
+        self.times_opened = 0
+        self.lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        if self.opened_at is None:
+            return "closed"
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return "half_open"
+        return "open"
+
+    def allow(self) -> bool:
+        with self.lock:
+            state = self.state
+            if state == "closed":
+                return True
+            if state == "half_open" and not self.probe_in_flight:
+                self.probe_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self.lock:
+            self.failures = 0
+            self.opened_at = None
+            self.probe_in_flight = False
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.probe_in_flight or (self.opened_at is None and self.failures >= self.failure_threshold):
+                if self.opened_at is None:
+                    self.times_opened += 1
+                self.opened_at = time.monotonic()
+            self.probe_in_flight = False
+
+    def release_probe(self):
+        """A half-open probe ended without a verdict (e.g. rate limited)"""
+        with self.lock:
+            self.probe_in_flight = False
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {'state': self.state, 'consecutive_failures': self.failures, 'times_opened': self.times_opened}
+
+# ----- Provider wire formats: (url, headers, body) builders and response parsers -----
+
+def groq_request(config: ProviderConfig, model: str, prompt: str, system: Optional[str],
+                 params: Dict[str, Any], options: Dict[str, Any]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    messages = [{"role": "system", "content": system}] if system else []
+    messages.append({"role": "user", "content": prompt})
+    body = {"model": model, "messages": messages}
+    body.update({name: value for name, value in params.items() if value is not None})
+    body.update(options)
+    headers = {"Authorization": f"Bearer {config.api_key}"} if config.api_key else {}
+    return f"{config.base_url}/openai/v1/chat/completions", headers, body
+
+def groq_parse(data: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[int], Optional[int]]:
+    choice = (data.get('choices') or [{}])[0]
+    usage = data.get('usage') or {}
+    return ((choice.get('message') or {}).get('content') or "", choice.get('finish_reason'),
+            usage.get('prompt_tokens'), usage.get('completion_tokens'))
+
+def ollama_request(config: ProviderConfig, model: str, prompt: str, system: Optional[str],
+                   params: Dict[str, Any], options: Dict[str, Any]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    ollama_options = {
+        "temperature": params.get('temperature'),
+        "top_p": params.get('top_p'),
+        "num_predict": params.get('max_tokens')
+    }
+    ollama_options = {name: value for name, value in ollama_options.items() if value is not None}
+    ollama_options.update(options)
+    body = {"model": model, "prompt": prompt, "stream": False, "options": ollama_options}
+    if system:
+        body["system"] = system
+    return f"{config.base_url}/api/generate", {}, body
+
+def ollama_parse(data: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[int], Optional[int]]:
+    return (data.get('response') or "", data.get('done_reason', 'stop' if data.get('done', True) else None),
+            data.get('prompt_eval_count'), data.get('eval_count'))
+
+def gemini_request(config: ProviderConfig, model: str, prompt: str, system: Optional[str],
+                   params: Dict[str, Any], options: Dict[str, Any]) -> Tuple[str, Dict[str, str], Dict[str, Any]]:
+    generation_config = {
+        "maxOutputTokens": params.get('max_tokens'),
+        "temperature": params.get('temperature'),
+        "topP": params.get('top_p')
+    }
+    generation_config = {name: value for name, value in generation_config.items() if value is not None}
+    generation_config.update(options)
+    body = {"contents": [{"role": "user", "parts": [{"text": prompt}]}]}
+    if generation_config:
+        body["generationConfig"] = generation_config
+    if system:
+        body["systemInstruction"] = {"parts": [{"text": system}]}
+    headers = {"x-goog-api-key": config.api_key} if config.api_key else {}
+    # Accept the SDK's "models/<name>" form as well as the bare model name
+    model = model.split('/')[-1]
+    return f"{config.base_url}/v1beta/models/{model}:generateContent", headers, body
+
+def gemini_parse(data: Dict[str, Any]) -> Tuple[str, Optional[str], Optional[int], Optional[int]]:
+    candidate = (data.get('candidates') or [{}])[0]
+    usage = data.get('usageMetadata') or {}
+    text = "".join(part.get('text', '') for part in (candidate.get('content') or {}).get('parts', []))
+    return text, candidate.get('finishReason'), usage.get('promptTokenCount'), usage.get('candidatesTokenCount')
+
+PROVIDER_FORMATS = {
+    "groq": (groq_request, groq_parse),
+    "ollama": (ollama_request, ollama_parse),
+    "gemini": (gemini_request, gemini_parse)
+}
+
+# ----- Streaming: request tweaks and per-line chunk parsers -----
+
+def sse_data(line: str) -> Optional[Dict[str, Any]]:
+    """JSON payload of a Server-Sent Events `data:` line; None for other lines and [DONE]"""
+    if not line.startswith("data:"):
+        return None
+    payload = line[5:].strip()
+    if not payload or payload == "[DONE]":
+        return None
+    return json.loads(payload)
+
+def groq_stream_parse(line: str) -> Optional[Tuple[str, Optional[str], Optional[int], Optional[int]]]:
+    data = sse_data(line)
+    if data is None:
+        return None
+    choice = (data.get('choices') or [{}])[0]
+    # Groq reports usage on the final chunk under x_groq; OpenAI-style servers use usage
+    usage = data.get('usage') or (data.get('x_groq') or {}).get('usage') or {}
+    return ((choice.get('delta') or {}).get('content') or "", choice.get('finish_reason'),
+            usage.get('prompt_tokens'), usage.get('completion_tokens'))
+
+def ollama_stream_parse(line: str) -> Optional[Tuple[str, Optional[str], Optional[int], Optional[int]]]:
+    if not line.strip():
+        return None
+    data = json.loads(line)
+    if data.get('error'):
+        raise ValueError(data['error'])
+    if not data.get('done'):
+        return data.get('response') or "", None, None, None
+    return ollama_parse(data)
+
+def gemini_stream_parse(line: str) -> Optional[Tuple[str, Optional[str], Optional[int], Optional[int]]]:
+    data = sse_data(line)
+    return None if data is None else gemini_parse(data)
+
+STREAM_FORMATS = {
+    "groq": (lambda url, headers, body: (url, headers, {**body, "stream": True}), groq_stream_parse),
+    "ollama": (lambda url, headers, body: (url, headers, {**body, "stream": True}), ollama_stream_parse),
+    "gemini": (lambda url, headers, body: (url.replace(":generateContent", ":streamGenerateContent?alt=sse"),
+                                           headers, body), gemini_stream_parse)
+}
+
+FINISH_REASONS = {"max_tokens": "length", "end_turn": "stop"}
+
+def normalize_finish_reason(reason: Optional[str]) -> Optional[str]:
+    if reason is None:
+        return None
+    reason = str(reason).lower()
+    return FINISH_REASONS.get(reason, reason)
+
+def error_message(response: httpx.Response) -> str:
+    """Provider error text from a JSON error body, falling back to the raw body"""
+    try:
+        data = response.json()
+    except ValueError:
+        return response.text[:300] or f"HTTP {response.status_code}"
+    error = data.get('error') if isinstance(data, dict) else None
+    if isinstance(error, dict):
+        return error.get('message') or str(error)
+    return str(error or data)[:300]
+
+def env_list(name: str, default: str = "") -> List[str]:
+    return [item.strip() for item in os.getenv(name, default).split(",") if item.strip()]
+
+class LLMGateway:
+    """Pooled, retrying, circuit-broken and optionally hedged completions across LLM providers"""
+
+    def __init__(self, providers: Dict[str, ProviderConfig], max_retries: int = 2, retry_base_delay: float = 0.5,
+                 retry_max_delay: float = 8.0, max_connections: int = 20, breaker_failures: int = 5,
+                 breaker_reset_seconds: float = 30.0, hedge_after: Union[float, str, None] = None):
+        self.providers = providers
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.retry_max_delay = retry_max_delay
+        self.max_connections = max_connections
+        self.hedge_after = hedge_after
+        self.breakers = {name: CircuitBreaker(breaker_failures, breaker_reset_seconds) for name in providers}
+        # httpx.AsyncClient is bound to the loop it was first used on
+        self.clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+        self.latencies: Dict[Tuple[str, str], deque] = {}
+        self.stats: Dict[str, Dict[str, int]] = {}
+        self.lock = threading.Lock()
+        self.sync_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @classmethod
+    def from_env(cls) -> "LLMGateway":
+        timeout = float(os.getenv("LLM_TIMEOUT_SECONDS", "60"))
+        providers = {
+            "groq": ProviderConfig(
+                name="groq",
+                base_url=os.getenv("GROQ_BASE_URL", "https://api.groq.com").rstrip("/"),
+                api_key=os.getenv("GROQ_API_KEY") or None,
+                timeout=timeout,
+                fallback_models=env_list("GROQ_FALLBACK_MODELS", "llama-3.1-8b-instant")
+            ),
+            "ollama": ProviderConfig(
+                name="ollama",
+                base_url=os.getenv("OLLAMA_BASE_URL", "http://localhost:11434").rstrip("/"),
+                # Local generation of long documents is slow; keep the historical 10-minute ceiling
+                timeout=float(os.getenv("OLLAMA_TIMEOUT_SECONDS", "600")),
+                fallback_models=env_list("OLLAMA_FALLBACK_MODELS")
+            ),
+            "gemini": ProviderConfig(
+                name="gemini",
+                base_url=os.getenv("GEMINI_BASE_URL", "https://generativelanguage.googleapis.com").rstrip("/"),
+                api_key=os.getenv("GEMINI_API_KEY") or os.getenv("GOOGLE_API_KEY") or None,
+                timeout=timeout,
+                fallback_models=env_list("GEMINI_FALLBACK_MODELS")
+            )
+        }
+        hedge_after = os.getenv("LLM_HEDGE_AFTER_SECONDS", "0").strip().lower()
+        return cls(
+            providers,
+            max_retries=int(os.getenv("LLM_MAX_RETRIES", "2")),
+            retry_base_delay=float(os.getenv("LLM_RETRY_BASE_DELAY", "0.5")),
+            retry_max_delay=float(os.getenv("LLM_RETRY_MAX_DELAY", "8")),
+            max_connections=int(os.getenv("LLM_MAX_CONNECTIONS", "20")),
+            breaker_failures=int(os.getenv("LLM_BREAKER_FAILURES", "5")),
+            breaker_reset_seconds=float(os.getenv("LLM_BREAKER_RESET_SECONDS", "30")),
+            hedge_after=hedge_after if hedge_after == "auto" else (float(hedge_after) or None)
+        )
+
+    def configure(self, provider: str, **settings):
+        """Override provider settings a service owns (API key, base URL, timeout, fallback models)"""
+        config = self.providers[provider]
+        for name, value in settings.items():
+            if value is None:
+                continue
+            if name == 'base_url':
+                value = value.rstrip("/")
+            setattr(config, name, value)
+
+    def is_configured(self, provider: str) -> bool:
+        config = self.providers.get(provider)
+        return config is not None and (provider == "ollama" or bool(config.api_key))
+
+    # ----- Connection pool -----
+
+    def get_client(self) -> httpx.AsyncClient:
+        loop = asyncio.get_running_loop()
+        client = self.clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(
+                limits=httpx.Limits(max_connections=self.max_connections,
+                                    max_keepalive_connections=self.max_connections,
+                                    keepalive_expiry=60)
+            )
+            self.clients[loop] = client
+        return client
+
+    async def aclose(self):
+        """Close the current loop's pooled client (call from the service's shutdown hook)"""
+        client = self.clients.pop(asyncio.get_running_loop(), None)
+        if client is not None:
+            await client.aclose()
+
+    # ----- Bookkeeping -----
+
+    def count(self, provider: str, stat: str, amount: int = 1):
+        with self.lock:
+            provider_stats = self.stats.setdefault(provider, {})
+            provider_stats[stat] = provider_stats.get(stat, 0) + amount
+
+    def record_latency(self, provider: str, model: str, seconds: float):
+        with self.lock:
+            self.latencies.setdefault((provider, model), deque(maxlen=200)).append(seconds)
+
+    def latency_percentile(self, provider: str, model: str, percentile: float) -> Optional[float]:
+        with self.lock:
+            samples = sorted(self.latencies.get((provider, model), ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * percentile))]
+
+    def hedge_delay(self, provider: str, model: str, hedge_after: Union[float, str, None]) -> Optional[float]:
+        if hedge_after == "auto":
+            with self.lock:
+                samples = len(self.latencies.get((provider, model), ()))
+            # Too few samples for a meaningful tail estimate
+            return self.latency_percentile(provider, model, 0.95) if samples >= 20 else None
+        return hedge_after or None
+
+    def backoff(self, attempt: int, retry_after: Optional[float] = None) -> float:
+        """Full-jitter exponential backoff; a server-provided retry-after takes precedence"""
+        if retry_after is not None:
+            return min(retry_after, self.retry_max_delay * 4)
+        return random.uniform(0, min(self.retry_max_delay, self.retry_base_delay * (2 ** attempt)))
+
+    # ----- Calls -----
+
+    async def send(self, config: ProviderConfig, model: str, url: str, headers: Dict[str, str],
+                   body: Dict[str, Any], timeout: float) -> LLMResponse:
+        """One HTTP attempt, translated into an LLMResponse or an LLMError"""
+        parse = PROVIDER_FORMATS[config.name][1]
+        started = time.perf_counter()
+        try:
+            response = await self.get_client().post(url, json=body, headers=headers, timeout=timeout)
+        except httpx.TimeoutException as e:
+            raise LLMError(f"{config.name} request timed out after {timeout}s", config.name, model,
+                           retryable=True) from e
+        except httpx.TransportError as e:
+            raise LLMError(f"{config.name} connection error: {e}", config.name, model, retryable=True) from e
+
+        response_headers = dict(response.headers)
+        if response.status_code != 200:
+            raise LLMError(f"{config.name} HTTP {response.status_code}: {error_message(response)}", config.name, model,
+                           status=response.status_code, retryable=response.status_code in RETRYABLE_STATUS,
+                           headers=response_headers)
+        try:
+            text, finish_reason, prompt_tokens, completion_tokens = parse(response.json())
+        except (ValueError, AttributeError, TypeError) as e:
+            raise LLMError(f"{config.name} returned an unreadable response: {e}", config.name, model,
+                           status=response.status_code, retryable=True, headers=response_headers) from e
+        latency = time.perf_counter() - started
+        self.record_latency(config.name, model, latency)
+        return LLMResponse(
+            text=text,
+            provider=config.name,
+            model=model,
+            finish_reason=normalize_finish_reason(finish_reason),
+            prompt_tokens=prompt_tokens,
+            completion_tokens=completion_tokens,
+            headers=response_headers,
+            latency=latency
+        )
+
+    async def send_hedged(self, config: ProviderConfig, model: str, request: Tuple[str, Dict[str, str], Dict[str, Any]],
+                          timeout: float, hedge_delay: Optional[float],
+                          before_send: Optional[Callable[[str], Awaitable[Any]]] = None) -> LLMResponse:
+        """Send once; if no answer within hedge_delay, send a duplicate and keep the first success"""
+        if before_send:
+            await before_send(model)
+        if hedge_delay is None:
+            return await self.send(config, model, *request, timeout)
+
+        async def send_hedge() -> LLMResponse:
+            if before_send:
+                await before_send(model)
+            return await self.send(config, model, *request, timeout)
+
+        primary = asyncio.ensure_future(self.send(config, model, *request, timeout))
+        pending = {primary}
+        error: Optional[BaseException] = None
+        try:
+            done, _ = await asyncio.wait(pending, timeout=hedge_delay)
+            if done:
+                return primary.result()
+
+            self.count(config.name, 'hedges')
+            hedge = asyncio.ensure_future(send_hedge())
+            pending.add(hedge)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.count(config.name, 'hedge_wins')
+                        result = task.result()
+                        result.hedged = True
+                        return result
+                    error = task.exception()
+            raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    def enter_breaker(self, config: ProviderConfig, model: str) -> CircuitBreaker:
+        breaker = self.breakers[config.name]
+        if not breaker.allow():
+            self.count(config.name, 'short_circuited')
+            raise CircuitOpenError(f"{config.name} circuit breaker is open", config.name, model, status=503)
+        self.count(config.name, 'attempts')
+        return breaker
+
+    async def after_failure(self, config: ProviderConfig, model: str, breaker: CircuitBreaker,
+                            error: LLMError, attempt: int):
+        """Update the breaker, then back off before the next attempt or re-raise when out of attempts"""
+        if error.retryable and error.status != 429:
+            breaker.record_failure()
+        else:
+            # Throttling and bad requests say nothing about provider health
+            breaker.release_probe()
+        if not error.retryable or attempt == self.max_retries:
+            raise error
+        self.count(config.name, 'retries')
+        delay = self.backoff(attempt, error.retry_after)
+        logger.warning(f"{config.name}/{model} attempt {attempt + 1} failed ({error}); retrying in {delay:.2f}s")
+        await asyncio.sleep(delay)
+
+    async def call_model(self, config: ProviderConfig, model: str, request: Tuple[str, Dict[str, str], Dict[str, Any]],
+                         timeout: float, hedge_after: Union[float, str, None],
+                         before_send: Optional[Callable[[str], Awaitable[Any]]] = None) -> LLMResponse:
+        """Retry one model with backoff under the provider's circuit breaker"""
+        for attempt in range(self.max_retries + 1):
+            breaker = self.enter_breaker(config, model)
+            try:
+                response = await self.send_hedged(config, model, request, timeout,
+                                                  self.hedge_delay(config.name, model, hedge_after), before_send)
+            except LLMError as e:
+                await self.after_failure(config, model, breaker, e, attempt)
+            except asyncio.CancelledError:
+                breaker.release_probe()
+                raise
+            else:
+                breaker.record_success()
+                response.attempts = attempt + 1
+                return response
+
+    def resolve_models(self, provider: str, models: Union[str, Sequence[str]]) -> Tuple[ProviderConfig, List[str]]:
+        if provider not in self.providers:
+            raise LLMError(f"Unknown LLM provider: {provider}", provider)
+        config = self.providers[provider]
+        if isinstance(models, str):
+            models = [models] + [fallback for fallback in config.fallback_models if fallback != models]
+        if not models:
+            raise LLMError(f"No {provider} model configured", provider)
+        return config, list(models)
+
+    async def complete(self, provider: str, models: Union[str, Sequence[str]], prompt: str,
+                       system: Optional[str] = None, max_tokens: Optional[int] = None,
+                       temperature: Optional[float] = None, top_p: Optional[float] = None,
+                       options: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+                       hedge_after: Union[float, str, None] = None,
+                       before_send: Optional[Callable[[str], Awaitable[Any]]] = None) -> LLMResponse:
+        """
+        Completion from the first model in `models` that answers. A single model name is
+        extended with the provider's configured fallbacks; an explicit list is used as given.
+        `options` are passed through in the provider's own format (e.g. Ollama num_ctx).
+        `before_send(model)` is awaited before every HTTP request, including retries,
+        fallbacks and hedged duplicates, so callers can charge per-model rate limits.
+        Raises LLMError when every model failed.
+        """
+        config, models = self.resolve_models(provider, models)
+        build_request = PROVIDER_FORMATS[provider][0]
+        params = {'max_tokens': max_tokens, 'temperature': temperature, 'top_p': top_p}
+        self.count(provider, 'requests')
+
+        last_error: Optional[LLMError] = None
+        for index, model in enumerate(models):
+            if index:
+                self.count(provider, 'fallbacks')
+                logger.warning(f"{provider}/{models[index - 1]} failed ({last_error}); falling back to {model}")
+            request = build_request(config, model, prompt, system, params, dict(options or {}))
+            try:
+                response = await self.call_model(config, model, request, timeout or config.timeout,
+                                                 self.hedge_after if hedge_after is None else hedge_after,
+                                                 before_send)
+                self.count(provider, 'successes')
+                return response
+            except CircuitOpenError:
+                self.count(provider, 'failures')
+                raise
+            except LLMError as e:
+                last_error = e
+                # Bad requests and auth failures would fail the same way on every model
+                if not (e.retryable or e.model_error):
+                    break
+        self.count(provider, 'failures')
+        raise last_error
+
+    async def stream(self, provider: str, models: Union[str, Sequence[str]], prompt: str,
+                     system: Optional[str] = None, max_tokens: Optional[int] = None,
+                     temperature: Optional[float] = None, top_p: Optional[float] = None,
+                     options: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None,
+                     info: Optional[Dict[str, Any]] = None):
+        """
+        Async iterator of text deltas from a streamed completion.
+
+        Retries, the circuit breaker and model fallback apply until the first token;
+        a failure after that is raised as a non-retryable LLMError because the caller
+        has already consumed part of the output. `info` is filled in with model,
+        finish_reason, prompt/completion tokens, attempts, time_to_first_token and
+        headers. `timeout` bounds connecting and each gap between chunks.
+        """
+        config, models = self.resolve_models(provider, models)
+        build_request = PROVIDER_FORMATS[provider][0]
+        stream_request, parse_line = STREAM_FORMATS[provider]
+        params = {'max_tokens': max_tokens, 'temperature': temperature, 'top_p': top_p}
+        info = info if info is not None else {}
+        self.count(provider, 'requests')
+        self.count(provider, 'streams')
+
+        last_error: Optional[LLMError] = None
+        for index, model in enumerate(models):
+            if index:
+                self.count(provider, 'fallbacks')
+                logger.warning(f"{provider}/{models[index - 1]} failed ({last_error}); falling back to {model}")
+            url, headers, body = stream_request(*build_request(config, model, prompt, system, params, dict(options or {})))
+            try:
+                for attempt in range(self.max_retries + 1):
+                    breaker = self.enter_breaker(config, model)
+                    started = time.perf_counter()
+                    streamed = False
+                    try:
+                        try:
+                            async with self.get_client().stream("POST", url, json=body, headers=headers,
+                                                                timeout=timeout or config.timeout) as response:
+                                if response.status_code != 200:
+                                    await response.aread()
+                                    raise LLMError(f"{provider} HTTP {response.status_code}: {error_message(response)}",
+                                                   provider, model, status=response.status_code,
+                                                   retryable=response.status_code in RETRYABLE_STATUS,
+                                                   headers=dict(response.headers))
+                                info.update(model=model, attempts=attempt + 1, headers=dict(response.headers))
+                                async for line in response.aiter_lines():
+                                    chunk = parse_line(line)
+                                    if chunk is None:
+                                        continue
+                                    delta, finish_reason, prompt_tokens, completion_tokens = chunk
+                                    if finish_reason:
+                                        info['finish_reason'] = normalize_finish_reason(finish_reason)
+                                    if prompt_tokens is not None:
+                                        info['prompt_tokens'] = prompt_tokens
+                                    if completion_tokens is not None:
+                                        info['completion_tokens'] = completion_tokens
+                                    if delta:
+                                        if not streamed:
+                                            streamed = True
+                                            breaker.record_success()
+                                            info['time_to_first_token'] = time.perf_counter() - started
+                                        yield delta
+                        except httpx.TimeoutException as e:
+                            raise LLMError(f"{provider} stream timed out after {timeout or config.timeout}s",
+                                           provider, model, retryable=True) from e
+                        except httpx.TransportError as e:
+                            raise LLMError(f"{provider} connection error: {e}", provider, model, retryable=True) from e
+                        except (ValueError, TypeError, AttributeError) as e:
+                            raise LLMError(f"{provider} sent an unreadable stream chunk: {e}", provider, model,
+                                           retryable=True) from e
+                    except LLMError as e:
+                        if streamed:
+                            raise LLMError(f"{provider} stream interrupted: {e}", provider, model, status=e.status) from e
+                        await self.after_failure(config, model, breaker, e, attempt)
+                    except (asyncio.CancelledError, GeneratorExit):
+                        # Consumer went away; not a provider failure
+                        breaker.release_probe()
+                        raise
+                    else:
+                        if not streamed:
+                            breaker.record_success()
+                        self.record_latency(provider, model, time.perf_counter() - started)
+                        self.count(provider, 'successes')
+                        return
+            except CircuitOpenError:
+                self.count(provider, 'failures')
+                raise
+            except LLMError as e:
+                last_error = e
+                if not (e.retryable or e.model_error) or info.get('time_to_first_token') is not None:
+                    break
+        self.count(provider, 'failures')
+        raise last_error
+
+    async def complete_cached(self, cache, provider: str, models: Union[str, Sequence[str]], prompt: str,
+                              system: Optional[str] = None, max_tokens: Optional[int] = None,
+                              temperature: Optional[float] = None, top_p: Optional[float] = None,
+                              options: Optional[Dict[str, Any]] = None, timeout: Optional[float] = None) -> str:
+        """
+        Completion text, served from `cache` (an LLMCache) when the same cacheable call repeats.
+        Only complete answers from the first model are stored. Raises LLMError when every
+        model failed or the provider returned no text.
+        """
+        model = models if isinstance(models, str) else models[0]
+        params = {'max_tokens': max_tokens, 'temperature': temperature, 'top_p': top_p}
+        params = {name: value for name, value in params.items() if value is not None}
+        params.update(options or {})
+        cache_key = cache.make_key(provider, model, prompt, system=system, params=params)
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        response = await self.complete(provider, models, prompt, system=system, max_tokens=max_tokens,
+                                       temperature=temperature, top_p=top_p, options=options, timeout=timeout)
+        if not response.text:
+            raise LLMError(f"{provider} returned no text (finish reason: {response.finish_reason})",
+                           provider, response.model)
+        if response.finish_reason == "stop" and response.model == model:
+            cache.set(cache_key, response.text, provider, model, response.prompt_tokens, response.completion_tokens)
+        return response.text
+
+    def run_sync(self, coroutine):
+        """Run a gateway coroutine from sync code on the gateway's own background loop"""
+        with self.lock:
+            if self.sync_loop is None:
+                self.sync_loop = asyncio.new_event_loop()
+                threading.Thread(target=self.sync_loop.run_forever, name="llm-gateway", daemon=True).start()
+        return asyncio.run_coroutine_threadsafe(coroutine, self.sync_loop).result()
+
+    def complete_sync(self, *args, **kwargs) -> LLMResponse:
+        """Blocking complete() for sync code"""
+        return self.run_sync(self.complete(*args, **kwargs))
+
+    def complete_cached_sync(self, *args, **kwargs) -> str:
+        """Blocking complete_cached() for sync code"""
+        return self.run_sync(self.complete_cached(*args, **kwargs))
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self.lock:
+            stats = {provider: dict(counters) for provider, counters in self.stats.items()}
+            latency_keys = list(self.latencies)
+        for provider, model in latency_keys:
+            stats.setdefault(provider, {}).setdefault('latency_ms', {})[model] = {
+                'p50': round(self.latency_percentile(provider, model, 0.5) * 1000, 1),
+                'p95': round(self.latency_percentile(provider, model, 0.95) * 1000, 1)
+            }
+        for provider, breaker in self.breakers.items():
+            if provider in stats or breaker.state != "closed":
+                stats.setdefault(provider, {})['circuit_breaker'] = breaker.snapshot()
+        return stats
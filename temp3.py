@@ -12,9 +12,13 @@ import tempfile
 from pathlib import Path
 import weasyprint
 from jinja2 import Template
+from llm_gateway import LLMError, LLMGateway
 
 app = FastAPI(title="Resume Maker API with HTML PDF Generation", version="2.0.0")
 
+# Pooled Ollama calls with retries and circuit breaking (timeout: OLLAMA_TIMEOUT_SECONDS)
+llm_gateway = LLMGateway.from_env()
+
 # Pydantic models (same as before)
 class WorkExperience(BaseModel):
     company: str
@@ -1834,43 +1838,32 @@ class ResumeOptimizer:
         return " ".join(text_parts)
 
 class OllamaClient:
-    def __init__(self, base_url: str = "http://localhost:11434"):
-        self.base_url = base_url
+    def __init__(self, base_url: Optional[str] = None):
+        self.base_url = base_url or os.getenv("OLLAMA_BASE_URL", "http://localhost:11434")
         self.model = "llama3.1"
+        llm_gateway.configure("ollama", base_url=self.base_url)
 
     def generate_resume(self, resume_data: ResumeData, analysis: Dict[str, Any], 
                        job_keywords: List[str], format_type: str = "professional") -> str:
         """Generate optimized resume using Ollama"""
         prompt = self._build_resume_prompt(resume_data, analysis, job_keywords, format_type)
-        
+        options = {
+            "temperature": 0.3,
+            "top_p": 0.9,
+            "max_tokens": 2000,
+            "num_ctx": 4096,
+            "num_predict": 2000,
+            "repeat_penalty": 1.1,
+            "top_k": 40
+        }
         try:
-            response = requests.post(
-                f"{self.base_url}/api/generate",
-                json={
-                    "model": self.model,
-                    "prompt": prompt,
-                    "stream": False,
-                    "options": {
-                        "temperature": 0.3,
-                        "top_p": 0.9,
-                        "max_tokens": 2000,
-                        "num_ctx": 4096,
-                        "num_predict": 2000,
-                        "repeat_penalty": 1.1,
-                        "top_k": 40
-                    }
-                },
-                timeout=600
-            )
-            
-            if response.status_code == 200:
-                result = response.json()
-                return result.get("response", "")
-            else:
+            response = llm_gateway.complete_sync("ollama", self.model, prompt, options=options)
+        except LLMError as e:
+            if e.status is not None:
                 raise HTTPException(status_code=500, detail="Failed to generate resume with Ollama")
-                
-        except requests.exceptions.RequestException as e:
             raise HTTPException(status_code=500, detail=f"Ollama connection error: {str(e)}")
+        
+        return response.text
 
     def _build_resume_prompt(self, resume_data: ResumeData, analysis: Dict[str, Any], 
                            job_keywords: List[str], format_type: str) -> str: